@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Write and load cost of columnar output compared to LEEF.
+
+Writes the same synthetic hour of events as LEEF text and with the
+Parquet and Arrow sinks (write_batch, including closing the files), then
+loads the files back into columns: the LEEF files by splitting every line
+into its key=value pairs, the columnar files with pyarrow. Reports events
+per second for both steps (best of several repeats) and the bytes per
+event on disk. Requires pyarrow.
+
+Usage:
+    python benchmarks/columnar_benchmark.py [--events 100000] [--batch-size 10000] [--repeat 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from src.shadow_it_generator.formatters import ArrowFormatter, EventBatch, LEEFFormatter, ParquetFormatter
+from formatter_benchmark import build_events
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def load_leef(paths):
+    """Parse LEEF files into a dict of columns."""
+    columns = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # Header fields are split by '|', attributes by tabs
+                attributes = line.rstrip('\n').split('|', 5)[5].lstrip('\t')
+                for pair in attributes.split('\t'):
+                    key, _, value = pair.partition('=')
+                    columns.setdefault(key, []).append(value)
+    return columns
+
+
+def load_parquet(paths):
+    """Read Parquet files into one table."""
+    return pa.concat_tables([pq.read_table(path) for path in paths])
+
+
+def load_arrow(paths):
+    """Read Arrow IPC stream files into one table."""
+    tables = []
+    for path in paths:
+        with pa.OSFile(str(path)) as source:
+            tables.append(pa.ipc.open_stream(source).read_all())
+    return pa.concat_tables(tables)
+
+
+def run(event_count: int, batch_size: int, repeat: int) -> None:
+    """Run the benchmark for each output."""
+    events = build_events(event_count)
+    batches = [EventBatch.from_events(events[i:i + batch_size]) for i in range(0, len(events), batch_size)]
+
+    print(f"{'output':<18} {'write (ev/s)':>13} {'load (ev/s)':>12} {'bytes/event':>12}")
+    for name, formatter_class, load in (
+        ("LEEFFormatter", LEEFFormatter, load_leef),
+        ("ParquetFormatter", ParquetFormatter, load_parquet),
+        ("ArrowFormatter", ArrowFormatter, load_arrow),
+    ):
+        write = read = float('inf')
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                formatter = formatter_class(Path(tmp))
+                formatter.setup()
+
+                started = time.perf_counter()
+                for batch in batches:
+                    formatter.write_batch(batch)
+                formatter.finalize()
+                write = min(write, time.perf_counter() - started)
+
+                paths = sorted(Path(tmp).iterdir())
+                size = sum(path.stat().st_size for path in paths)
+
+                started = time.perf_counter()
+                load(paths)
+                read = min(read, time.perf_counter() - started)
+
+        print(f"{name:<18} {event_count / write:>13,.0f} {event_count / read:>12,.0f} {size / event_count:>12,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000, help="Number of events to write")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Events per EventBatch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    run(args.events, args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
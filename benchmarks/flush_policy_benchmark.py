@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Write throughput per flush policy.
+
+Writes the same pre-formatted LEEF lines one at a time (write_line, the
+write_event path) and in batches (write_lines, the engine's write_batch
+path) under each flush policy and reports events per second (best of
+several repeats), including the time to close the files. Formatting is
+left out so the numbers show the cost of the writes and flushes alone.
+
+Usage:
+    python benchmarks/flush_policy_benchmark.py [--events 100000] [--repeat 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from src.shadow_it_generator.formatters import LEEFFormatter
+from src.shadow_it_generator.formatters.flush import FlushPolicy
+from formatter_benchmark import build_events
+
+
+POLICIES = ["events:1", "events:100", "ms:250", "bytes:65536", "bytes:1048576", "never"]
+
+
+def run(event_count: int, batch_size: int, repeat: int) -> None:
+    """Run the benchmark for each policy."""
+    events = build_events(event_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = [LEEFFormatter(Path(tmp)).format_event(event) for event in events]
+    days = [event.timestamp.date() for event in events]
+    timestamps = [event.timestamp for event in events]
+
+    print(f"{'policy':<16} {'per event (ev/s)':>17} {'batched (ev/s)':>15}")
+    for spec in POLICIES:
+        policy = FlushPolicy.parse(spec)
+        rates = []
+        for per_event in (True, False):
+            best = float('inf')
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as tmp:
+                    formatter = LEEFFormatter(Path(tmp), flush_policy=policy)
+                    formatter.setup()
+
+                    started = time.perf_counter()
+                    if per_event:
+                        for day, line in zip(days, lines):
+                            formatter.write_line(day, line)
+                    else:
+                        for i in range(0, event_count, batch_size):
+                            formatter.write_lines(timestamps[i:i + batch_size], lines[i:i + batch_size])
+                    formatter.finalize()
+                    best = min(best, time.perf_counter() - started)
+            rates.append(event_count / best)
+
+        print(f"{spec:<16} {rates[0]:>17,.0f} {rates[1]:>15,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000, help="Number of events to write")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Lines per write_lines call")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    run(args.events, args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
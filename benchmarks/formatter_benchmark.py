@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the log formatters.
+
+Formats a synthetic hour of events with each formatter, one event at a
+time (format_event) and as columnar batches (format_batch), and reports
+events per second (best of several repeats) and the average line size.
+The "both" row formats every event with LEEF and CEF, as ``--format
+both`` does. The events mimic generated traffic: a few hundred users and
+services, repeated user agents, unique URLs, and a sprinkling of
+referrers and blocked requests.
+
+Usage:
+    python benchmarks/formatter_benchmark.py [--events 100000] [--batch-size 10000] [--repeat 3]
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.shadow_it_generator.formatters import (
+    CEFFormatter, EventBatch, LEEFFormatter, LogEvent, NDJSONFormatter, SplunkFormatter
+)
+
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Slack/4.36.140 (Windows NT 10.0; Win64; x64)",
+]
+
+
+def build_events(count: int, seed: int = 1234):
+    """Build a time-ordered list of synthetic events spread over one hour."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 7, 10, 0)
+    offsets = sorted(rng.uniform(0, 3600) for _ in range(count))
+
+    events = []
+    for offset in offsets:
+        user = rng.randrange(300)
+        service = rng.randrange(200)
+        blocked = rng.random() < 0.05
+        events.append(LogEvent(
+            timestamp=start + timedelta(seconds=offset),
+            source_ip=f"10.0.{user // 250}.{user % 250 + 1}",
+            destination_ip=f"203.0.113.{service % 250 + 1}",
+            source_port=rng.randint(49152, 65535),
+            destination_port=443,
+            username=f"user{user}",
+            user_domain="example.com",
+            url=f"https://service-{service}.example/api/v1/items/{rng.getrandbits(40):x}",
+            method=rng.choice(["GET", "GET", "GET", "POST", "PUT"]),
+            status_code=403 if blocked else 200,
+            bytes_sent=rng.randint(200, 5000),
+            bytes_received=rng.randint(500, 500000),
+            duration_ms=rng.randint(20, 2000),
+            user_agent=USER_AGENTS[user % len(USER_AGENTS)],
+            referrer=f"https://service-{service}.example/" if rng.random() < 0.2 else None,
+            action="blocked" if blocked else "allowed",
+            category="collaboration",
+            risk_level=rng.choice(["low", "medium", "high"]),
+            service_name=f"Service {service}",
+            additional_fields={'block_reason': 'policy'} if blocked else None,
+        ))
+    return events
+
+
+def run(event_count: int, batch_size: int, repeat: int) -> None:
+    """Run the benchmark for each formatter."""
+    events = build_events(event_count)
+
+    print(f"{'formatter':<16} {'format_event (ev/s)':>20} {'format_batch (ev/s)':>20} {'bytes/event':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        leef = LEEFFormatter(Path(tmp))
+        cef = CEFFormatter(Path(tmp))
+        ndjson = NDJSONFormatter(Path(tmp))
+        splunk = SplunkFormatter(Path(tmp))
+        runs = (
+            ("LEEFFormatter", [leef]),
+            ("CEFFormatter", [cef]),
+            ("NDJSONFormatter", [ndjson]),
+            ("SplunkFormatter", [splunk]),
+            ("both", [leef, cef]),
+        )
+        for name, formatters in runs:
+            per_event = per_batch = float('inf')
+            for _ in range(repeat):
+                # Fresh batches, so columns memoized by an earlier run are not reused
+                batches = [EventBatch.from_events(events[i:i + batch_size]) for i in range(0, len(events), batch_size)]
+
+                started = time.perf_counter()
+                for event in events:
+                    for formatter in formatters:
+                        formatter.format_event(event)
+                per_event = min(per_event, time.perf_counter() - started)
+
+                started = time.perf_counter()
+                for batch in batches:
+                    for formatter in formatters:
+                        lines = formatter.format_batch(batch)
+                per_batch = min(per_batch, time.perf_counter() - started)
+
+            # Output size of the last formatter (plus newline), from the last batch
+            size = sum(len(line.encode('utf-8')) + 1 for line in lines) / len(lines)
+            print(f"{name:<16} {event_count / per_event:>20,.0f} {event_count / per_batch:>20,.0f} {size:>12,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000, help="Number of events to format")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Events per EventBatch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    run(args.events, args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
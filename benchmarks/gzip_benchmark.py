@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cost of gzip output: streaming compression against compress-after-close.
+
+Writes the same pre-formatted LEEF lines as plain day files, as plain
+files that are then re-read and gzipped (what FileHandler did on every
+rotation) and as streaming ``.log.gz`` files at several levels. Reports
+events per second including closing (and compressing) the files, best of
+several repeats, and the bytes per event on disk.
+
+Usage:
+    python benchmarks/gzip_benchmark.py [--events 100000] [--batch-size 10000] [--repeat 3]
+"""
+
+from pathlib import Path
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from src.shadow_it_generator.formatters import EventBatch, LEEFFormatter
+from src.shadow_it_generator.utils.compression import DEFAULT_GZIP_LEVEL
+from formatter_benchmark import build_events
+
+
+def compress_after(directory: Path, level: int) -> None:
+    """Gzip every file in a directory and remove the originals."""
+    for path in list(directory.iterdir()):
+        with open(path, 'rb') as f_in, gzip.open(f"{path}.gz", 'wb', compresslevel=level) as f_out:
+            f_out.writelines(f_in)
+        os.remove(path)
+
+
+def run(event_count: int, batch_size: int, repeat: int) -> None:
+    """Run the benchmark for each output mode."""
+    events = build_events(event_count)
+    formatter = LEEFFormatter(Path(tempfile.gettempdir()))
+    chunks = []
+    for i in range(0, len(events), batch_size):
+        batch = EventBatch.from_events(events[i:i + batch_size])
+        chunks.append((batch.timestamps, formatter.format_batch(batch)))
+
+    modes = [("plain", None, False), (f"gzip after close ({DEFAULT_GZIP_LEVEL})", None, True)]
+    modes += [(f"streaming gzip ({level})", level, False) for level in (1, DEFAULT_GZIP_LEVEL, 9)]
+
+    print(f"{'output':<24} {'events/s':>10} {'bytes/event':>12}")
+    for name, level, after in modes:
+        best = float('inf')
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                formatter = LEEFFormatter(Path(tmp))
+                formatter.gzip_level = level
+                formatter.setup()
+
+                started = time.perf_counter()
+                for timestamps, lines in chunks:
+                    formatter.write_lines(timestamps, lines)
+                formatter.finalize()
+                if after:
+                    compress_after(Path(tmp), DEFAULT_GZIP_LEVEL)
+                best = min(best, time.perf_counter() - started)
+
+                size = sum(path.stat().st_size for path in Path(tmp).iterdir())
+
+        print(f"{name:<24} {event_count / best:>10,.0f} {size / event_count:>12,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000, help="Number of events to write")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Events per write_lines() call")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+
+    run(args.events, args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for per-hour user dispatch.
+
+Times one busy hour of activity planning for growing user populations,
+then the engine's dispatch loop over the planned sessions two ways: the
+old loop, which found each active user with a linear scan of the
+population by id, and the current one, which iterates sessions keyed by
+the User objects themselves. The scan grows linearly per lookup and
+quadratically per hour; the keyed loop stays flat per user.
+
+The scan takes minutes at 100k users, so it is skipped above
+--max-scan-users.
+
+Usage:
+    python benchmarks/user_dispatch_benchmark.py [--sizes 1000 10000 100000] [--max-scan-users 50000]
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.shadow_it_generator.core.user import User
+from src.shadow_it_generator.core.population import PopulationBuilder
+from src.shadow_it_generator.generators.activity import ActivityGenerator
+from src.shadow_it_generator.utils.ip_generator import IPGenerator
+from src.shadow_it_generator.utils.random_streams import RandomStreams
+
+
+def build_services(count: int = 50):
+    """Build lightweight service definitions shaped like the engine expects."""
+    services = []
+    for i in range(count):
+        services.append(SimpleNamespace(
+            name=f"service-{i}",
+            status="blocked" if i % 10 == 0 else "sanctioned",
+            category="collaboration",
+            risk_level="low",
+            has_traffic_override=False,
+            override_access_count=None,
+            activity=SimpleNamespace(user_adoption_rate=0.3, actions={}),
+            network=SimpleNamespace(domains=[f"service-{i}.example"], ip_ranges=[]),
+            traffic_patterns=SimpleNamespace(web_paths=["/"], api_endpoints=[]),
+        ))
+    return services
+
+
+def build_users(count: int, services, streams: RandomStreams):
+    """Build a user population with service assignments."""
+    profiles = [
+        SimpleNamespace(name="normal", work_hours_adherence=0.8, shadow_it_likelihood=0.2),
+        SimpleNamespace(name="power_user", work_hours_adherence=0.8, shadow_it_likelihood=0.4),
+        SimpleNamespace(name="risky", work_hours_adherence=0.5, shadow_it_likelihood=0.8),
+    ]
+    users = []
+    for user_id in range(1, count + 1):
+        rng = streams.stream('user', str(user_id))
+        user = User(
+            id=str(user_id),
+            email=f"user{user_id}@example.com",
+            username=f"user{user_id}",
+            full_name=f"User {user_id}",
+            profile=profiles[user_id % len(profiles)],
+            source_ip="10.0.0.1",
+            rng=rng
+        )
+        users.append(user)
+    PopulationBuilder(services).assign(users, rng=streams.stream('services'))
+    return users
+
+
+def dispatch_by_scan(users, sessions_by_id) -> int:
+    """The old dispatch loop: find each active user by scanning the population."""
+    session_count = 0
+    for user_id, sessions in sessions_by_id.items():
+        user = next(u for u in users if u.id == user_id)
+        for session in sessions:
+            session_count += 1
+    return session_count
+
+
+def dispatch_by_user(user_sessions) -> int:
+    """The current dispatch loop over sessions keyed by User."""
+    session_count = 0
+    for user, sessions in user_sessions.items():
+        for session in sessions:
+            session_count += 1
+    return session_count
+
+
+def run(sizes, hour_start: datetime, max_scan_users: int) -> None:
+    """Run the benchmark for each population size."""
+    services = build_services()
+    streams = RandomStreams(seed=1234)
+    config = SimpleNamespace(enterprise={'timezone': 'UTC'}, junk_traffic={})
+    ip_generator = IPGenerator(internal_subnets=['10.0.0.0/16'], egress_ips=['203.0.113.1'])
+    activity = ActivityGenerator(config, services, ip_generator, None, streams=streams)
+
+    print(f"{'users':>8} {'active':>8} {'sessions':>9} {'plan (s)':>9} "
+          f"{'scan (s)':>9} {'keyed (s)':>10} {'speedup':>8}")
+    for size in sizes:
+        users = build_users(size, services, streams)
+
+        started = time.perf_counter()
+        user_sessions = activity.generate_hourly_activity(users, hour_start)
+        planned = time.perf_counter() - started
+
+        started = time.perf_counter()
+        session_count = dispatch_by_user(user_sessions)
+        keyed = time.perf_counter() - started
+
+        if size <= max_scan_users:
+            # The planner used to return sessions by user id
+            sessions_by_id = {user.id: sessions for user, sessions in user_sessions.items()}
+            started = time.perf_counter()
+            dispatch_by_scan(users, sessions_by_id)
+            scan = time.perf_counter() - started
+            scan_text = f"{scan:>9.3f}"
+            speedup_text = f"{scan / keyed:>7,.0f}x"
+        else:
+            scan_text = f"{'skipped':>9}"
+            speedup_text = f"{'-':>8}"
+
+        print(f"{size:>8} {len(user_sessions):>8} {session_count:>9} {planned:>9.3f} "
+              f"{scan_text} {keyed:>10.4f} {speedup_text}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000, 100000],
+        help="User population sizes to benchmark"
+    )
+    parser.add_argument(
+        "--max-scan-users",
+        type=int,
+        default=50000,
+        help="Largest population to time the old linear scan for"
+    )
+    args = parser.parse_args()
+
+    # A weekday mid-morning hour, when the most users are active
+    run(args.sizes, datetime(2025, 1, 7, 10, 0), args.max_scan_users)
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,11 @@ setup(
             "pydantic>=2.0.0",
             "faker>=20.0.0",
             "numpy>=1.20.0",
+            "orjson>=3.6.0",
+            "pyarrow>=8.0.0",
+        ],
+        "columnar": [
+            "pyarrow>=8.0.0",
         ],
     },
     entry_points={
@@ -12,6 +12,9 @@ from ._version import __version__, __description__, __author__
 from .config.initializer import ConfigInitializer
 from .generators.realtime import RealtimeGenerator
 from .generators.batch import BatchGenerator
+from .formatters import FORMATTERS
+from .formatters.flush import FlushPolicy, REALTIME_FLUSH_POLICY
+from .formatters.syslog import SYSLOG_PROTOCOLS
 
 # Default paths
 DEFAULT_CONFIG_DIR = Path("/etc/skyhigh-traffic-forge")
@@ -40,6 +43,12 @@ def get_output_dir():
     return DEFAULT_OUTPUT_DIR
 
 
+def get_log_format():
+    """Get the default output format from the environment."""
+    import os
+    return os.environ.get('SKYHIGH_LOG_FORMAT', 'leef').lower()
+
+
 def init_command(args):
     """Initialize configuration directory with base files."""
     config_dir = Path(args.config_dir)
@@ -113,15 +122,35 @@ def generate_command(args):
     print(f"Configuration: {config_dir}")
     print(f"Output: {output_dir}")
     print(f"Mode: {args.mode}")
+    print(f"Format: {args.format}")
+    
+    # argparse does not check defaults against choices, e.g. from SKYHIGH_LOG_FORMAT
+    if args.format not in FORMATTERS and args.format != "both":
+        print(f"❌ Unknown log format: {args.format}")
+        print(f"Use one of: {', '.join(FORMATTERS)}, both")
+        return 1
+    if args.octet_counting and not args.syslog:
+        print("❌ --octet-counting requires --syslog")
+        return 1
     
     if args.mode == "realtime":
         print(f"Speed: {args.speed}x")
         print("\nPress Ctrl+C to stop\n")
         
+        try:
+            flush_policy = FlushPolicy.parse(args.flush_policy) if args.flush_policy else REALTIME_FLUSH_POLICY
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        
         generator = RealtimeGenerator(
             config_dir=config_dir,
             output_dir=output_dir,
-            speed_multiplier=args.speed
+            speed_multiplier=args.speed,
+            flush_policy=flush_policy,
+            log_format=args.format,
+            syslog=args.syslog,
+            octet_counting=args.octet_counting
         )
         
         try:
@@ -165,7 +194,9 @@ def generate_command(args):
         output_file = generator.generate(
             start_time=start_time,
             end_time=end_time,
-            format=args.format
+            format=args.format,
+            syslog=args.syslog,
+            octet_counting=args.octet_counting
         )
         
         print(f"\n✅ Generated logs: {output_file}")
@@ -289,9 +320,9 @@ Docker Usage:
     )
     gen_parser.add_argument(
         "--format",
-        choices=["leef", "cef", "both"],
-        default="leef",
-        help="Output format (default: leef)"
+        choices=[*FORMATTERS, "both"],
+        default=get_log_format(),
+        help="Output format (default: SKYHIGH_LOG_FORMAT or leef)"
     )
     gen_parser.add_argument(
         "--duration",
@@ -309,6 +340,20 @@ Docker Usage:
         default="both",
         help="Display mode for realtime (default: both)"
     )
+    gen_parser.add_argument(
+        "--flush-policy",
+        help=f"When realtime output is flushed: never, events:N, bytes:N or ms:T (default: {REALTIME_FLUSH_POLICY})"
+    )
+    gen_parser.add_argument(
+        "--syslog",
+        choices=SYSLOG_PROTOCOLS,
+        help="Wrap each line in a syslog header built from the logging section of enterprise.yaml"
+    )
+    gen_parser.add_argument(
+        "--octet-counting",
+        action="store_true",
+        help="Write syslog messages as RFC 6587 octet-counted frames (length prefix, no newlines) for TCP; requires --syslog"
+    )
     
     # Validate command
     val_parser = subparsers.add_parser(
@@ -18,6 +18,7 @@ class EnterpriseConfig:
         self.shadow_it = data.get("shadow_it", {})
         self.junk_traffic = data.get("junk_traffic", {})
         self.output = data.get("output", {})
+        self.logging = data.get("logging", {})
     
     @classmethod
     def from_yaml(cls, path: Path) -> "EnterpriseConfig":
@@ -8,9 +8,13 @@ realistic shadow IT network traffic logs.
 from .engine import LogGenerationEngine
 from .user import User
 from .session import Session
+from .population import PopulationBuilder
+from .stats import GenerationStats
 
 __all__ = [
     "LogGenerationEngine",
     "User",
     "Session",
+    "PopulationBuilder",
+    "GenerationStats",
 ]
\ No newline at end of file
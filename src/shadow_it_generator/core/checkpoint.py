@@ -0,0 +1,225 @@
+"""
+Checkpoints for resumable batch runs.
+
+Every random draw comes from a stream keyed by the run seed and the hour
+being generated, so the only generator state needed to continue a run is
+the seed, the calibrated intensity and the next hour to generate. The
+checkpoint stores those together with a reference to a snapshot of the
+user population and the size of every output file. Resuming truncates
+the files back to those sizes, which drops any partially written hour.
+"""
+
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+
+from .user import User
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = ".checkpoint.json"
+POPULATION_FILE = ".population.json"
+
+
+@dataclass
+class Checkpoint:
+    """
+    Progress of a batch run, saved after every completed hour.
+
+    Dates are stored in ISO format. ``files`` maps output file paths
+    (relative to the output directory) to their size at the checkpoint.
+    ``syslog`` describes the syslog framing of the output and
+    ``compression`` its compression (empty for none).
+    """
+    seed: int
+    intensity: float
+    log_format: str
+    start_date: str
+    end_date: str
+    next_hour: str
+    population_file: str = POPULATION_FILE
+    population_sha256: str = ""
+    files: Dict[str, int] = field(default_factory=dict)
+    syslog: str = ""
+    compression: str = ""
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["Checkpoint"]:
+        """
+        Load the checkpoint of an output directory.
+
+        Args:
+            output_dir: Run output directory
+
+        Returns:
+            The checkpoint, or None if the directory has none
+        """
+        path = output_dir / CHECKPOINT_FILE
+        if not path.exists():
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+    def save(self, output_dir: Path) -> None:
+        """
+        Write the checkpoint atomically.
+
+        Args:
+            output_dir: Run output directory
+        """
+        path = output_dir / CHECKPOINT_FILE
+        tmp_path = path.with_suffix('.tmp')
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def record_files(self, output_dir: Path, directories: List[Path]) -> None:
+        """
+        Record the current size of every file in the output directories.
+
+        Args:
+            output_dir: Run output directory
+            directories: Formatter output directories inside it
+        """
+        self.files = {}
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in sorted(directory.iterdir()):
+                if path.is_file():
+                    self.files[str(path.relative_to(output_dir))] = path.stat().st_size
+
+    def restore_files(self, output_dir: Path, directories: List[Path]) -> None:
+        """
+        Roll the output directories back to the checkpoint.
+
+        Files that grew since the checkpoint are truncated to their
+        recorded size and files that did not exist then are removed.
+
+        Args:
+            output_dir: Run output directory
+            directories: Formatter output directories inside it
+        """
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in sorted(directory.iterdir()):
+                if not path.is_file():
+                    continue
+
+                size = self.files.get(str(path.relative_to(output_dir)))
+                if size is None:
+                    logger.info(f"Removing {path} (written after the checkpoint)")
+                    path.unlink()
+                elif path.stat().st_size > size:
+                    logger.info(f"Truncating {path} to {size} bytes")
+                    with open(path, 'r+b') as f:
+                        f.truncate(size)
+
+    @property
+    def next_hour_start(self) -> datetime:
+        """The first hour that still has to be generated."""
+        return datetime.fromisoformat(self.next_hour)
+
+
+def save_population(users: List[User], path: Path) -> str:
+    """
+    Write a snapshot of the user population.
+
+    Args:
+        users: The user population
+        path: Snapshot file to write
+
+    Returns:
+        SHA-256 hex digest of the snapshot
+    """
+    records = []
+    for user in users:
+        records.append({
+            'id': user.id,
+            'email': user.email,
+            'username': user.username,
+            'full_name': user.full_name,
+            'profile': user.profile.name,
+            'source_ip': user.source_ip,
+            'department': user.department,
+            'locale': user.locale,
+            'assigned_services': sorted(user.assigned_services),
+            'work_start_time': user.work_start_time.isoformat(),
+            'work_end_time': user.work_end_time.isoformat(),
+            'lunch_time': user.lunch_time.isoformat(),
+            'preferred_user_agent': user.preferred_user_agent,
+            'mobile_probability': user.mobile_probability,
+        })
+
+    data = json.dumps({'users': records}, sort_keys=True).encode('utf-8')
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_population(
+    path: Path,
+    profiles: List[Any],
+    expected_sha256: Optional[str] = None
+) -> List[User]:
+    """
+    Load a user population snapshot.
+
+    Service adoption weights are not stored; callers recompute them
+    (see PopulationBuilder.apply_weights).
+
+    Args:
+        path: Snapshot file written by save_population
+        profiles: The enterprise config's user profiles, matched by name
+        expected_sha256: Digest recorded in the checkpoint, if any
+
+    Returns:
+        The user population
+
+    Raises:
+        ValueError: If the snapshot does not match the digest or refers
+            to a profile that is no longer configured
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if expected_sha256 and hashlib.sha256(data).hexdigest() != expected_sha256:
+        raise ValueError(f"Population snapshot {path} does not match the checkpoint")
+
+    profiles_by_name = {profile.name: profile for profile in profiles}
+    users = []
+    for record in json.loads(data)['users']:
+        profile = profiles_by_name.get(record['profile'])
+        if profile is None:
+            raise ValueError(f"Population snapshot refers to unknown profile '{record['profile']}'")
+
+        users.append(User(
+            id=record['id'],
+            email=record['email'],
+            username=record['username'],
+            full_name=record['full_name'],
+            profile=profile,
+            source_ip=record['source_ip'],
+            department=record['department'],
+            locale=record['locale'],
+            assigned_services=set(record['assigned_services']),
+            work_start_time=time.fromisoformat(record['work_start_time']),
+            work_end_time=time.fromisoformat(record['work_end_time']),
+            lunch_time=time.fromisoformat(record['lunch_time']),
+            preferred_user_agent=record['preferred_user_agent'],
+            mobile_probability=record['mobile_probability'],
+        ))
+
+    return users
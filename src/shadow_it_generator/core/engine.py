@@ -5,10 +5,15 @@ This module coordinates user simulation, traffic generation, and log formatting
 to produce realistic shadow IT network traffic logs.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from time import perf_counter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import heapq
 import logging
+import os
+import shutil
 import uuid
 import random
 
@@ -17,15 +22,31 @@ from ..models.cloud_service import CloudService
 from ..generators.activity import ActivityGenerator
 from ..generators.junk_traffic import JunkTrafficGenerator
 from ..formatters.base import LogFormatter, LogEvent
-from ..formatters.leef import LEEFFormatter
-from ..formatters.cef import CEFFormatter
+from ..formatters.batch import EventBatch
+from ..formatters import FORMATTERS, COLUMNAR_FORMATTERS
+from ..formatters.flush import FlushPolicy
+from ..formatters.syslog import SyslogFormatter, SyslogFraming
+from ..formatters.writer import BackgroundWriter
 from ..utils.ip_generator import IPGenerator
 from ..utils.user_generator import UserGenerator
+from ..utils.random_streams import RandomStreams
 from ..core.user import User
+from ..core.population import PopulationBuilder
+from ..core.checkpoint import Checkpoint, POPULATION_FILE, save_population, load_population
+from ..core.stats import GenerationStats
 
 
 logger = logging.getLogger(__name__)
 
+# Per-process engine used by shard workers (see _init_shard_worker)
+_worker_engine: Optional["LogGenerationEngine"] = None
+
+# Volume calibration: users in the pilot sample, and the lowest request intensity
+PILOT_USERS = 200
+MIN_INTENSITY = 0.01
+
+STATS_FILE = "generation_stats.json"
+
 
 class LogGenerationEngine:
     """
@@ -42,7 +63,19 @@ class LogGenerationEngine:
         output_dir: Path,
         log_format: str = "leef",
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        intensity: float = 1.0,
+        target_events: Optional[int] = None,
+        events_per_minute: Optional[float] = None,
+        resume: bool = False,
+        append_until: Optional[datetime] = None,
+        collect_stats: bool = False,
+        flush_policy: Optional[FlushPolicy] = None,
+        syslog: Optional[SyslogFraming] = None,
+        background_writes: bool = False,
+        gzip_level: Optional[int] = None
     ):
         """
         Initialize the log generation engine.
@@ -51,19 +84,62 @@ class LogGenerationEngine:
             enterprise_config: Enterprise-wide configuration
             services: List of cloud service configurations
             output_dir: Directory to write log files
-            log_format: Output format ('leef', 'cef', or 'both')
+            log_format: Output format ('leef', 'cef', 'json', 'splunk', 'both'
+                for LEEF and CEF, or the columnar 'parquet' / 'arrow', which
+                need pyarrow)
             start_date: Start date for log generation
             end_date: End date for log generation
+            workers: Number of worker processes (0 = one per CPU)
+            seed: Run seed; the same seed reproduces the same logs regardless
+                of the worker count
+            intensity: Multiplier on the session request rate
+            target_events: Total number of events to aim for; the intensity
+                is calibrated by a pilot pass before generating
+            events_per_minute: Target rate instead of a total (over the
+                whole date range); ignored when target_events is set
+            resume: Continue the run checkpointed in output_dir instead of
+                starting a new one; the checkpoint's seed, dates,
+                intensity and population are used
+            append_until: Extend the dataset in output_dir up to this day
+                (inclusive); like resume, but with a later end date, so
+                only the missing days are generated
+            collect_stats: Time each generation stage and count sessions,
+                requests, events and bytes; the totals are written to
+                generation_stats.json in output_dir at the end of the run
+            flush_policy: When formatters flush their output files (default:
+                BATCH_FLUSH_POLICY); files are always flushed at checkpoints
+            syslog: Wrap every output line in a syslog message with this
+                framing (see SyslogFraming.from_config); None writes bare lines
+            background_writes: Write the output files, checkpoints and shard
+                merges on a background thread behind a bounded queue, so
+                file I/O overlaps generating the next hour (line formats only)
+            gzip_level: Write gzip-compressed ``.log.gz`` day files at this
+                level (0-9) instead of plain text (line formats only)
         """
         self.enterprise_config = enterprise_config
         self.services = services
         self.output_dir = output_dir
         self.log_format = log_format
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.target_events = target_events
+        self.events_per_minute = events_per_minute
+        self.resume = resume
+        self.append_until = append_until
+        self.flush_policy = flush_policy
+        self.syslog = syslog
+        self.background_writes = background_writes
+        self.gzip_level = gzip_level
+        self.writer: Optional[BackgroundWriter] = BackgroundWriter() if background_writes else None
+        self.checkpoint: Optional[Checkpoint] = None
+        self.stats: Optional[GenerationStats] = GenerationStats() if collect_stats else None
         
         # Set default dates if not provided
         self.end_date = end_date or datetime.now()
         self.start_date = start_date or (self.end_date - timedelta(days=30))
         
+        # Every random draw comes from a stream keyed by (seed, user, hour)
+        self.streams = RandomStreams(seed)
+        
         # Initialize formatters
         self.formatters = self._init_formatters()
         
@@ -81,6 +157,7 @@ class LogGenerationEngine:
         
         self.user_generator = UserGenerator(
             enterprise_domain=enterprise_config.enterprise['domain'],
+            seed=seed,
             cache_file=cache_file
         )
         
@@ -99,21 +176,42 @@ class LogGenerationEngine:
             enterprise_config=enterprise_config,
             services=services,
             ip_generator=self.ip_generator,
-            junk_generator=self.junk_generator
+            junk_generator=self.junk_generator,
+            streams=self.streams,
+            intensity=intensity
         )
         
-        # User cache
+        # User cache, plus an id index for O(1) lookups
         self.users: List[User] = []
+        self.users_by_id: Dict[str, User] = {}
         
     def _init_formatters(self) -> List[LogFormatter]:
         """Initialize log formatters based on requested format."""
-        formatters = []
+        names = ["leef", "cef"] if self.log_format == "both" else [self.log_format]
         
-        if self.log_format in ["leef", "both"]:
-            formatters.append(LEEFFormatter(self.output_dir / "leef"))
-            
-        if self.log_format in ["cef", "both"]:
-            formatters.append(CEFFormatter(self.output_dir / "cef"))
+        # Each format writes to a subdirectory named after its file prefix
+        formatters = []
+        for name in names:
+            formatter_class = FORMATTERS.get(name) or COLUMNAR_FORMATTERS.get(name)
+            if formatter_class is None:
+                raise ValueError(
+                    f"Unknown log format '{name}'; expected one of "
+                    f"{', '.join([*FORMATTERS, *COLUMNAR_FORMATTERS])} or both"
+                )
+            formatter = formatter_class(self.output_dir / formatter_class.file_prefix, self.flush_policy)
+            if self.syslog:
+                if formatter.columnar:
+                    raise ValueError(f"Syslog framing applies to line formats, not '{name}'")
+                formatter = SyslogFormatter(formatter, self.syslog)
+            if self.writer:
+                if formatter.columnar:
+                    raise ValueError(f"Background writes apply to line formats, not '{name}'")
+                formatter.writer = self.writer
+            if self.gzip_level is not None:
+                if formatter.columnar:
+                    raise ValueError(f"gzip output applies to line formats, not '{name}'")
+                formatter.gzip_level = self.gzip_level
+            formatters.append(formatter)
             
         return formatters
     
@@ -129,23 +227,133 @@ class LogGenerationEngine:
         for formatter in self.formatters:
             formatter.setup()
         
-        # Generate user population
-        users = self._generate_users()
-        logger.info(f"Generated {len(users)} users")
+        if self.resume or self.append_until:
+            users, next_hour = self._resume_run(self.append_until)
+            days = self._days_in_range(self.start_date, self.end_date)
+        else:
+            # Generate user population
+            users = self._generate_users()
+            logger.info(f"Generated {len(users)} users")
+            
+            days = self._days_in_range(self.start_date, self.end_date)
+            self._calibrate_intensity(users, days)
+            next_hour = self._hour_start(days[0], 0)
+            self._start_checkpoint(users, next_hour)
         
-        # Generate logs day by day
-        current_date = self.start_date
-        while current_date <= self.end_date:
-            logger.info(f"Generating logs for {current_date.date()}")
-            self._generate_daily_logs(users, current_date)
-            current_date += timedelta(days=1)
+        if self.workers > 1:
+            self._generate_sharded(users, days, next_hour)
+        else:
+            for day in days:
+                first_hour = self._first_pending_hour(day, next_hour)
+                if first_hour >= 24:
+                    continue
+                
+                logger.info(f"Generating logs for {day.date()}")
+                batches = self._iter_hours(users, day, first_hour, 24)
+                for hour, batch in zip(range(first_hour, 24), batches):
+                    self._write_batch(batch)
+                    self._save_checkpoint(self._hour_start(day, hour + 1))
             
         # Finalize formatters
         for formatter in self.formatters:
             formatter.finalize()
+        if self.writer:
+            self.writer.close()
+        
+        if self.stats:
+            self.stats.write_report(self.output_dir / STATS_FILE)
+            logger.info(f"Wrote generation statistics to {self.output_dir / STATS_FILE}")
             
         logger.info("Log generation complete")
     
+    def iter_events(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[LogEvent]:
+        """
+        Lazily yield log events for a date range.
+        
+        Events are produced one hour at a time, so memory stays bounded by
+        a single hour of activity regardless of the range length. Nothing
+        is written to disk.
+        
+        Args:
+            start: First day to generate (default: the engine's start_date)
+            end: Last day to generate (default: the engine's end_date)
+            
+        Yields:
+            LogEvent objects in generation order
+        """
+        for batch in self.iter_batches(start, end):
+            yield from batch
+    
+    def iter_batches(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[EventBatch]:
+        """
+        Lazily yield one columnar EventBatch per hour for a date range.
+        
+        Same events as iter_events, without building a LogEvent object
+        per event.
+        
+        Args:
+            start: First day to generate (default: the engine's start_date)
+            end: Last day to generate (default: the engine's end_date)
+            
+        Yields:
+            EventBatch objects, each in timestamp order
+        """
+        users = self._generate_users()
+        days = self._days_in_range(start or self.start_date, end or self.end_date)
+        self._calibrate_intensity(users, days)
+        
+        for day in days:
+            logger.info(f"Generating logs for {day.date()}")
+            yield from self._iter_hours(users, day, 0, 24)
+    
+    def _days_in_range(self, start: datetime, end: datetime) -> List[datetime]:
+        """List the days from start to end (inclusive), one per day."""
+        days = []
+        current_date = start
+        while current_date <= end:
+            days.append(current_date)
+            current_date += timedelta(days=1)
+        return days
+    
+    def _write_batch(self, batch: EventBatch) -> None:
+        """Write an event batch to all formatters."""
+        stats = self.stats
+        if not stats:
+            for formatter in self.formatters:
+                formatter.write_batch(batch)
+            return
+        
+        for formatter in self.formatters:
+            if formatter.columnar:
+                # Columnar files are encoded and written when they are
+                # closed; close it now (the checkpoint would right after)
+                # so the time and bytes count towards this hour
+                started = perf_counter()
+                written = formatter.bytes_written
+                formatter.write_batch(batch)
+                formatter.flush()
+                stats.add_time('write', perf_counter() - started)
+                stats.count('events_formatted', len(batch))
+                stats.count('bytes_written', formatter.bytes_written - written)
+                continue
+            
+            started = perf_counter()
+            lines = formatter.format_batch(batch)
+            formatted = perf_counter()
+            written = formatter.write_lines(batch.timestamps, lines)
+            stats.add_time('format', formatted - started)
+            stats.add_time('write', perf_counter() - formatted)
+            stats.count('events_formatted', len(lines))
+            stats.count('bytes_written', written)
+    
     def _generate_users(self) -> List[User]:
         """Generate the user population based on enterprise config."""
         if self.users:  # Already generated
@@ -170,6 +378,7 @@ class LogGenerationEngine:
                     break
                 
                 user_info = user_data[user_id - 1]
+                user_rng = self.streams.stream('user', str(user_id))
                 
                 # Create user with profile
                 user = User(
@@ -178,107 +387,508 @@ class LogGenerationEngine:
                     username=user_info['username'],
                     full_name=user_info['full_name'],
                     profile=profile,
-                    source_ip=self.ip_generator.generate_internal_ip(),
-                    locale=user_info['locale']
+                    source_ip=self.ip_generator.generate_internal_ip(rng=user_rng),
+                    locale=user_info['locale'],
+                    rng=user_rng
                 )
                 
-                # Assign services to user
-                user.assign_services(self.services)
-                
                 users.append(user)
                 user_id += 1
         
-        self.users = users
+        # Assign services to the whole population in bulk
+        PopulationBuilder(self.services).assign(users, rng=self.streams.stream('services'))
+        
+        self._set_users(users)
         logger.info(f"Generated {len(users)} users with service assignments")
         return users
     
-    def _generate_daily_logs(self, users: List[User], date: datetime) -> None:
-        """Generate logs for a single day."""
-        # Process hour by hour
-        current_time = datetime.combine(date.date(), datetime.min.time())
-        current_time = current_time.replace(tzinfo=date.tzinfo)
+    def _set_users(self, users: List[User]) -> None:
+        """Install the user population and rebuild the id index."""
+        self.users = users
+        self.users_by_id = {user.id: user for user in users}
+    
+    def _target_event_count(self, days: List[datetime]) -> Optional[float]:
+        """Get the requested total event count for a day range, if any."""
+        if self.target_events:
+            return float(self.target_events)
+        if self.events_per_minute:
+            return self.events_per_minute * 24 * 60 * len(days)
+        return None
+    
+    def _calibrate_intensity(self, users: List[User], days: List[datetime]) -> None:
+        """
+        Scale the session request rate so the run lands on the volume target.
+        
+        A pilot pass generates (without writing) a strided sample of users
+        for one day of each weekday present in the range and measures events
+        per active user for every hour. The total is extrapolated with the
+        full population's active-user count for each hour of the range.
+        
+        Volume is close to linear in the intensity, but auth requests,
+        blocked attempts and junk traffic do not scale with it, so a second
+        pilot at the first estimate fits the line
+        total = fixed + slope * intensity and solves it for the target.
+        """
+        target = self._target_event_count(days)
+        if target is None or not users or not days:
+            return
         
-        for hour in range(24):
-            hour_start = current_time + timedelta(hours=hour)
+        step = -(-len(users) // PILOT_USERS)  # ceiling division
+        sample = users[::step]
+        activity = self.activity_generator
+        
+        # One pilot day per weekday, since weekends are much quieter
+        pilot_days = {}
+        for day in days:
+            pilot_days.setdefault(day.weekday(), day)
+        
+        # Active users per hour of the range for the whole population
+        hour_starts = {
+            day: [self._hour_start(day, hour) for hour in range(24)]
+            for day in days
+        }
+        active = {
+            day: [activity.active_user_count(len(users), hour_start) for hour_start in hour_starts[day]]
+            for day in days
+        }
+        
+        def estimate(intensity: float) -> float:
+            activity.intensity = intensity
+            rates = {}
+            for weekday, day in pilot_days.items():
+                rates[weekday] = []
+                batches = self._iter_hours(sample, day, 0, 24)
+                for hour_start, batch in zip(hour_starts[day], batches):
+                    sample_active = activity.active_user_count(len(sample), hour_start)
+                    rates[weekday].append(len(batch) / sample_active if sample_active else 0.0)
+            return sum(
+                rate * active_count
+                for day in days
+                for rate, active_count in zip(rates[day.weekday()], active[day])
+            )
+        
+        logger.info(f"Calibrating intensity for {target:.0f} events with {len(sample)} pilot users")
+        
+        # Pilot hours are not part of the run's statistics
+        stats, self.stats = self.stats, None
+        try:
+            base = estimate(1.0)
+            if base <= 0:
+                self.activity_generator.intensity = 1.0
+                logger.warning("Pilot pass produced no events; keeping the default intensity")
+                return
+            
+            intensity = max(MIN_INTENSITY, target / base)
+            if abs(intensity - 1.0) > 0.01:
+                scaled = estimate(intensity)
+                slope = (scaled - base) / (intensity - 1.0)
+                if slope > 0:
+                    intensity = (target - (base - slope)) / slope
+        finally:
+            self.stats = stats
+        
+        if intensity < MIN_INTENSITY:
+            logger.warning(
+                f"Target of {target:.0f} events is below the volume of auth, blocked "
+                f"and junk traffic alone; using the minimum intensity"
+            )
+            intensity = MIN_INTENSITY
+        
+        self.activity_generator.intensity = intensity
+        logger.info(f"Calibrated intensity {intensity:.3f} (pilot estimate at 1.0: {base:.0f} events)")
+    
+    def _hour_start(self, date: datetime, hour: int) -> datetime:
+        """Get the start of an hour of a day, keeping the day's timezone."""
+        day_start = datetime.combine(date.date(), datetime.min.time()).replace(tzinfo=date.tzinfo)
+        return day_start + timedelta(hours=hour)
+    
+    def _first_pending_hour(self, date: datetime, next_hour: datetime) -> int:
+        """Get the first hour of a day at or after next_hour (24 if none)."""
+        if next_hour <= self._hour_start(date, 0):
+            return 0
+        hours_done = (next_hour - self._hour_start(date, 0)).total_seconds() // 3600
+        return int(min(24, hours_done))
+    
+    @property
+    def _compression(self) -> str:
+        """Output compression as recorded in checkpoints (empty for none)."""
+        return "gzip" if self.gzip_level is not None else ""
+    
+    def _start_checkpoint(self, users: List[User], next_hour: datetime) -> None:
+        """Snapshot the population and write the run's first checkpoint."""
+        digest = save_population(users, self.output_dir / POPULATION_FILE)
+        self.checkpoint = Checkpoint(
+            seed=self.streams.seed,
+            intensity=self.activity_generator.intensity,
+            log_format=self.log_format,
+            start_date=self.start_date.isoformat(),
+            end_date=self.end_date.isoformat(),
+            next_hour=next_hour.isoformat(),
+            population_sha256=digest,
+            syslog=str(self.syslog or ""),
+            compression=self._compression
+        )
+        self._save_checkpoint(next_hour)
+    
+    def _save_checkpoint(self, next_hour: datetime) -> None:
+        """Record that everything before next_hour has been written."""
+        # Queued behind the hour's writes, so the recorded sizes cover them
+        if self.writer:
+            self.writer.submit(self._write_checkpoint, next_hour)
+        else:
+            self._write_checkpoint(next_hour)
+    
+    def _write_checkpoint(self, next_hour: datetime) -> None:
+        """Flush the output files and save the checkpoint for next_hour."""
+        # File sizes must include everything still buffered in the open day files
+        for formatter in self.formatters:
+            formatter.flush()
+        
+        self.checkpoint.next_hour = next_hour.isoformat()
+        self.checkpoint.record_files(self.output_dir, [formatter.output_dir for formatter in self.formatters])
+        self.checkpoint.save(self.output_dir)
+    
+    def _resume_run(self, end_date: Optional[datetime] = None) -> Tuple[List[User], datetime]:
+        """
+        Restore the checkpointed run in output_dir.
+        
+        Output files are rolled back to the last completed hour, and the
+        seed, dates, intensity and user population come from the checkpoint,
+        so the remaining hours are generated exactly as in an uninterrupted run.
+        
+        Args:
+            end_date: Extend the run to this day if it is later than the
+                checkpoint's end date (incremental append)
+            
+        Returns:
+            The user population and the first hour still to generate
+            
+        Raises:
+            ValueError: If there is no usable checkpoint
+        """
+        checkpoint = Checkpoint.load(self.output_dir)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint found in {self.output_dir}; nothing to resume")
+        if checkpoint.log_format != self.log_format:
+            raise ValueError(
+                f"Checkpoint was written for format '{checkpoint.log_format}', not '{self.log_format}'"
+            )
+        if checkpoint.syslog != str(self.syslog or ""):
+            raise ValueError(
+                f"Checkpoint was written with syslog framing '{checkpoint.syslog or 'none'}', "
+                f"not '{self.syslog or 'none'}'"
+            )
+        if checkpoint.compression != self._compression:
+            raise ValueError(
+                f"Checkpoint was written with compression '{checkpoint.compression or 'none'}', "
+                f"not '{self._compression or 'none'}'"
+            )
+        
+        self.streams.seed = checkpoint.seed
+        self.activity_generator.intensity = checkpoint.intensity
+        self.start_date = datetime.fromisoformat(checkpoint.start_date)
+        self.end_date = datetime.fromisoformat(checkpoint.end_date)
+        if end_date and end_date.date() > self.end_date.date():
+            logger.info(f"Extending dataset from {self.end_date.date()} to {end_date.date()}")
+            self.end_date = end_date
+            checkpoint.end_date = end_date.isoformat()
+        
+        users = load_population(
+            self.output_dir / checkpoint.population_file,
+            self.enterprise_config.user_profiles,
+            checkpoint.population_sha256
+        )
+        PopulationBuilder(self.services).apply_weights(users)
+        self._set_users(users)
+        
+        # Drop anything written after the last completed hour
+        checkpoint.restore_files(self.output_dir, [formatter.output_dir for formatter in self.formatters])
+        shutil.rmtree(self.output_dir / ".shards", ignore_errors=True)
+        self.checkpoint = checkpoint
+        
+        logger.info(f"Resuming run from {checkpoint.next_hour} with {len(users)} users")
+        return users, checkpoint.next_hour_start
+    
+    def _plan_shards(self, days: List[datetime]) -> List[Tuple[datetime, int, int]]:
+        """
+        Split the day range into (date, first_hour, end_hour) shards.
+        
+        Whole days are the unit of work. When there are fewer days than
+        workers, days are split into equal blocks of hours so every worker
+        still gets a share of the range.
+        """
+        blocks_per_day = 1
+        for blocks in (1, 2, 3, 4, 6, 8, 12, 24):
+            blocks_per_day = blocks
+            if len(days) * blocks >= self.workers:
+                break
+        
+        hours_per_block = 24 // blocks_per_day
+        shards = []
+        for day in days:
+            for first_hour in range(0, 24, hours_per_block):
+                shards.append((day, first_hour, first_hour + hours_per_block))
+        return shards
+    
+    def _generate_sharded(
+        self,
+        users: List[User],
+        days: List[datetime],
+        next_hour: Optional[datetime] = None
+    ) -> None:
+        """
+        Generate the day range in parallel across worker processes.
+        
+        Each shard writes into its own scratch directory. Shards are merged
+        into the final per-day files in range order, so the resulting
+        LEEF/CEF files have the same layout as a single-process run. Hours
+        before next_hour (already written by an interrupted run) are skipped.
+        """
+        shards = []
+        for day, first_hour, end_hour in self._plan_shards(days):
+            if next_hour is not None:
+                first_hour = max(first_hour, self._first_pending_hour(day, next_hour))
+            if first_hour < end_hour:
+                shards.append((day, first_hour, end_hour))
+        if not shards:
+            return
+        
+        workers = min(self.workers, len(shards))
+        shard_root = self.output_dir / ".shards"
+        
+        logger.info(f"Generating {len(shards)} shards with {workers} worker processes")
+        
+        engine_kwargs = {
+            'enterprise_config': self.enterprise_config,
+            'services': self.services,
+            'output_dir': self.output_dir,
+            'log_format': self.log_format,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'seed': self.streams.seed,
+            'intensity': self.activity_generator.intensity,
+            'collect_stats': self.stats is not None,
+            'flush_policy': self.flush_policy,
+            'syslog': self.syslog,
+            'background_writes': self.background_writes,
+            'gzip_level': self.gzip_level,
+        }
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_shard_worker,
+            initargs=(engine_kwargs, users)
+        ) as executor:
+            shard_dirs = [shard_root / f"{index:05d}" for index in range(len(shards))]
+            results = executor.map(
+                _generate_shard,
+                shard_dirs,
+                [day for day, _, _ in shards],
+                [first_hour for _, first_hour, _ in shards],
+                [end_hour for _, _, end_hour in shards]
+            )
+            
+            # map() yields in submission order, so merging as results arrive
+            # preserves the sequential file layout
+            for (shard_dir, shard_stats), (day, _, end_hour) in zip(results, shards):
+                if self.stats:
+                    self.stats.merge(shard_stats)
+                    started = perf_counter()
+                    self._queue_merge(shard_dir)
+                    self.stats.add_time('write', perf_counter() - started)
+                else:
+                    self._queue_merge(shard_dir)
+                if self.checkpoint:
+                    self._save_checkpoint(self._hour_start(day, end_hour))
+        
+        if self.writer:
+            self.writer.drain()
+        shutil.rmtree(shard_root, ignore_errors=True)
+    
+    def _queue_merge(self, shard_dir: Path) -> None:
+        """Merge a shard now, or on the writer thread with background writes."""
+        if self.writer:
+            self.writer.submit(self._merge_shard, shard_dir)
+        else:
+            self._merge_shard(shard_dir)
+    
+    def _merge_shard(self, shard_dir: Path) -> None:
+        """Append a finished shard's per-day files to the final output files."""
+        for formatter in self.formatters:
+            shard_format_dir = shard_dir / formatter.output_dir.name
+            if not shard_format_dir.exists():
+                continue
+            
+            for shard_file in sorted(shard_format_dir.iterdir()):
+                if formatter.columnar:
+                    # Hourly columnar files cannot be appended to; shards
+                    # cover disjoint hours, so the files are moved as they are
+                    os.replace(shard_file, formatter.output_dir / shard_file.name)
+                    continue
+                with open(shard_file, 'rb') as src, \
+                        open(formatter.output_dir / shard_file.name, 'ab') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    
+    def _iter_hours(
+        self,
+        users: List[User],
+        date: datetime,
+        first_hour: int,
+        end_hour: int
+    ) -> Iterator[EventBatch]:
+        """
+        Yield one event batch per hour for the hours [first_hour, end_hour) of a day.
+        
+        Each session's requests and each user's junk traffic are already in
+        timestamp order and land in the batch as contiguous row runs, so the
+        hour is put in chronological order by heap-merging those runs:
+        O(n log k) for k runs.
+        """
+        # Stage timers only run when statistics are enabled
+        stats = self.stats
+        
+        # Process hour by hour
+        for hour in range(first_hour, end_hour):
+            hour_start = self._hour_start(date, hour)
             logger.debug(f"Generating logs for {hour_start}")
+            if stats:
+                stats.begin_hour(hour_start)
+                started = perf_counter()
             
             # Generate user sessions for this hour
             user_sessions = self.activity_generator.generate_hourly_activity(users, hour_start)
+            if stats:
+                stats.add_time('activity', perf_counter() - started)
             
-            # Process each user's sessions
-            for user_id, sessions in user_sessions.items():
-                user = next(u for u in users if u.id == user_id)
+            # Append one sorted run of rows per session and per user's junk traffic
+            batch = EventBatch()
+            runs = []
+            for user, sessions in user_sessions.items():
+                event_rng = self.streams.stream('events', user.id, hour_start)
                 
                 for session in sessions:
-                    # Generate requests for the session
-                    requests = session.generate_requests()
-                    
-                    # Convert requests to log events
-                    for request in requests:
-                        log_event = self._create_log_event(user, session, request)
-                        
-                        # Write to all formatters
-                        for formatter in self.formatters:
-                            formatter.write_event(log_event)
+                    first_row = len(batch)
+                    if stats:
+                        started = perf_counter()
+                        requests = session.generate_requests()
+                        generated = perf_counter()
+                        self._create_log_events(batch, user, session, requests, event_rng)
+                        stats.add_time('requests', generated - started)
+                        stats.add_time('events', perf_counter() - generated)
+                        stats.count('sessions')
+                        stats.count('requests', len(requests))
+                    else:
+                        self._create_log_events(batch, user, session, session.generate_requests(), event_rng)
+                    runs.append(range(first_row, len(batch)))
                 
                 # Generate junk traffic for active users
-                if self.junk_generator and self.activity_generator.should_generate_junk_traffic(user, hour_start):
-                    junk_events = self._generate_user_junk_traffic(user, hour_start)
-                    for event in junk_events:
-                        for formatter in self.formatters:
-                            formatter.write_event(event)
+                if stats:
+                    started = perf_counter()
+                junk_rng = self.streams.stream('junk', user.id, hour_start)
+                if self.junk_generator and self.activity_generator.should_generate_junk_traffic(user, hour_start, junk_rng):
+                    first_row = len(batch)
+                    for event in self._generate_user_junk_traffic(user, hour_start, junk_rng):
+                        batch.append_event(event)
+                    runs.append(range(first_row, len(batch)))
+                if stats:
+                    stats.add_time('junk', perf_counter() - started)
+            
+            if stats:
+                started = perf_counter()
+            batch.reorder(list(heapq.merge(*runs, key=batch.timestamps.__getitem__)))
+            if stats:
+                stats.add_time('merge', perf_counter() - started)
+                stats.count('events', len(batch))
+            yield batch
     
-    def _create_log_event(self, user: User, session: Any, request: Dict[str, Any]) -> LogEvent:
-        """Convert a session request to a log event."""
-        # Determine destination based on service
-        if session.service.network.ip_ranges:
-            dest_ip = self.ip_generator.generate_destination_ip(
-                session.service.network.ip_ranges
-            )
-        else:
-            dest_ip = self.ip_generator.generate_destination_ip()
+    def _create_log_events(
+        self,
+        batch: EventBatch,
+        user: User,
+        session: Any,
+        requests: List[Dict[str, Any]],
+        rng: Optional[random.Random] = None
+    ) -> None:
+        """Convert a session's requests to log events appended to a batch."""
+        rng = rng or random
+        ip_ranges = session.service.network.ip_ranges
+        domains = session.service.network.domains
         
-        # Build URL
-        domain = random.choice(session.service.network.domains)
-        # Remove wildcards from domain
-        domain = domain.replace('*.', '')
-        url = f"https://{domain}{request['path']}"
+        timestamps = []
+        dest_ips = []
+        source_ports = []
+        urls = []
+        methods = []
+        status_codes = []
+        bytes_sent = []
+        bytes_received = []
+        durations = []
+        actions = []
+        additional_fields = []
         
-        # Determine action
-        if request.get('type') == 'blocked' or request.get('status_code') == 403:
-            action = 'blocked'
-        else:
-            action = 'allowed'
+        for request in requests:
+            # Determine destination based on service
+            if ip_ranges:
+                dest_ips.append(self.ip_generator.generate_destination_ip(ip_ranges, rng=rng))
+            else:
+                dest_ips.append(self.ip_generator.generate_destination_ip(rng=rng))
+            
+            # Build URL, removing wildcards from the domain
+            domain = rng.choice(domains).replace('*.', '')
+            urls.append(f"https://{domain}{request['path']}")
+            
+            source_ports.append(self.ip_generator.generate_source_port(rng=rng))
+            
+            # Determine action
+            if request.get('type') == 'blocked' or request.get('status_code') == 403:
+                actions.append('blocked')
+            else:
+                actions.append('allowed')
+            
+            timestamps.append(request['timestamp'])
+            methods.append(request['method'])
+            status_codes.append(request['status_code'])
+            bytes_sent.append(request.get('bytes_sent', 0))
+            bytes_received.append(request.get('bytes_received', 0))
+            durations.append(request['duration_ms'])
+            additional_fields.append({
+                'session_id': session.id,
+                'request_type': request.get('type', 'unknown'),
+                'block_reason': request.get('block_reason')
+            } if request.get('block_reason') else None)
         
-        # Create log event
-        return LogEvent(
-            timestamp=request['timestamp'],
+        # Per-session values are shared by every row and encoded once
+        batch.extend(
+            timestamps,
+            additional_fields=additional_fields,
             source_ip=session.source_ip,
-            destination_ip=dest_ip,
-            source_port=self.ip_generator.generate_source_port(),
+            destination_ip=dest_ips,
+            source_port=source_ports,
             destination_port=443,
             username=user.username,
             user_domain=self.enterprise_config.enterprise['domain'],
-            url=url,
-            method=request['method'],
-            status_code=request['status_code'],
-            bytes_sent=request.get('bytes_sent', 0),
-            bytes_received=request.get('bytes_received', 0),
-            duration_ms=request['duration_ms'],
+            url=urls,
+            method=methods,
+            status_code=status_codes,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            duration_ms=durations,
             user_agent=session.user_agent,
-            action=action,
+            action=actions,
             category=session.service.category,
             risk_level=session.service.risk_level,
             service_name=session.service.name,
-            protocol='https',
-            additional_fields={
-                'session_id': session.id,
-                'request_type': request.get('type', 'unknown'),
-                'block_reason': request.get('block_reason')
-            } if request.get('block_reason') else None
+            protocol='https'
         )
     
-    def _generate_user_junk_traffic(self, user: User, hour_start: datetime) -> List[LogEvent]:
+    def _generate_user_junk_traffic(
+        self,
+        user: User,
+        hour_start: datetime,
+        rng: Optional[random.Random] = None
+    ) -> List[LogEvent]:
         """Generate junk traffic events for a user during an hour."""
         hour_end = hour_start + timedelta(hours=1)
         
@@ -287,9 +897,47 @@ class LogGenerationEngine:
             source_ip=user.source_ip,
             start_time=hour_start,
             end_time=hour_end,
-            user_agent=self.activity_generator._get_desktop_user_agent()
+            user_agent=self.activity_generator._get_desktop_user_agent(rng),
+            rng=rng
         )
 
 
+def _init_shard_worker(engine_kwargs: Dict[str, Any], users: List[User]) -> None:
+    """Build the per-process engine used by _generate_shard."""
+    global _worker_engine
+    
+    _worker_engine = LogGenerationEngine(**engine_kwargs)
+    _worker_engine._set_users(users)
+
+
+def _generate_shard(
+    shard_dir: Path,
+    date: datetime,
+    first_hour: int,
+    end_hour: int
+) -> Tuple[Path, Optional[Dict[str, Any]]]:
+    """Generate one shard into its own scratch directory; return it and the shard's statistics."""
+    engine = _worker_engine
+    engine.output_dir = shard_dir
+    engine.formatters = engine._init_formatters()
+    if engine.stats:
+        engine.stats = GenerationStats()
+    
+    for formatter in engine.formatters:
+        formatter.setup()
+    
+    logger.info(f"Generating logs for {date.date()} hours {first_hour:02d}-{end_hour - 1:02d}")
+    for batch in engine._iter_hours(engine.users, date, first_hour, end_hour):
+        engine._write_batch(batch)
+    
+    for formatter in engine.formatters:
+        formatter.finalize()
+    # Finish the shard's writes before the parent merges it; the next shard restarts the thread
+    if engine.writer:
+        engine.writer.close()
+    
+    return shard_dir, engine.stats.to_dict() if engine.stats else None
+
+
 # Alias for compatibility
 LogGeneratorEngine = LogGenerationEngine
\ No newline at end of file
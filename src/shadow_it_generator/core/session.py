@@ -7,22 +7,116 @@ within sessions.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, List, Optional, Dict, Any, Tuple
 import random
 from ..utils.numpy_compat import np  # Numpy compatibility layer
+from ..utils.alias_sampler import AliasSampler
+
+try:
+    import numpy
+except ImportError:
+    # Real numpy is optional (the "full" extra); requests are then generated one by one
+    numpy = None
 
 from ..config.models import CloudService
 from ..formatters.base import LogEvent
 from .user import User
 
 
+@dataclass(frozen=True)
+class RequestProfile:
+    """
+    Parameters of the requests made by one kind of action.
+
+    Session._get_request_details (one request at a time) and
+    Session._get_request_details_bulk (numpy arrays) both read these, so
+    the two request paths draw from the same tables. Ranges are inclusive,
+    as for random.randint.
+
+    Attributes:
+        methods: HTTP methods, drawn uniformly; a single method is used as is
+        paths: Request paths, drawn uniformly; empty when the paths come from
+            the service (or, for downloads, from a file id)
+        bytes_sent: Range of request sizes; None when the action's size sets it
+        bytes_received: Range of response sizes; None when the action's size sets it
+        duration_ms: Range of request durations
+    """
+    methods: Tuple[str, ...]
+    paths: Tuple[str, ...] = ()
+    bytes_sent: Optional[Tuple[int, int]] = None
+    bytes_received: Optional[Tuple[int, int]] = None
+    duration_ms: Tuple[int, int] = (100, 1000)
+
+
+FILE_ACTIONS = ('file_upload', 'file_download')
+MESSAGE_ACTIONS = ('message_send', 'email_send')
+
+_MESSAGE_PROFILE = RequestProfile(
+    ('POST',), ('/api/messages', '/api/send', '/api/v2/messages'), bytes_received=(200, 500)
+)
+
+# Request parameters by action name
+REQUEST_PROFILES: Dict[str, RequestProfile] = {
+    'file_upload': RequestProfile(
+        ('POST',), ('/api/upload', '/files/upload', '/api/v2/files'),
+        bytes_received=(200, 1000), duration_ms=(500, 5000)
+    ),
+    'file_download': RequestProfile(('GET',), bytes_sent=(200, 500), duration_ms=(500, 5000)),
+    'message_send': _MESSAGE_PROFILE,
+    'email_send': _MESSAGE_PROFILE,
+    'api_call': RequestProfile(
+        ('GET', 'POST', 'PUT', 'DELETE'), bytes_sent=(100, 2000), bytes_received=(500, 50000), duration_ms=(50, 500)
+    ),
+}
+
+# Any other action is a page view of one of the service's web paths
+PAGE_VIEW_PROFILE = RequestProfile(('GET',), bytes_sent=(200, 800), bytes_received=(5000, 100000))
+
+# File sizes are normal around the action's avg_size_mb (size_std_dev MB,
+# default FILE_SIZE_STD_DEV_MB) with the range minimum as a floor, or
+# uniform over the range when the action has no size
+FILE_SIZE_RANGE = (1024, 10 * 1024 * 1024)
+FILE_SIZE_STD_DEV_MB = 5
+FILE_ID_RANGE = (1000, 9999)
+
+# Messages are the action's size_bytes (default MESSAGE_SIZE_BYTES), give or take the jitter
+MESSAGE_SIZE_BYTES = 1000
+MESSAGE_SIZE_JITTER = 200
+
+DEFAULT_API_PATHS = ['/api/v1/data']
+
+# Most requests succeed; the rest get one of the error codes
+SUCCESS_RATE = 0.95
+SUCCESS_STATUS_CODES = (200, 304)
+ERROR_STATUS_CODES = (400, 401, 404, 500, 503)
+
+
+def request_profile(action_name: str) -> RequestProfile:
+    """Get the request parameters of an action (page view for unknown actions)."""
+    return REQUEST_PROFILES.get(action_name, PAGE_VIEW_PROFILE)
+
+
+def file_size_params(action_config: Any) -> Optional[Tuple[float, float]]:
+    """Get the (mean, standard deviation) file size in bytes, or None for uniform sizes."""
+    if action_config and hasattr(action_config, 'avg_size_mb'):
+        std_dev_mb = getattr(action_config, 'size_std_dev', FILE_SIZE_STD_DEV_MB)
+        return action_config.avg_size_mb * 1024 * 1024, std_dev_mb * 1024 * 1024
+    return None
+
+
+def message_size(action_config: Any) -> int:
+    """Get the typical message size in bytes."""
+    return getattr(action_config, 'size_bytes', MESSAGE_SIZE_BYTES) if action_config else MESSAGE_SIZE_BYTES
+
+
 @dataclass
 class Session:
     """
     Represents a user session with a cloud service.
     
     A session is a period of continuous interaction with a service,
-    containing multiple requests.
+    containing multiple requests. All randomness is drawn from ``rng`` so
+    a session can be replayed exactly from its stream.
     """
     id: str
     user: User
@@ -45,8 +139,19 @@ class Session:
     is_active: bool = True
     was_blocked: bool = False
     
+    # Scales the activity request rate (set by volume calibration)
+    intensity: float = 1.0
+    
+    # Random stream for this session (defaults to the global one)
+    rng: Any = field(default=random, repr=False, compare=False)
+    
+    # Action samplers shared by all sessions, keyed by id() of a service's actions
+    _action_samplers: ClassVar[Dict[int, Tuple[Any, AliasSampler]]] = {}
+    
     def __post_init__(self):
         """Initialize session duration based on service and user profile."""
+        self._np = np.random.default_rng(self.rng)
+        
         if self.end_time is None:
             # Generate session duration
             duration = self._generate_duration()
@@ -91,7 +196,7 @@ class Session:
             max_duration = 2
         
         # Generate duration with some randomness
-        duration_minutes = np.random.gamma(2, (max_duration - min_duration) / 4) + min_duration
+        duration_minutes = self._np.gamma(2, (max_duration - min_duration) / 4) + min_duration
         duration_minutes = max(min_duration, min(max_duration, duration_minutes))
         
         return timedelta(minutes=duration_minutes)
@@ -108,18 +213,18 @@ class Session:
         
         # If blocked service, generate one or a few blocked attempts
         if self.service.status == "blocked":
-            num_attempts = random.randint(1, 3)
+            num_attempts = self.rng.randint(1, 3)
             for i in range(num_attempts):
                 requests.append(self._generate_blocked_request(current_time))
-                current_time += timedelta(seconds=random.randint(1, 10))
+                current_time += timedelta(seconds=self.rng.randint(1, 10))
             self.was_blocked = True
             return requests
         
         # Normal session flow
         # Start with authentication if needed
-        if random.random() < 0.8:  # 80% of sessions start with auth
+        if self.rng.random() < 0.8:  # 80% of sessions start with auth
             requests.append(self._generate_auth_request(current_time))
-            current_time += timedelta(seconds=random.randint(1, 5))
+            current_time += timedelta(seconds=self.rng.randint(1, 5))
             self.is_authenticated = True
         
         # Generate activity requests based on service patterns
@@ -139,12 +244,16 @@ class Session:
             total_rate = 30
         
         # Convert to requests per minute
-        requests_per_minute = total_rate / 60
+        requests_per_minute = total_rate * self.intensity / 60
+        
+        if numpy is not None:
+            requests.extend(self._generate_activity_requests_vectorized(current_time, requests_per_minute))
+            return requests
         
         # Generate requests with exponential inter-arrival times
         while current_time < self.end_time:
             # Exponential distribution for realistic spacing
-            interval = np.random.exponential(1 / requests_per_minute)
+            interval = self._np.exponential(1 / requests_per_minute)
             current_time += timedelta(minutes=interval)
             
             if current_time >= self.end_time:
@@ -157,17 +266,168 @@ class Session:
         
         return requests
     
+    def _generate_activity_requests_vectorized(
+        self,
+        current_time: datetime,
+        requests_per_minute: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate all activity requests of the session with numpy.
+        
+        Equivalent to the request loop in generate_requests, but arrival
+        times, actions, status codes, sizes and durations are drawn as
+        arrays in one shot. The numpy generator is seeded from the
+        session's stream, so results stay reproducible.
+        
+        Args:
+            current_time: Time the activity starts (after any auth request)
+            requests_per_minute: Mean request rate
+            
+        Returns:
+            List of request dictionaries in timestamp order
+        """
+        gen = numpy.random.default_rng(self.rng.getrandbits(64))
+        span_minutes = (self.end_time - current_time).total_seconds() / 60
+        if span_minutes <= 0:
+            return []
+        
+        # Exponential inter-arrival times; draw more until the session end is passed
+        scale = 1 / requests_per_minute
+        expected = int(span_minutes * requests_per_minute)
+        arrivals = numpy.cumsum(gen.exponential(scale, expected + expected // 2 + 16))
+        while arrivals[-1] < span_minutes:
+            extra = numpy.cumsum(gen.exponential(scale, expected // 2 + 16)) + arrivals[-1]
+            arrivals = numpy.concatenate((arrivals, extra))
+        count = int(numpy.searchsorted(arrivals, span_minutes, side='left'))
+        if count == 0:
+            return []
+        offsets_us = numpy.rint(arrivals[:count] * 60_000_000).astype(numpy.int64).tolist()
+        
+        # Select action types based on weights
+        if self.service.activity.actions:
+            actions = list(self.service.activity.actions.items())
+            weights = numpy.array([action[1].weight for action in actions], dtype=float)
+            action_index = gen.choice(len(actions), size=count, p=weights / weights.sum())
+        else:
+            actions = [('page_view', None)]
+            action_index = numpy.zeros(count, dtype=numpy.int64)
+        
+        # Status codes: most requests succeed, with occasional errors
+        status_codes = numpy.where(
+            gen.random(count) < SUCCESS_RATE,
+            gen.choice(SUCCESS_STATUS_CODES, size=count),
+            gen.choice(ERROR_STATUS_CODES, size=count)
+        ).tolist()
+        
+        # Request details are drawn per action type, then scattered back into row order
+        methods = [None] * count
+        paths = [None] * count
+        bytes_sent = [0] * count
+        bytes_received = [0] * count
+        durations = [0] * count
+        for index, (action_name, action_config) in enumerate(actions):
+            rows = numpy.flatnonzero(action_index == index).tolist()
+            if not rows:
+                continue
+            details = self._get_request_details_bulk(action_name, action_config, len(rows), gen)
+            low, high = request_profile(action_name).duration_ms
+            action_durations = gen.integers(low, high + 1, size=len(rows)).tolist()
+            for i, row in enumerate(rows):
+                methods[row] = details['method'][i]
+                paths[row] = details['path'][i]
+                bytes_sent[row] = details['bytes_sent'][i]
+                bytes_received[row] = details['bytes_received'][i]
+                durations[row] = action_durations[i]
+        
+        types = [actions[index][0] for index in action_index.tolist()]
+        requests = []
+        for i in range(count):
+            requests.append({
+                'method': methods[i],
+                'path': paths[i],
+                'bytes_sent': bytes_sent[i],
+                'bytes_received': bytes_received[i],
+                'timestamp': current_time + timedelta(microseconds=offsets_us[i]),
+                'type': types[i],
+                'status_code': status_codes[i],
+                'duration_ms': durations[i]
+            })
+        
+        # Track bytes
+        self.request_count += count
+        self.total_bytes_sent += sum(bytes_sent)
+        self.total_bytes_received += sum(bytes_received)
+        
+        return requests
+    
+    def _get_request_details_bulk(
+        self,
+        action_name: str,
+        action_config: Any,
+        count: int,
+        gen: Any
+    ) -> Dict[str, List[Any]]:
+        """
+        Vectorized _get_request_details: one list per field, count rows each.
+        
+        Reads the same profile and draws the fields in the same order as
+        _get_request_details.
+        """
+        profile = request_profile(action_name)
+        
+        def integers(bounds: Tuple[int, int]) -> Any:
+            return gen.integers(bounds[0], bounds[1] + 1, size=count)
+        
+        details = {}
+        if action_name in FILE_ACTIONS:
+            # File operations
+            size_params = file_size_params(action_config)
+            if size_params:
+                sizes = numpy.maximum(FILE_SIZE_RANGE[0], gen.normal(*size_params, count)).astype(numpy.int64)
+            else:
+                sizes = integers(FILE_SIZE_RANGE)
+            
+            details['method'] = [profile.methods[0]] * count
+            if action_name == 'file_upload':
+                details['path'] = gen.choice(profile.paths, size=count).tolist()
+                details['bytes_sent'] = sizes.tolist()
+                details['bytes_received'] = integers(profile.bytes_received).tolist()
+            else:
+                details['path'] = [f'/files/{n}/download' for n in integers(FILE_ID_RANGE).tolist()]
+                details['bytes_sent'] = integers(profile.bytes_sent).tolist()
+                details['bytes_received'] = sizes.tolist()
+                
+        elif action_name in MESSAGE_ACTIONS:
+            # Communication actions
+            details['method'] = [profile.methods[0]] * count
+            details['path'] = gen.choice(profile.paths, size=count).tolist()
+            jitter = integers((-MESSAGE_SIZE_JITTER, MESSAGE_SIZE_JITTER))
+            details['bytes_sent'] = (message_size(action_config) + jitter).tolist()
+            details['bytes_received'] = integers(profile.bytes_received).tolist()
+            
+        else:
+            # API calls and page views, on the service's own paths
+            if len(profile.methods) > 1:
+                details['method'] = gen.choice(profile.methods, size=count).tolist()
+            else:
+                details['method'] = [profile.methods[0]] * count
+            details['path'] = gen.choice(self._service_paths(action_name), size=count).tolist()
+            details['bytes_sent'] = integers(profile.bytes_sent).tolist()
+            details['bytes_received'] = integers(profile.bytes_received).tolist()
+        
+        return details
+    
     def _generate_auth_request(self, timestamp: datetime) -> Dict[str, Any]:
         """Generate an authentication request."""
         return {
             'timestamp': timestamp,
             'type': 'auth',
-            'path': random.choice(['/login', '/api/auth', '/oauth/authorize', '/saml/sso']),
+            'path': self.rng.choice(['/login', '/api/auth', '/oauth/authorize', '/saml/sso']),
             'method': 'POST',
             'status_code': 200 if not self.was_blocked else 403,
-            'bytes_sent': random.randint(200, 500),
-            'bytes_received': random.randint(1000, 5000),
-            'duration_ms': random.randint(100, 500)
+            'bytes_sent': self.rng.randint(200, 500),
+            'bytes_received': self.rng.randint(1000, 5000),
+            'duration_ms': self.rng.randint(100, 500)
         }
     
     def _generate_blocked_request(self, timestamp: datetime) -> Dict[str, Any]:
@@ -177,12 +437,12 @@ class Session:
         return {
             'timestamp': timestamp,
             'type': 'blocked',
-            'path': random.choice(paths),
+            'path': self.rng.choice(paths),
             'method': 'GET',
             'status_code': 403,
-            'bytes_sent': random.randint(100, 300),
-            'bytes_received': random.randint(500, 1500),  # Block page
-            'duration_ms': random.randint(10, 50),
+            'bytes_sent': self.rng.randint(100, 300),
+            'bytes_received': self.rng.randint(500, 1500),  # Block page
+            'duration_ms': self.rng.randint(10, 50),
             'block_reason': self._get_block_reason()
         }
     
@@ -190,10 +450,7 @@ class Session:
         """Generate a normal activity request."""
         # Select action type based on weights
         if self.service.activity.actions:
-            actions = list(self.service.activity.actions.items())
-            action_weights = [action[1].weight for action in actions]
-            selected_action = random.choices(actions, weights=action_weights)[0]
-            action_name, action_config = selected_action
+            action_name, action_config = self._get_action_sampler().draw(self.rng)
         else:
             action_name = 'page_view'
             action_config = None
@@ -215,74 +472,78 @@ class Session:
         
         return request_details
     
+    def _get_action_sampler(self) -> AliasSampler:
+        """Get the (cached) weighted sampler over the service's actions."""
+        actions = self.service.activity.actions
+        cached = self._action_samplers.get(id(actions))
+        if cached is None or cached[0] is not actions:
+            items = list(actions.items())
+            cached = (actions, AliasSampler(items, [action[1].weight for action in items]))
+            self._action_samplers[id(actions)] = cached
+        return cached[1]
+    
     def _get_request_details(self, action_name: str, action_config: Any) -> Dict[str, Any]:
-        """Get request details based on action type."""
-        details = {}
+        """Get request details based on action type (see REQUEST_PROFILES)."""
+        profile = request_profile(action_name)
         
-        if action_name in ['file_upload', 'file_download']:
+        details = {}
+        if action_name in FILE_ACTIONS:
             # File operations
-            if action_config and hasattr(action_config, 'avg_size_mb'):
-                avg_size = action_config.avg_size_mb * 1024 * 1024
-                std_dev = getattr(action_config, 'size_std_dev', 5) * 1024 * 1024
-                size = int(max(1024, np.random.normal(avg_size, std_dev)))
+            size_params = file_size_params(action_config)
+            if size_params:
+                size = int(max(FILE_SIZE_RANGE[0], self._np.normal(*size_params)))
             else:
-                size = random.randint(1024, 10 * 1024 * 1024)
+                size = self.rng.randint(*FILE_SIZE_RANGE)
             
+            details['method'] = profile.methods[0]
             if action_name == 'file_upload':
-                details['method'] = 'POST'
-                details['path'] = random.choice(['/api/upload', '/files/upload', '/api/v2/files'])
+                details['path'] = self.rng.choice(profile.paths)
                 details['bytes_sent'] = size
-                details['bytes_received'] = random.randint(200, 1000)
+                details['bytes_received'] = self.rng.randint(*profile.bytes_received)
             else:
-                details['method'] = 'GET'
-                details['path'] = f'/files/{random.randint(1000, 9999)}/download'
-                details['bytes_sent'] = random.randint(200, 500)
+                details['path'] = f'/files/{self.rng.randint(*FILE_ID_RANGE)}/download'
+                details['bytes_sent'] = self.rng.randint(*profile.bytes_sent)
                 details['bytes_received'] = size
                 
-        elif action_name in ['message_send', 'email_send']:
+        elif action_name in MESSAGE_ACTIONS:
             # Communication actions
-            details['method'] = 'POST'
-            details['path'] = random.choice(['/api/messages', '/api/send', '/api/v2/messages'])
-            size = getattr(action_config, 'size_bytes', 1000) if action_config else 1000
-            details['bytes_sent'] = size + random.randint(-200, 200)
-            details['bytes_received'] = random.randint(200, 500)
-            
-        elif action_name == 'api_call':
-            # API calls
-            details['method'] = random.choice(['GET', 'POST', 'PUT', 'DELETE'])
-            api_paths = self.service.traffic_patterns.api_endpoints or ['/api/v1/data']
-            details['path'] = random.choice(api_paths)
-            details['bytes_sent'] = random.randint(100, 2000)
-            details['bytes_received'] = random.randint(500, 50000)
+            details['method'] = profile.methods[0]
+            details['path'] = self.rng.choice(profile.paths)
+            jitter = self.rng.randint(-MESSAGE_SIZE_JITTER, MESSAGE_SIZE_JITTER)
+            details['bytes_sent'] = message_size(action_config) + jitter
+            details['bytes_received'] = self.rng.randint(*profile.bytes_received)
             
         else:
-            # Default page view
-            details['method'] = 'GET'
-            paths = self.service.traffic_patterns.web_paths or ['/']
-            details['path'] = random.choice(paths)
-            details['bytes_sent'] = random.randint(200, 800)
-            details['bytes_received'] = random.randint(5000, 100000)
+            # API calls and page views, on the service's own paths
+            if len(profile.methods) > 1:
+                details['method'] = self.rng.choice(profile.methods)
+            else:
+                details['method'] = profile.methods[0]
+            details['path'] = self.rng.choice(self._service_paths(action_name))
+            details['bytes_sent'] = self.rng.randint(*profile.bytes_sent)
+            details['bytes_received'] = self.rng.randint(*profile.bytes_received)
         
         return details
     
+    def _service_paths(self, action_name: str) -> List[str]:
+        """Get the paths an API call or page view is drawn from."""
+        patterns = self.service.traffic_patterns
+        if action_name == 'api_call':
+            return patterns.api_endpoints or DEFAULT_API_PATHS
+        return patterns.web_paths or ['/']
+    
     def _get_status_code(self) -> int:
         """Get HTTP status code for request."""
         # Most requests succeed
-        if random.random() < 0.95:
-            return random.choice([200, 304])  # OK or Not Modified
+        if self.rng.random() < SUCCESS_RATE:
+            return self.rng.choice(SUCCESS_STATUS_CODES)  # OK or Not Modified
         else:
             # Occasional errors
-            return random.choice([400, 401, 404, 500, 503])
+            return self.rng.choice(ERROR_STATUS_CODES)
     
     def _get_duration_ms(self, action_name: str) -> int:
         """Get request duration in milliseconds."""
-        # Different actions have different typical durations
-        if action_name in ['file_upload', 'file_download']:
-            return random.randint(500, 5000)
-        elif action_name == 'api_call':
-            return random.randint(50, 500)
-        else:
-            return random.randint(100, 1000)
+        return self.rng.randint(*request_profile(action_name).duration_ms)
     
     def _get_block_reason(self) -> str:
         """Get reason for blocking based on service."""
@@ -308,4 +569,4 @@ class Session:
                 "IT Policy Block"
             ]
         
-        return random.choice(reasons)
\ No newline at end of file
+        return self.rng.choice(reasons)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Per-stage timing and counters for log generation.
+
+The engine only touches a GenerationStats object when statistics are
+enabled, so a run without them pays nothing beyond one check per hour
+and per session.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationStats:
+    """
+    Counters and stage timers, per hour and for the whole run.
+
+    Stages:
+        activity: planning active users and their sessions
+        requests: Session.generate_requests
+        events: converting requests into batch rows
+        junk: junk traffic generation
+        merge: putting each hour in timestamp order
+        format: rendering lines in the formatters
+        write: appending lines to the output files
+    """
+
+    STAGES = ('activity', 'requests', 'events', 'junk', 'merge', 'format', 'write')
+    COUNTERS = ('sessions', 'requests', 'events', 'events_formatted', 'bytes_written')
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.seconds: Dict[str, float] = {stage: 0.0 for stage in self.STAGES}
+        self.counts: Dict[str, int] = {counter: 0 for counter in self.COUNTERS}
+        self.hours: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def begin_hour(self, hour_start: datetime) -> None:
+        """
+        Start collecting for an hour, closing the previous one.
+
+        Args:
+            hour_start: Start of the hour
+        """
+        self.end_hour()
+        self._current = {
+            'hour': hour_start.isoformat(),
+            'seconds': {stage: 0.0 for stage in self.STAGES},
+            'counts': {counter: 0 for counter in self.COUNTERS},
+        }
+
+    def end_hour(self) -> None:
+        """Close the current hour, if any, and log its summary at debug level."""
+        current = self._current
+        if current is None:
+            return
+
+        self.hours.append(current)
+        self._current = None
+
+        if logger.isEnabledFor(logging.DEBUG):
+            counts = current['counts']
+            timings = " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in current['seconds'].items())
+            logger.debug(
+                f"{current['hour']}: {counts['sessions']} sessions, {counts['requests']} requests, "
+                f"{counts['events']} events, {counts['bytes_written']} bytes; {timings}"
+            )
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self.seconds[stage] += seconds
+        if self._current is not None:
+            self._current['seconds'][stage] += seconds
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self.counts[counter] += amount
+        if self._current is not None:
+            self._current['counts'][counter] += amount
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """
+        Fold in statistics from another run (e.g. a shard worker).
+
+        Args:
+            other: Output of another GenerationStats.to_dict()
+        """
+        for stage, seconds in other['seconds'].items():
+            self.seconds[stage] += seconds
+        for counter, amount in other['counts'].items():
+            self.counts[counter] += amount
+        self.hours.extend(other['hours'])
+        self.hours.sort(key=lambda hour: hour['hour'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the statistics as plain data."""
+        self.end_hour()
+        return {
+            'seconds': dict(self.seconds),
+            'counts': dict(self.counts),
+            'hours': list(self.hours),
+        }
+
+    def write_report(self, path: Path) -> None:
+        """
+        Write the statistics as a JSON report.
+
+        Args:
+            path: Report file to write
+        """
+        report = self.to_dict()
+        total = sum(report['seconds'].values())
+        report['total_seconds'] = total
+        report['events_per_second'] = report['counts']['events'] / total if total else 0.0
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
@@ -5,7 +5,7 @@ This module defines user entities with their behavior profiles,
 service assignments, and activity patterns.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
 from typing import List, Dict, Any, Optional, Set
 from datetime import datetime, time
 import random
@@ -14,13 +14,17 @@ from ..utils.numpy_compat import np  # Numpy compatibility layer
 from ..config.models import UserProfile, CloudService
 
 
-@dataclass
+@dataclass(eq=False)
 class User:
     """
     Represents a single user in the enterprise.
     
     Tracks user identity, behavior profile, assigned services,
-    and activity patterns.
+    and activity patterns. Methods that draw random values accept an
+    optional ``rng`` stream and fall back to the global ``random`` module.
+    
+    Users compare and hash by identity so they can key per-hour
+    session maps directly.
     """
     id: str
     email: str
@@ -31,7 +35,9 @@ class User:
     department: Optional[str] = None
     locale: str = "US"
     
-    # Services this user has access to
+    # Services this user has access to. The weights dict may be shared
+    # with other users of the same profile (see PopulationBuilder), so it
+    # is replaced rather than modified in place
     assigned_services: Set[str] = field(default_factory=set)
     service_adoption_weights: Dict[str, float] = field(default_factory=dict)
     
@@ -40,44 +46,65 @@ class User:
     daily_request_count: int = 0
     sessions_today: int = 0
     
-    # User-specific patterns
-    work_start_time: time = field(default_factory=lambda: time(8, random.randint(0, 59)))
-    work_end_time: time = field(default_factory=lambda: time(17, random.randint(0, 59)))
-    lunch_time: time = field(default_factory=lambda: time(12, random.randint(0, 59)))
+    # User-specific patterns (drawn in __post_init__ when not given)
+    work_start_time: Optional[time] = None
+    work_end_time: Optional[time] = None
+    lunch_time: Optional[time] = None
     
     # Device preferences
     preferred_user_agent: Optional[str] = None
     mobile_probability: float = 0.2  # 20% chance of mobile usage
     
-    def __post_init__(self):
+    # Random stream used for the per-user patterns above
+    rng: InitVar[Optional[random.Random]] = None
+    
+    def __post_init__(self, rng: Optional[random.Random]):
         """Initialize user-specific patterns based on profile."""
+        if self.work_start_time and self.work_end_time and self.lunch_time:
+            return  # Patterns given explicitly (e.g. loaded from a snapshot)
+        
+        rng = rng or random
+        
+        if self.work_start_time is None:
+            self.work_start_time = time(8, rng.randint(0, 59))
+        if self.work_end_time is None:
+            self.work_end_time = time(17, rng.randint(0, 59))
+        if self.lunch_time is None:
+            self.lunch_time = time(12, rng.randint(0, 59))
+        
         # Adjust work hours based on profile
         if self.profile.name == "power_user":
             # Power users often work longer hours
-            self.work_start_time = time(7, random.randint(30, 59))
-            self.work_end_time = time(18, random.randint(0, 59))
+            self.work_start_time = time(7, rng.randint(30, 59))
+            self.work_end_time = time(18, rng.randint(0, 59))
             self.mobile_probability = 0.3
         elif self.profile.name == "risky":
             # Risky users have irregular hours
-            self.work_start_time = time(random.randint(6, 10), random.randint(0, 59))
-            self.work_end_time = time(random.randint(16, 20), random.randint(0, 59))
+            self.work_start_time = time(rng.randint(6, 10), rng.randint(0, 59))
+            self.work_end_time = time(rng.randint(16, 20), rng.randint(0, 59))
             self.mobile_probability = 0.4
     
-    def assign_services(self, available_services: List[CloudService]) -> None:
+    def assign_services(self, available_services: List[CloudService], rng: Optional[random.Random] = None) -> None:
         """
         Assign cloud services to this user based on their profile.
         
         Args:
             available_services: List of all available cloud services
+            rng: Optional random stream
         """
+        rng = rng or random
+        
+        # Build a new weights dict; the current one may be shared
+        weights = dict(self.service_adoption_weights)
         for service in available_services:
             # Determine if user should have access to this service
             adoption_chance = self._calculate_service_adoption(service)
             
-            if random.random() < adoption_chance:
+            if rng.random() < adoption_chance:
                 self.assigned_services.add(service.name)
                 # Store individual weight for this user-service combination
-                self.service_adoption_weights[service.name] = adoption_chance
+                weights[service.name] = adoption_chance
+        self.service_adoption_weights = weights
     
     def _calculate_service_adoption(self, service: CloudService) -> float:
         """
@@ -89,46 +116,15 @@ class User:
         Returns:
             Probability between 0 and 1
         """
-        base_rate = service.activity.user_adoption_rate
-        
-        # Adjust based on user profile
-        if self.profile.name == "normal":
-            # Normal users mostly use sanctioned services
-            if service.status == "sanctioned":
-                multiplier = 1.2
-            elif service.status == "unsanctioned":
-                multiplier = 0.5
-            else:  # blocked
-                multiplier = 0.1
-        elif self.profile.name == "power_user":
-            # Power users use more services overall
-            if service.status == "sanctioned":
-                multiplier = 1.5
-            elif service.status == "unsanctioned":
-                multiplier = 0.8
-            else:  # blocked
-                multiplier = 0.2
-        else:  # risky
-            # Risky users are more likely to use unsanctioned/blocked services
-            if service.status == "sanctioned":
-                multiplier = 0.8
-            elif service.status == "unsanctioned":
-                multiplier = 1.5
-            else:  # blocked
-                multiplier = 0.8
-        
-        # Apply shadow IT likelihood from profile
-        if service.status != "sanctioned":
-            multiplier *= self.profile.shadow_it_likelihood
-        
-        return min(1.0, base_rate * multiplier)
+        return calculate_service_adoption(self.profile, service)
     
-    def get_activity_level(self, current_time: datetime) -> float:
+    def get_activity_level(self, current_time: datetime, rng: Optional[random.Random] = None) -> float:
         """
         Get the user's activity level at a given time.
         
         Args:
             current_time: The current timestamp
+            rng: Optional random stream
             
         Returns:
             Activity level between 0 and 1
@@ -167,26 +163,33 @@ class User:
                 base_activity *= 1.2
             elif self.profile.name == "risky":
                 # More erratic patterns
-                base_activity *= random.uniform(0.5, 1.5)
+                base_activity *= (rng or random).uniform(0.5, 1.5)
             
             return min(1.0, base_activity)
     
-    def should_use_mobile(self) -> bool:
+    def should_use_mobile(self, rng: Optional[random.Random] = None) -> bool:
         """Determine if user should use mobile device for this session."""
-        return random.random() < self.mobile_probability
+        return (rng or random).random() < self.mobile_probability
     
-    def get_services_for_hour(self, current_time: datetime, service_map: Optional[Dict[str, CloudService]] = None) -> List[str]:
+    def get_services_for_hour(
+        self,
+        current_time: datetime,
+        service_map: Optional[Dict[str, CloudService]] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[str]:
         """
         Get the services this user is likely to use in the current hour.
         
         Args:
             current_time: Current timestamp
             service_map: Optional mapping of service names to CloudService objects
+            rng: Optional random stream
             
         Returns:
             List of service names to use
         """
-        activity_level = self.get_activity_level(current_time)
+        gen = np.random.default_rng(rng or random)
+        activity_level = self.get_activity_level(current_time, rng)
         
         if activity_level < 0.1:
             return []  # No activity
@@ -196,14 +199,15 @@ class User:
         regular_services = []
         
         if service_map:
-            for service_name in self.assigned_services:
+            # Sorted so a given stream always sees services in the same order
+            for service_name in sorted(self.assigned_services):
                 service = service_map.get(service_name)
                 if service and service.has_traffic_override:
                     override_services.append(service_name)
                 else:
                     regular_services.append(service_name)
         else:
-            regular_services = list(self.assigned_services)
+            regular_services = sorted(self.assigned_services)
         
         selected = []
         
@@ -221,7 +225,7 @@ class User:
                     std = profile_config.get('std', 0)
                     
                     # Generate access count for this hour
-                    access_count = max(0, np.random.normal(mean, std))
+                    access_count = max(0, gen.normal(mean, std))
                     
                     # Scale by activity level
                     access_count = int(access_count * activity_level)
@@ -243,7 +247,7 @@ class User:
                 std_dev = 3
             
             # Scale by activity level
-            num_services = int(max(0, np.random.normal(
+            num_services = int(max(0, gen.normal(
                 mean_services * activity_level,
                 std_dev
             )))
@@ -255,13 +259,63 @@ class User:
                 # Don't select more services than available
                 num_services = min(num_services, len(regular_services))
                 
-                regular_selected = np.random.choice(
+                total_weight = sum(weights)
+                regular_selected = gen.choice(
                     regular_services,
                     size=num_services,
                     replace=False,
-                    p=np.array(weights) / sum(weights)
+                    p=[w / total_weight for w in weights]
                 )
                 
                 selected.extend(regular_selected)
         
-        return list(selected)
\ No newline at end of file
+        return list(selected)
+
+
+def calculate_service_adoption(profile: UserProfile, service: CloudService) -> float:
+    """
+    Calculate the probability a user with the given profile adopts a service.
+    
+    Depends only on the profile and the service, so population-wide
+    assignment can compute it once per (profile, service) pair.
+    
+    Args:
+        profile: The user's behavior profile
+        service: The cloud service to evaluate
+    
+    Returns:
+        Probability between 0 and 1
+    """
+    base_rate = service.activity.user_adoption_rate
+    
+    # Adjust based on user profile
+    if profile.name == "normal":
+        # Normal users mostly use sanctioned services
+        if service.status == "sanctioned":
+            multiplier = 1.2
+        elif service.status == "unsanctioned":
+            multiplier = 0.5
+        else:  # blocked
+            multiplier = 0.1
+    elif profile.name == "power_user":
+        # Power users use more services overall
+        if service.status == "sanctioned":
+            multiplier = 1.5
+        elif service.status == "unsanctioned":
+            multiplier = 0.8
+        else:  # blocked
+            multiplier = 0.2
+    else:  # risky
+        # Risky users are more likely to use unsanctioned/blocked services
+        if service.status == "sanctioned":
+            multiplier = 0.8
+        elif service.status == "unsanctioned":
+            multiplier = 1.5
+        else:  # blocked
+            multiplier = 0.8
+    
+    # Apply shadow IT likelihood from profile
+    if service.status != "sanctioned":
+        multiplier *= profile.shadow_it_likelihood
+    
+    return min(1.0, base_rate * multiplier)
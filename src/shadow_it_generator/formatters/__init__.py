@@ -2,16 +2,44 @@
 Log formatters for different output formats.
 
 This package contains formatters for converting generated log events
-into specific log formats like LEEF and CEF.
+into specific log formats like LEEF, CEF, NDJSON and Splunk key=value,
+and columnar sinks for Parquet and Arrow (with the optional pyarrow).
 """
 
 from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .field_plan import FieldPlan
 from .leef import LEEFFormatter
 from .cef import CEFFormatter
+from .ndjson import NDJSONFormatter
+from .splunk import SplunkFormatter
+from .syslog import SyslogFormatter, SyslogFraming
+from .writer import BackgroundWriter
+from .columnar import ColumnarFormatter, ParquetFormatter, ArrowFormatter, COLUMNAR_FORMATTERS
+
+# Formatter classes by output format name
+FORMATTERS = {
+    "leef": LEEFFormatter,
+    "cef": CEFFormatter,
+    "json": NDJSONFormatter,
+    "splunk": SplunkFormatter,
+}
 
 __all__ = [
     "LogFormatter",
     "LogEvent",
+    "EventBatch",
+    "FieldPlan",
     "LEEFFormatter",
     "CEFFormatter",
+    "NDJSONFormatter",
+    "SplunkFormatter",
+    "SyslogFormatter",
+    "SyslogFraming",
+    "BackgroundWriter",
+    "ColumnarFormatter",
+    "ParquetFormatter",
+    "ArrowFormatter",
+    "COLUMNAR_FORMATTERS",
+    "FORMATTERS",
 ]
\ No newline at end of file
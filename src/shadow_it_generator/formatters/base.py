@@ -6,11 +6,18 @@ common functionality for formatting log events.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, List, Optional, Sequence, TYPE_CHECKING, Union
 from dataclasses import dataclass
 
+from .flush import BATCH_FLUSH_POLICY, FlushPolicy, FlushTracker
+from ..utils.compression import GZIP_SUFFIX, open_gzip
+
+if TYPE_CHECKING:
+    from .batch import EventBatch
+    from .writer import BackgroundWriter
+
 
 @dataclass
 class LogEvent:
@@ -48,17 +55,60 @@ class LogFormatter(ABC):
     Abstract base class for log formatters.
     
     All log format implementations should inherit from this class.
+    Output goes to one file per day, named ``<file_prefix>_YYYYMMDD.log``.
+    Day files stay open across writes until finalize().
+    
+    With a BackgroundWriter set as ``writer``, the file writes and policy
+    flushes run on the writer's thread; formatting and encoding stay on
+    the caller's. flush() and finalize() wait for the queued writes.
+    
+    With ``gzip_level`` set, day files are gzip streams named
+    ``<file_prefix>_YYYYMMDD.log.gz``, compressed as they are written.
+    Policy flushes are gzip sync flushes; flush() ends the gzip member, so
+    the files on disk are complete gzip files after every flush().
     """
     
-    def __init__(self, output_dir: Path):
+    file_prefix = "events"
+    
+    # Written after every formatted line; octet-counted syslog frames
+    # carry their own length, so their stream has no separator
+    line_end = "\n"
+    
+    # Columnar sinks write whole batches (write_batch) instead of
+    # formatted lines, and their files are never appended to
+    columnar = False
+    
+    # Day files kept open at once; generation moves forward in time, so
+    # the least recently opened file is closed first
+    max_open_files = 4
+    
+    def __init__(self, output_dir: Path, flush_policy: Optional[FlushPolicy] = None):
         """
         Initialize the formatter.
         
         Args:
             output_dir: Directory to write formatted logs
+            flush_policy: When to flush written output (default: BATCH_FLUSH_POLICY)
         """
         self.output_dir = output_dir
         self._file_handle = None
+        self._day_files: Dict[date, BinaryIO] = {}
+        self._flush_tracker = FlushTracker(flush_policy or BATCH_FLUSH_POLICY)
+        
+        # Optional writer thread for the file writes (see BackgroundWriter)
+        self.writer: Optional["BackgroundWriter"] = None
+        
+        # gzip compression level of the day files; None writes plain text
+        self.gzip_level: Optional[int] = None
+    
+    @property
+    def flush_policy(self) -> FlushPolicy:
+        """When written output is flushed."""
+        return self._flush_tracker.policy
+    
+    @flush_policy.setter
+    def flush_policy(self, policy: FlushPolicy) -> None:
+        self._flush_tracker = FlushTracker(policy)
         
     def setup(self) -> None:
         """Setup the formatter and create output directory."""
@@ -86,8 +136,168 @@ class LogFormatter(ABC):
             event: The event to write
         """
         pass
+    
+    def get_output_path(self, day: date) -> Path:
+        """Get the output file for a day."""
+        suffix = '.log' + GZIP_SUFFIX if self.gzip_level is not None else '.log'
+        return self.output_dir / f"{self.file_prefix}_{day.strftime('%Y%m%d')}{suffix}"
+    
+    def get_day_file(self, day: date) -> BinaryIO:
+        """
+        Get the open (binary, append) output file for a day.
+        
+        Args:
+            day: Day of the events to write
+            
+        Returns:
+            File object, kept open until finalize()
+        """
+        handle = self._day_files.get(day)
+        if handle is None:
+            if len(self._day_files) >= self.max_open_files:
+                oldest = next(iter(self._day_files))
+                self._day_files.pop(oldest).close()
+            path = self.get_output_path(day)
+            if self.gzip_level is not None:
+                handle = open_gzip(path, self.gzip_level)
+            else:
+                handle = open(path, 'ab')
+            self._day_files[day] = handle
+        return handle
+    
+    def format_batch(self, batch: "EventBatch") -> List[str]:
+        """
+        Format every row of an event batch.
+        
+        Formatters override this with a columnar implementation; the
+        default formats a LogEvent view of each row.
+        
+        Args:
+            batch: The events to format
+            
+        Returns:
+            Formatted lines, one per row
+        """
+        return [self.format_event(event) for event in batch]
+    
+    def write_batch(self, events: Union["EventBatch", List[LogEvent]]) -> int:
+        """
+        Format and write a batch of events.
+        
+        Args:
+            events: Event batch or list of events to write
+            
+        Returns:
+            Number of bytes written
+        """
+        from .batch import EventBatch
+        
+        if not isinstance(events, EventBatch):
+            events = EventBatch.from_events(events)
+        return self.write_lines(events.timestamps, self.format_batch(events))
+    
+    def write_lines(self, timestamps: Sequence[datetime], lines: List[str]) -> int:
+        """
+        Append formatted lines to the per-day files of their timestamps.
+        
+        Args:
+            timestamps: Event timestamps, one per line
+            lines: Formatted lines (each is followed by line_end)
+            
+        Returns:
+            Number of bytes written
+        """
+        if not lines:
+            return 0
+        
+        # Group lines by date; a batch normally covers a single day
+        first_day = min(timestamps).date()
+        if max(timestamps).date() == first_day:
+            lines_by_date: Dict[date, List[str]] = {first_day: lines}
+        else:
+            lines_by_date = {}
+            for timestamp, line in zip(timestamps, lines):
+                lines_by_date.setdefault(timestamp.date(), []).append(line)
+        
+        # One write per day file
+        written = 0
+        for day, day_lines in sorted(lines_by_date.items()):
+            data = (self.line_end.join(day_lines) + self.line_end).encode('utf-8')
+            self._write(day, data)
+            written += len(data)
+        
+        if self._flush_tracker.wrote(len(lines), written):
+            self._flush_due()
+        
+        return written
+    
+    def write_line(self, day: date, line: str) -> int:
+        """
+        Append one formatted line to a day file, flushing per the flush policy.
+        
+        Args:
+            day: Day of the event
+            line: Formatted line (without line_end)
+            
+        Returns:
+            Number of bytes written
+        """
+        data = (line + self.line_end).encode('utf-8')
+        self._write(day, data)
+        if self._flush_tracker.wrote(1, len(data)):
+            self._flush_due()
+        return len(data)
+    
+    def _write(self, day: date, data: bytes) -> None:
+        """Write encoded output to a day file, on the writer thread if there is one."""
+        if self.writer is None:
+            self.get_day_file(day).write(data)
+        else:
+            self.writer.submit(self._write_day, day, data)
+    
+    def _write_day(self, day: date, data: bytes) -> None:
+        """Write encoded output to a day file."""
+        self.get_day_file(day).write(data)
+    
+    def _flush_due(self) -> None:
+        """Flush as the flush policy asks, after the writes queued so far."""
+        self._flush_tracker.reset()
+        if self.writer is None:
+            self._flush_files()
+        else:
+            self.writer.submit(self._flush_files)
+    
+    def _flush_files(self) -> None:
+        """Flush the open files' buffers to the OS."""
+        for handle in self._day_files.values():
+            handle.flush()
+        if self._file_handle:
+            self._file_handle.flush()
+    
+    def flush(self) -> None:
+        """
+        Flush buffered output to the day files, after any queued writes.
+        
+        Compressed day files are closed instead, ending their gzip member;
+        the next write to a day appends a new member.
+        """
+        if self.writer is not None:
+            self.writer.drain()
+        if self.gzip_level is not None:
+            for handle in self._day_files.values():
+                handle.close()
+            self._day_files.clear()
+        self._flush_files()
+        self._flush_tracker.reset()
         
     def finalize(self) -> None:
-        """Cleanup and close any open file handles."""
+        """Wait for queued writes, then close any open file handles."""
+        if self.writer is not None:
+            self.writer.drain()
+        for handle in self._day_files.values():
+            handle.close()
+        self._day_files.clear()
+        self._flush_tracker.reset()
         if self._file_handle:
-            self._file_handle.close()
\ No newline at end of file
+            self._file_handle.close()
+            self._file_handle = None
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Columnar event batches.
+
+An EventBatch stores many log events as parallel columns instead of one
+LogEvent object per event: timestamps, integer columns in compact arrays,
+and dictionary-encoded string columns. Repeated values such as usernames,
+user agents and categories are stored and escaped once per batch.
+"""
+
+from array import array
+from datetime import datetime
+from itertools import repeat
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .base import LogEvent
+
+
+class EventBatch:
+    """
+    A block of log events stored column by column.
+
+    Integer fields live in ``array('q')`` columns. String fields are
+    dictionary-encoded: each column keeps a list of distinct values and an
+    ``array('I')`` of codes into it. ``batch[i]`` returns a LogEvent view of
+    a single row for code that works on individual events.
+
+    Columns derived for output (rendered timestamps, decoded or escaped
+    values) are memoized on the batch with ``derived()``, so several
+    formatters writing the same batch compute them once.
+    """
+
+    INT_FIELDS = (
+        'source_port',
+        'destination_port',
+        'status_code',
+        'bytes_sent',
+        'bytes_received',
+        'duration_ms',
+    )
+
+    STRING_FIELDS = (
+        'source_ip',
+        'destination_ip',
+        'username',
+        'user_domain',
+        'url',
+        'method',
+        'user_agent',
+        'referrer',
+        'action',
+        'category',
+        'risk_level',
+        'service_name',
+        'protocol',
+    )
+
+    # Defaults mirror the LogEvent dataclass
+    DEFAULTS = {
+        'referrer': None,
+        'action': 'allowed',
+        'category': 'cloud_services',
+        'risk_level': 'low',
+        'service_name': None,
+        'protocol': 'https',
+    }
+
+    def __init__(self):
+        """Initialize an empty batch."""
+        self.timestamps: List[datetime] = []
+        self.ints: Dict[str, array] = {name: array('q') for name in self.INT_FIELDS}
+        self.codes: Dict[str, array] = {name: array('I') for name in self.STRING_FIELDS}
+        self.values: Dict[str, List[Optional[str]]] = {name: [] for name in self.STRING_FIELDS}
+        self.additional_fields: List[Optional[Dict[str, Any]]] = []
+        self._lookup: Dict[str, Dict[Optional[str], int]] = {name: {} for name in self.STRING_FIELDS}
+        self._derived: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_events(cls, events: Iterable[LogEvent]) -> "EventBatch":
+        """Build a batch from LogEvent objects."""
+        batch = cls()
+        for event in events:
+            batch.append_event(event)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int) -> LogEvent:
+        """Get a LogEvent view of one row."""
+        fields = {name: self.ints[name][index] for name in self.INT_FIELDS}
+        for name in self.STRING_FIELDS:
+            fields[name] = self.values[name][self.codes[name][index]]
+        return LogEvent(
+            timestamp=self.timestamps[index],
+            additional_fields=self.additional_fields[index],
+            **fields
+        )
+
+    def __iter__(self) -> Iterator[LogEvent]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def encode(self, name: str, value: Optional[str]) -> int:
+        """Get the dictionary code for a value, adding it if new."""
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.values[name])
+            lookup[value] = code
+            self.values[name].append(value)
+        return code
+
+    def column(self, name: str) -> List[Any]:
+        """Get a decoded column as a list."""
+        if name == 'timestamp':
+            return list(self.timestamps)
+        if name == 'additional_fields':
+            return list(self.additional_fields)
+        if name in self.ints:
+            return self.ints[name].tolist()
+        return list(map(self.values[name].__getitem__, self.codes[name]))
+
+    def decoded(self, name: str) -> Sequence[Any]:
+        """Get a decoded column, memoized like derived() values (do not modify it)."""
+        return self.derived(('decoded', name), lambda: self.column(name))
+
+    def derived(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get a value derived from the batch's rows, building it on first use.
+
+        Derived values are dropped whenever rows are added or reordered.
+
+        Args:
+            key: Identifies the derived value
+            build: Computes the value from the current rows
+
+        Returns:
+            The derived value
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build()
+        return value
+
+    def append_event(self, event: LogEvent) -> None:
+        """Append a single LogEvent as a new row."""
+        self._derived.clear()
+        self.timestamps.append(event.timestamp)
+        for name in self.INT_FIELDS:
+            self.ints[name].append(getattr(event, name))
+        for name in self.STRING_FIELDS:
+            self.codes[name].append(self.encode(name, getattr(event, name)))
+        self.additional_fields.append(event.additional_fields)
+
+    def extend(
+        self,
+        timestamps: Sequence[datetime],
+        additional_fields: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        **columns: Union[Any, Sequence[Any]]
+    ) -> None:
+        """
+        Append many rows at once.
+
+        Each column is either a sequence with one value per row or a single
+        value shared by every row (encoded only once). Columns that are
+        omitted take the LogEvent defaults.
+
+        Args:
+            timestamps: Row timestamps
+            additional_fields: Optional per-row additional fields
+            **columns: Values keyed by LogEvent field name
+        """
+        self._derived.clear()
+        count = len(timestamps)
+        self.timestamps.extend(timestamps)
+
+        for name in self.INT_FIELDS:
+            value = columns.get(name, 0)
+            if isinstance(value, int):
+                self.ints[name].extend(repeat(value, count))
+            else:
+                self.ints[name].extend(value)
+
+        for name in self.STRING_FIELDS:
+            value = columns.get(name, self.DEFAULTS.get(name))
+            if value is None or isinstance(value, str):
+                self.codes[name].extend(repeat(self.encode(name, value), count))
+            else:
+                encode = self.encode
+                self.codes[name].extend([encode(name, item) for item in value])
+
+        if additional_fields is None:
+            self.additional_fields.extend(repeat(None, count))
+        else:
+            self.additional_fields.extend(additional_fields)
+
+    def reorder(self, order: Sequence[int]) -> None:
+        """Permute rows in place so row i becomes old row order[i]."""
+        self._derived.clear()
+        timestamps = self.timestamps
+        self.timestamps = [timestamps[i] for i in order]
+
+        additional_fields = self.additional_fields
+        self.additional_fields = [additional_fields[i] for i in order]
+
+        for columns in (self.ints, self.codes):
+            for name, column in columns.items():
+                columns[name] = array(column.typecode, [column[i] for i in order])
@@ -6,10 +6,18 @@ Formats log events according to the ArcSight CEF specification.
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import re
 
 from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .field_plan import FieldPlan, constant, field, optional_field
+from .flush import FlushPolicy
+
+
+# Header fields escape pipe (|) and backslash (\); extension fields escape equals (=) and backslash
+CEF_HEADER_ESCAPES = str.maketrans({'\\': '\\\\', '|': '\\|'})
+CEF_EXTENSION_ESCAPES = str.maketrans({'\\': '\\\\', '=': '\\=', '\n': '\\n', '\r': '\\r'})
 
 
 class CEFFormatter(LogFormatter):
@@ -20,15 +28,21 @@ class CEFFormatter(LogFormatter):
     CEF:Version|Device Vendor|Device Product|Device Version|Device Event Class ID|Name|Severity|Extension
     """
     
-    def __init__(self, output_dir: Path):
+    file_prefix = "cef"
+    
+    def __init__(self, output_dir: Path, flush_policy: Optional[FlushPolicy] = None):
         """Initialize CEF formatter."""
-        super().__init__(output_dir)
+        super().__init__(output_dir, flush_policy)
         self.vendor = "McAfee"
         self.product = "Web Gateway"
         self.product_version = "12.2.19"  # Using realistic version number
         self.cef_version = "0"  # CEF version is always 0
         self.current_file = None
         self.current_date = None
+        self.plan = self._compile_plan()
+        
+        # Headers by (action, risk level, service, category)
+        self._headers: Dict[tuple, str] = {}
     
     def _escape_header(self, value: str) -> str:
         """
@@ -38,9 +52,7 @@ class CEFFormatter(LogFormatter):
         """
         if not isinstance(value, str):
             value = str(value)
-        value = value.replace('\\', '\\\\')
-        value = value.replace('|', '\\|')
-        return value
+        return value.translate(CEF_HEADER_ESCAPES)
     
     def _escape_extension(self, value: str) -> str:
         """
@@ -50,11 +62,7 @@ class CEFFormatter(LogFormatter):
         """
         if not isinstance(value, str):
             value = str(value)
-        value = value.replace('\\', '\\\\')
-        value = value.replace('=', '\\=')
-        value = value.replace('\n', '\\n')
-        value = value.replace('\r', '\\r')
-        return value
+        return value.translate(CEF_EXTENSION_ESCAPES)
     
     def _get_severity(self, event: LogEvent) -> int:
         """
@@ -120,6 +128,58 @@ class CEFFormatter(LogFormatter):
         else:
             return f"Web request to {event.service_name or 'service'}"
     
+    def _compile_plan(self) -> FieldPlan:
+        """Build the field plan for the extension (everything after the header)."""
+        return FieldPlan("", " ", [
+            # Timestamp fields
+            field('deviceCustomDate1', 'date'),
+            constant('deviceCustomDate1Label', 'Date'),
+            field('deviceCustomString1', 'time'),
+            constant('deviceCustomString1Label', 'Time'),
+            field('deviceCustomNumber1', 'unix'),
+            constant('deviceCustomNumber1Label', 'UnixTimestamp'),
+            
+            # Source and destination
+            field('src', 'source_ip'),
+            field('dst', 'destination_ip'),
+            field('spt', 'source_port'),
+            field('dpt', 'destination_port'),
+            
+            # User information
+            field('suser', 'username', escape=CEF_EXTENSION_ESCAPES, cached=True),
+            field('sntdom', 'user_domain', escape=CEF_EXTENSION_ESCAPES, cached=True),
+            
+            # Request information
+            field('request', 'url', escape=CEF_EXTENSION_ESCAPES),
+            field('requestMethod', 'method'),
+            field('app', 'protocol', transform=str.upper, cached=True),
+            
+            # Response
+            field('flexNumber1', 'status_code'),
+            constant('flexNumber1Label', 'HTTPStatus'),
+            
+            # Traffic metrics
+            field('in', 'bytes_received'),
+            field('out', 'bytes_sent'),
+            field('cn1', 'duration_ms'),
+            constant('cn1Label', 'ResponseTime'),
+            
+            # User agent
+            field('requestClientApplication', 'user_agent', escape=CEF_EXTENSION_ESCAPES, cached=True),
+            
+            # Category and action
+            field('cat', 'category', escape=CEF_EXTENSION_ESCAPES, cached=True),
+            field('act', 'action'),
+            
+            # Risk level
+            field('flexString2', 'risk_level'),
+            constant('flexString2Label', 'RiskLevel'),
+            
+            # Service name and referrer
+            optional_field('destinationServiceName', 'service_name', escape=CEF_EXTENSION_ESCAPES, cached=True),
+            optional_field('requestContext', 'referrer', escape=CEF_EXTENSION_ESCAPES),
+        ])
+    
     def format_event(self, event: LogEvent) -> str:
         """
         Format a log event in CEF format.
@@ -130,7 +190,34 @@ class CEFFormatter(LogFormatter):
         Returns:
             CEF formatted string
         """
-        # Build CEF header
+        line = self._get_header(event) + self.plan.render_event(event)
+        
+        # Additional fields
+        if event.additional_fields:
+            line += " " + " ".join(self._format_additional_fields(event.additional_fields))
+        
+        return line
+    
+    def _format_additional_fields(self, additional_fields: Dict[str, Any]) -> List[str]:
+        """Map additional fields onto CEF flexString and custom string fields."""
+        extensions = []
+        flex_string_index = 3  # Start from 3 since we used flexString2 for risk level
+        custom_index = 2  # Start from 2 since we used deviceCustomNumber1 and deviceCustomString1
+        
+        for key, value in additional_fields.items():
+            if flex_string_index <= 4:  # CEF supports flexString1-4
+                extensions.append(f"flexString{flex_string_index}={self._escape_extension(str(value))}")
+                extensions.append(f"flexString{flex_string_index}Label={key}")
+                flex_string_index += 1
+            elif custom_index <= 6:  # Use custom fields cs1-cs6
+                extensions.append(f"cs{custom_index}={self._escape_extension(str(value))}")
+                extensions.append(f"cs{custom_index}Label={key}")
+                custom_index += 1
+        
+        return extensions
+    
+    def _format_header(self, event: LogEvent) -> str:
+        """Build the CEF header (everything before the extension)."""
         header_parts = [
             f"CEF:{self.cef_version}",
             self._escape_header(self.vendor),
@@ -140,83 +227,55 @@ class CEFFormatter(LogFormatter):
             self._escape_header(self._get_event_name(event)),
             str(self._get_severity(event))
         ]
-        header = "|".join(header_parts)
-        
-        # Build extension fields (key=value pairs)
-        extensions = []
-        
-        # Timestamp fields
-        extensions.append(f"deviceCustomDate1={event.timestamp.strftime('%Y-%m-%d')}")
-        extensions.append(f"deviceCustomDate1Label=Date")
-        extensions.append(f"deviceCustomString1={event.timestamp.strftime('%H:%M:%S.%f')[:-3]}")
-        extensions.append(f"deviceCustomString1Label=Time")
-        extensions.append(f"deviceCustomNumber1={int(event.timestamp.timestamp())}")
-        extensions.append(f"deviceCustomNumber1Label=UnixTimestamp")
-        
-        # Source and destination
-        extensions.append(f"src={event.source_ip}")
-        extensions.append(f"dst={event.destination_ip}")
-        extensions.append(f"spt={event.source_port}")
-        extensions.append(f"dpt={event.destination_port}")
-        
-        # User information
-        extensions.append(f"suser={self._escape_extension(event.username)}")
-        extensions.append(f"sntdom={self._escape_extension(event.user_domain)}")
-        
-        # Request information
-        extensions.append(f"request={self._escape_extension(event.url)}")
-        extensions.append(f"requestMethod={event.method}")
-        extensions.append(f"app={event.protocol.upper()}")
-        
-        # Response
-        extensions.append(f"flexNumber1={event.status_code}")
-        extensions.append(f"flexNumber1Label=HTTPStatus")
-        
-        # Traffic metrics
-        extensions.append(f"in={event.bytes_received}")
-        extensions.append(f"out={event.bytes_sent}")
-        extensions.append(f"cn1={event.duration_ms}")
-        extensions.append(f"cn1Label=ResponseTime")
-        
-        # User agent
-        extensions.append(f"requestClientApplication={self._escape_extension(event.user_agent)}")
+        return "|".join(header_parts)
+    
+    def _get_header(self, event: LogEvent) -> str:
+        """Get the header for an event, including the trailing separator."""
+        key = (event.action, event.risk_level, event.service_name, event.category)
+        header = self._headers.get(key)
+        if header is None:
+            header = self._headers[key] = self._format_header(event) + "|"
+        return header
+    
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Format every row of an event batch in one pass.
         
-        # Category and action
-        extensions.append(f"cat={self._escape_extension(event.category)}")
-        extensions.append(f"act={event.action}")
+        Produces the same lines as format_event. Headers are looked up once
+        per distinct (action, risk level, service, category) combination and
+        each distinct string value is escaped once per batch.
         
-        # Risk level
-        extensions.append(f"flexString2={event.risk_level}")
-        extensions.append(f"flexString2Label=RiskLevel")
+        Args:
+            batch: The events to format
+            
+        Returns:
+            CEF formatted strings, one per row
+        """
+        codes = batch.codes
+        header_keys = list(zip(codes['action'], codes['risk_level'], codes['service_name'], codes['category']))
         
-        # Service name
-        if event.service_name:
-            extensions.append(f"destinationServiceName={self._escape_extension(event.service_name)}")
+        # One representative row per distinct key (dict() keeps the last one)
+        values = batch.values
+        headers_by_key = {}
+        for key, row in dict(zip(header_keys, range(len(header_keys)))).items():
+            action, risk_level, service_name, category = key
+            header = self._headers.get((
+                values['action'][action],
+                values['risk_level'][risk_level],
+                values['service_name'][service_name],
+                values['category'][category]
+            ))
+            headers_by_key[key] = header or self._get_header(batch[row])
+        headers = list(map(headers_by_key.__getitem__, header_keys))
         
-        # Referrer
-        if event.referrer:
-            extensions.append(f"requestContext={self._escape_extension(event.referrer)}")
+        lines = [header + extension for header, extension in zip(headers, self.plan.render_batch(batch))]
         
         # Additional fields
-        if event.additional_fields:
-            # Map additional fields to CEF custom fields
-            flex_string_index = 3  # Start from 3 since we used flexString2 for risk level
-            custom_index = 2  # Start from 2 since we used deviceCustomNumber1 and deviceCustomString1
-            
-            for key, value in event.additional_fields.items():
-                if flex_string_index <= 4:  # CEF supports flexString1-4
-                    extensions.append(f"flexString{flex_string_index}={self._escape_extension(str(value))}")
-                    extensions.append(f"flexString{flex_string_index}Label={key}")
-                    flex_string_index += 1
-                elif custom_index <= 6:  # Use custom fields cs1-cs6
-                    extensions.append(f"cs{custom_index}={self._escape_extension(str(value))}")
-                    extensions.append(f"cs{custom_index}Label={key}")
-                    custom_index += 1
+        for i, additional_fields in enumerate(batch.additional_fields):
+            if additional_fields:
+                lines[i] += " " + " ".join(self._format_additional_fields(additional_fields))
         
-        # Combine header and extensions
-        cef_line = header + "|" + " ".join(extensions)
-        
-        return cef_line
+        return lines
     
     def write_event(self, event: LogEvent) -> None:
         """
@@ -227,45 +286,11 @@ class CEFFormatter(LogFormatter):
         # Determine file name based on event date
         event_date = event.timestamp.date()
         
-        # Check if we need to open a new file
-        if self.current_date != event_date or self._file_handle is None:
-            # Close previous file if open
-            if self._file_handle:
-                self._file_handle.close()
-            
-            # Open new file
-            filename = f"cef_{event_date.strftime('%Y%m%d')}.log"
-            filepath = self.output_dir / filename
-            self._file_handle = open(filepath, 'a', encoding='utf-8')
+        if self.current_date != event_date:
             self.current_date = event_date
-            self.current_file = filepath
+            self.current_file = self.get_output_path(event_date)
         
-        # Format and write the event
+        # Format and write the event; day files are shared with write_batch
+        # and flushed according to the flush policy
         cef_line = self.format_event(event)
-        self._file_handle.write(cef_line + '\n')
-        self._file_handle.flush()  # Ensure data is written
-    
-    def write_batch(self, events: list[LogEvent]) -> None:
-        """
-        Write a batch of events efficiently.
-        
-        Args:
-            events: List of events to write
-        """
-        # Group events by date
-        events_by_date = {}
-        for event in events:
-            event_date = event.timestamp.date()
-            if event_date not in events_by_date:
-                events_by_date[event_date] = []
-            events_by_date[event_date].append(event)
-        
-        # Write each group
-        for date, date_events in sorted(events_by_date.items()):
-            filename = f"cef_{date.strftime('%Y%m%d')}.log"
-            filepath = self.output_dir / filename
-            
-            with open(filepath, 'a', encoding='utf-8') as f:
-                for event in date_events:
-                    cef_line = self.format_event(event)
-                    f.write(cef_line + '\n')
\ No newline at end of file
+        self.write_line(event_date, cef_line)
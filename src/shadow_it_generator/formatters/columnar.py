@@ -0,0 +1,407 @@
+"""
+Columnar (Parquet / Arrow IPC) output.
+
+Analytics engines such as DuckDB and Spark read columns, so parsing LEEF
+text back into fields is wasted work for them. The sinks in this module
+write the LogEvent fields of each EventBatch straight to Parquet or to an
+Arrow IPC stream. EventBatch string columns are already dictionary
+encoded, so they become Arrow dictionary arrays without re-encoding.
+
+Files are partitioned by hour, ``<prefix>_YYYYMMDD_HH.<suffix>``, next to
+the per-day layout of the text formats: the engine writes one batch per
+generated hour, and each batch goes to the file of the hour its first
+event falls in. Sessions that run past the end of the hour keep their
+later events in the same file, so filter on ``timestamp`` rather than on
+file names; row group statistics let readers skip data by timestamp.
+Requires the optional pyarrow dependency
+(``pip install skyhigh-traffic-forge[columnar]``).
+"""
+
+from abc import abstractmethod
+from dataclasses import fields as dataclass_fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .flush import FlushPolicy
+from .ndjson import json_object
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+
+# String columns kept dictionary encoded in the output; the others (URLs,
+# IPs, referrers) have too many distinct values for a dictionary to pay off
+DICTIONARY_FIELDS = (
+    'username',
+    'user_domain',
+    'category',
+    'user_agent',
+    'method',
+    'action',
+    'risk_level',
+    'service_name',
+    'protocol',
+)
+
+# Buffered Arrow data written out as one row group
+DEFAULT_ROW_GROUP_BYTES = 64 * 1024 * 1024
+
+# Rows written with write_event are collected into batches of this size
+EVENT_BUFFER_ROWS = 8192
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError if pyarrow is not installed."""
+    if pa is None:
+        raise ImportError(
+            "Parquet and Arrow output require pyarrow; "
+            "install it with: pip install 'skyhigh-traffic-forge[columnar]'"
+        )
+
+
+def event_schema() -> "pa.Schema":
+    """
+    Get the Arrow schema of LogEvent rows.
+
+    Columns follow the LogEvent field order. Timestamps keep microsecond
+    precision; ``additional_fields`` is stored as a JSON string.
+    """
+    require_pyarrow()
+
+    types = {'timestamp': pa.timestamp('us'), 'additional_fields': pa.string()}
+    for name in EventBatch.INT_FIELDS:
+        types[name] = pa.int64()
+    for name in EventBatch.STRING_FIELDS:
+        types[name] = pa.dictionary(pa.int32(), pa.string()) if name in DICTIONARY_FIELDS else pa.string()
+
+    return pa.schema([pa.field(event_field.name, types[event_field.name]) for event_field in dataclass_fields(LogEvent)])
+
+
+def _string_column(batch: EventBatch, name: str) -> "pa.Array":
+    """Build a string column as an Arrow dictionary array from the batch's codes."""
+    values = batch.values[name]
+    codes = batch.codes[name]
+
+    # The codes are reinterpreted, not copied value by value
+    indices = pa.Array.from_buffers(pa.int32(), len(codes), [None, pa.py_buffer(codes.tobytes())])
+    if None in values:
+        # Rows coded as None become null rows; the dictionary itself holds no nulls
+        null_code = values.index(None)
+        indices = pc.if_else(pc.equal(indices, null_code), pa.scalar(None, pa.int32()), indices)
+        values = ['' if value is None else value for value in values]
+
+    return pa.DictionaryArray.from_arrays(indices, pa.array(values, pa.string()))
+
+
+def batch_to_arrow(batch: EventBatch, schema: Optional["pa.Schema"] = None) -> "pa.RecordBatch":
+    """
+    Convert an event batch to an Arrow record batch.
+
+    Args:
+        batch: The events to convert
+        schema: Target schema (default: event_schema())
+
+    Returns:
+        Record batch with one row per event
+    """
+    schema = schema or event_schema()
+
+    columns: Dict[str, Any] = {
+        'timestamp': pa.array(batch.timestamps, pa.timestamp('us')),
+        'additional_fields': pa.array(
+            [None if value is None else json_object(value) for value in batch.additional_fields],
+            pa.string()
+        ),
+    }
+    for name in EventBatch.INT_FIELDS:
+        column = batch.ints[name]
+        columns[name] = pa.Array.from_buffers(pa.int64(), len(column), [None, pa.py_buffer(column.tobytes())])
+    for name in EventBatch.STRING_FIELDS:
+        column = _string_column(batch, name)
+        columns[name] = column if name in DICTIONARY_FIELDS else column.dictionary_decode()
+
+    return pa.RecordBatch.from_arrays([columns[name] for name in schema.names], schema=schema)
+
+
+class ColumnarFormatter(LogFormatter):
+    """
+    Base class for sinks that write event batches as columns.
+
+    Rows are buffered as Arrow record batches and written out as one row
+    group once the buffer reaches ``row_group_bytes``. Each batch goes to
+    the file of the hour its first event falls in; consecutive batches of
+    the same hour share a file. flush() writes the buffered rows and
+    closes the open file, because Parquet and Arrow files are only
+    readable once they are complete; batches that arrive later for an
+    hour already closed go to a new part file
+    (``<prefix>_YYYYMMDD_HH_part1.<suffix>``).
+    """
+
+    columnar = True
+    file_suffix = "bin"
+
+    def __init__(
+        self,
+        output_dir: Path,
+        flush_policy: Optional[FlushPolicy] = None,
+        row_group_bytes: int = DEFAULT_ROW_GROUP_BYTES
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            output_dir: Directory to write the files
+            flush_policy: Accepted for a uniform formatter interface; files
+                are written at row group boundaries and closed by flush()
+            row_group_bytes: Buffered Arrow data written out as one row group
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        require_pyarrow()
+        super().__init__(output_dir, flush_policy)
+        self.row_group_bytes = row_group_bytes
+        self.schema = event_schema()
+
+        # The open file: its hour, Arrow sink and writer
+        self._hour: Optional[datetime] = None
+        self._sink = None
+        self._writer = None
+
+        # Record batches not yet written, and their size
+        self._pending: List["pa.RecordBatch"] = []
+        self._pending_bytes = 0
+
+        # Bytes written to disk so far (files are mostly written when closed)
+        self.bytes_written = 0
+
+        # Rows from write_event not yet converted
+        self._events = EventBatch()
+
+    def get_output_path(self, hour: datetime, part: int = 0) -> Path:
+        """Get the output file for an hour (a datetime truncated to the hour)."""
+        name = f"{self.file_prefix}_{hour.strftime('%Y%m%d_%H')}"
+        if part:
+            name += f"_part{part}"
+        return self.output_dir / f"{name}.{self.file_suffix}"
+
+    def format_event(self, event: LogEvent) -> str:
+        """Columnar sinks write batches, not lines."""
+        raise TypeError(f"{type(self).__name__} writes columns, not formatted lines")
+
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """Columnar sinks write batches, not lines."""
+        raise TypeError(f"{type(self).__name__} writes columns, not formatted lines")
+
+    def write_event(self, event: LogEvent) -> None:
+        """
+        Buffer one event; events are converted to columns in blocks.
+
+        Args:
+            event: The event to write
+        """
+        self._events.append_event(event)
+        if len(self._events) >= EVENT_BUFFER_ROWS:
+            self._write_buffered_events()
+
+    def write_batch(self, events: Union[EventBatch, List[LogEvent]]) -> int:
+        """
+        Convert a batch to columns and add it to the file of its first hour.
+
+        Args:
+            events: Event batch or list of events to write
+
+        Returns:
+            Number of bytes written to disk by this call
+        """
+        if not isinstance(events, EventBatch):
+            events = EventBatch.from_events(events)
+        if not len(events):
+            return 0
+
+        written = self._write_buffered_events()
+        record_batch = batch_to_arrow(events, self.schema)
+
+        # Sessions run past the end of their hour, so a batch is filed
+        # under its first hour rather than split; rows stay in write order
+        hour = min(events.timestamps).replace(minute=0, second=0, microsecond=0)
+        return written + self._append(hour, record_batch)
+
+    def write_lines(self, timestamps: Sequence[datetime], lines: List[str]) -> int:
+        """Columnar sinks write batches, not lines."""
+        raise TypeError(f"{type(self).__name__} writes columns, not formatted lines")
+
+    def write_line(self, day: Any, line: str) -> int:
+        """Columnar sinks write batches, not lines."""
+        raise TypeError(f"{type(self).__name__} writes columns, not formatted lines")
+
+    def _write_buffered_events(self) -> int:
+        """Convert the rows collected by write_event."""
+        if not len(self._events):
+            return 0
+        events, self._events = self._events, EventBatch()
+        return self.write_batch(events)
+
+    def _append(self, hour: datetime, record_batch: "pa.RecordBatch") -> int:
+        """Buffer rows for an hour, writing a row group when the buffer is full."""
+        written = 0
+        if hour != self._hour:
+            written += self._close_file()
+            self._open_file(hour)
+
+        self._pending.append(record_batch)
+        self._pending_bytes += record_batch.nbytes
+        if self._pending_bytes >= self.row_group_bytes:
+            written += self._write_row_group()
+        return written
+
+    def _open_file(self, hour: datetime) -> None:
+        """Start the file for an hour, as a new part if the hour already has one."""
+        part = 0
+        path = self.get_output_path(hour)
+        while path.exists():
+            part += 1
+            path = self.get_output_path(hour, part)
+
+        self._hour = hour
+        self._sink = pa.OSFile(str(path), 'wb')
+        self._writer = self._open_writer(self._sink)
+        self.bytes_written += self._sink.tell()
+
+    def _write_row_group(self) -> int:
+        """Write the buffered rows as row groups of about row_group_bytes; return the bytes written."""
+        if not self._pending:
+            return 0
+
+        table = pa.Table.from_batches(self._pending, schema=self.schema)
+        # One dictionary per column for the whole row group
+        table = table.unify_dictionaries().combine_chunks()
+        size = self._pending_bytes
+        self._pending = []
+        self._pending_bytes = 0
+
+        # A single large batch (e.g. a busy hour) is split into several groups
+        rows = table.num_rows
+        group_rows = max(1, rows * self.row_group_bytes // size) if size > self.row_group_bytes else max(1, rows)
+
+        before = self._sink.tell()
+        self._write_table(table, group_rows)
+        written = self._sink.tell() - before
+        self.bytes_written += written
+        return written
+
+    def _close_file(self) -> int:
+        """Write the buffered rows and finish the open file; return the bytes written."""
+        if self._writer is None:
+            return 0
+
+        written = self._write_row_group()
+        before = self._sink.tell()
+        self._writer.close()
+        footer = self._sink.tell() - before
+        self.bytes_written += footer
+        self._sink.close()
+
+        self._hour = None
+        self._sink = None
+        self._writer = None
+        return written + footer
+
+    @abstractmethod
+    def _open_writer(self, sink: "pa.NativeFile") -> Any:
+        """Create the format writer for an open file."""
+
+    @abstractmethod
+    def _write_table(self, table: "pa.Table", group_rows: int) -> None:
+        """Write a table as row groups (or record batches) of group_rows rows."""
+
+    def flush(self) -> None:
+        """Write all buffered rows and close the open file so it is readable."""
+        self._write_buffered_events()
+        self._close_file()
+        self._flush_tracker.reset()
+
+    def finalize(self) -> None:
+        """Write all buffered rows and close the open file."""
+        self.flush()
+        super().finalize()
+
+
+class ParquetFormatter(ColumnarFormatter):
+    """
+    Writes log events to hourly Parquet files.
+
+    Dictionary-encoded columns (DICTIONARY_FIELDS) are written with
+    Parquet dictionary pages; the other string columns are plain encoded.
+    Row groups carry min/max statistics, so engines can skip row groups
+    by timestamp.
+    """
+
+    file_prefix = "parquet"
+    file_suffix = "parquet"
+
+    def __init__(
+        self,
+        output_dir: Path,
+        flush_policy: Optional[FlushPolicy] = None,
+        row_group_bytes: int = DEFAULT_ROW_GROUP_BYTES,
+        compression: str = "zstd"
+    ):
+        """
+        Initialize the Parquet sink.
+
+        Args:
+            output_dir: Directory to write the files
+            flush_policy: See ColumnarFormatter
+            row_group_bytes: Buffered Arrow data written out as one row group
+            compression: Parquet compression codec
+        """
+        super().__init__(output_dir, flush_policy, row_group_bytes)
+        self.compression = compression
+
+    def _open_writer(self, sink: "pa.NativeFile") -> Any:
+        return pq.ParquetWriter(
+            sink,
+            self.schema,
+            compression=self.compression,
+            use_dictionary=list(DICTIONARY_FIELDS)
+        )
+
+    def _write_table(self, table: "pa.Table", group_rows: int) -> None:
+        self._writer.write_table(table, row_group_size=group_rows)
+
+
+class ArrowFormatter(ColumnarFormatter):
+    """
+    Writes log events to hourly Arrow IPC stream files.
+
+    The streaming IPC format is used because each row group carries its
+    own dictionaries, which the IPC file format cannot replace midway.
+    Read the files with ``pyarrow.ipc.open_stream`` or DuckDB's arrow
+    extension.
+    """
+
+    file_prefix = "arrow"
+    file_suffix = "arrows"
+
+    def _open_writer(self, sink: "pa.NativeFile") -> Any:
+        return pa.ipc.new_stream(sink, self.schema)
+
+    def _write_table(self, table: "pa.Table", group_rows: int) -> None:
+        self._writer.write_table(table, max_chunksize=group_rows)
+
+
+# Columnar sink classes by output format name
+COLUMNAR_FORMATTERS = {
+    "parquet": ParquetFormatter,
+    "arrow": ArrowFormatter,
+}
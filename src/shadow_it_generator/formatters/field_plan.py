@@ -0,0 +1,332 @@
+"""
+Compiled key=value line layouts.
+
+LEEF and CEF lines are a fixed sequence of ``key=value`` pairs. A
+FieldPlan turns that sequence into a single %-template once, when the
+formatter is built: static text (header, keys, constant label pairs and
+separators) is pre-joined, and each event fills the placeholders in one
+string operation. Per-event rendering goes through a function generated
+for the layout, which reads every attribute and fills the template in a
+single expression. Only the fields that can contain special characters
+are escaped, with precomputed ``str.translate`` tables, and fields whose
+values repeat across events (per user, session or service) keep their
+rendered fragments in a bounded LRU cache.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .base import LogEvent
+from .batch import EventBatch
+from .timestamps import timestamp_cache
+
+
+# Sources derived from the event timestamp rather than read from an attribute
+TIMESTAMP_SOURCES = ('date', 'time', 'unix', 'offset')
+
+# Rendered fragments kept per cached field rendering; enough for every
+# user of a 50k-user tenant, at a few MB per field. The caches belong to
+# the shared render functions, so every formatter instance (and every plan
+# rendering a field the same way) uses the same one
+FRAGMENT_CACHE_SIZE = 65536
+
+
+class PlanField(NamedTuple):
+    """
+    One ``key=value`` pair of a line layout.
+
+    Attributes:
+        key: Field key as written in the line; empty to write the value
+            alone (e.g. a leading timestamp)
+        source: LogEvent attribute (or one of TIMESTAMP_SOURCES) holding
+            the value; None for a constant pair
+        value: Constant value when source is None
+        escape: str.translate table for values that may need escaping
+        transform: Callable applied to the value before escaping
+        optional: Predicate for fields written only for some events; the
+            whole pair, separator included, is omitted when it is false
+        quote: Static text on both sides of the value (e.g. ``"``)
+        cached: Keep rendered values in an LRU cache of FRAGMENT_CACHE_SIZE;
+            for values that repeat across events (usernames, domains, user
+            agents, service names), not per-event values such as URLs
+
+    Render functions are shared between plans by the identity of
+    transform and optional, so both should be module-level functions: a
+    lambda built per plan adds a render function (and its cache) for
+    every plan compiled.
+    """
+    key: str
+    source: Optional[str] = None
+    value: str = ""
+    escape: Optional[Dict[int, str]] = None
+    transform: Optional[Callable[[Any], Any]] = None
+    optional: Optional[Callable[[Any], bool]] = None
+    quote: str = ""
+    cached: bool = False
+
+
+def field(
+    key: str,
+    source: str,
+    escape: Optional[Dict[int, str]] = None,
+    transform: Optional[Callable[[Any], Any]] = None,
+    quote: str = "",
+    cached: bool = False
+) -> PlanField:
+    """Declare a field filled from an event attribute."""
+    return PlanField(key, source, escape=escape, transform=transform, quote=quote, cached=cached)
+
+
+def constant(key: str, value: str, quote: str = "") -> PlanField:
+    """Declare a field with the same value on every line (e.g. a CEF label)."""
+    return PlanField(key, value=value, quote=quote)
+
+
+def optional_field(
+    key: str,
+    source: str,
+    escape: Optional[Dict[int, str]] = None,
+    when: Callable[[Any], bool] = bool,
+    transform: Optional[Callable[[Any], Any]] = None,
+    quote: str = "",
+    cached: bool = False
+) -> PlanField:
+    """Declare a field written only when ``when(value)`` is true."""
+    return PlanField(key, source, escape=escape, transform=transform, optional=when, quote=quote, cached=cached)
+
+
+def make_escaper(table: Dict[int, str]) -> Callable[[Any], str]:
+    """
+    Build an escape function for a str.translate table.
+
+    Most values contain none of the special characters, and a substring
+    check per character is far cheaper than translating, so values are
+    only translated when they need it.
+
+    Args:
+        table: Translation table from str.maketrans
+
+    Returns:
+        Function that converts a value to str and escapes it
+    """
+    specials = [chr(code) for code in table]
+
+    def escape(value: Any) -> str:
+        if not isinstance(value, str):
+            value = str(value)
+        for special in specials:
+            if special in value:
+                return value.translate(table)
+        return value
+
+    return escape
+
+
+# Render functions by (escape table id, transform, optional rule, quote, pair prefix, cached)
+_renderers: Dict[Tuple[int, Any, Any, str, str, bool], Callable[[Any], Any]] = {}
+
+
+class FieldPlan:
+    """
+    A line layout compiled into one %-template.
+
+    Every field with a source becomes a ``%s`` placeholder; constant
+    fields are folded into the static text around them. Optional fields
+    get a bare placeholder that is filled with ``<separator>key=value`` or
+    an empty string, so the template itself never changes.
+
+    Attributes:
+        render_event: Render one event (LogEvent -> line, without a
+            trailing newline); generated per layout, see
+            _compile_render_event
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        separator: str,
+        fields: Sequence[PlanField],
+        suffix: str = "",
+        assign: str = "="
+    ):
+        """
+        Compile a line layout.
+
+        Args:
+            prefix: Static text before the first field (e.g. the LEEF header)
+            separator: Text between fields
+            fields: The fields, in line order
+            suffix: Static text after the last field
+            assign: Text between a key and its value
+        """
+        self.fields = list(fields)
+        self.sources: List[str] = []
+
+        # Placeholders that need per-value work, with the function that renders them
+        self._slots: List[Tuple[int, Callable[[Any], Any]]] = []
+        self._timestamp_slots: List[Tuple[int, int]] = []
+        timestamp_positions = set()
+
+        text = [prefix.replace('%', '%%')]
+        first = True
+        for plan_field in self.fields:
+            key_text = f"{plan_field.key}{assign}" if plan_field.key else ""
+            quote = plan_field.quote
+            if plan_field.optional:
+                # The render function writes the whole pair, quotes included
+                pair_prefix = f"{separator}{key_text}{quote}"
+                quote = ""
+            else:
+                if not first:
+                    text.append(separator.replace('%', '%%'))
+                first = False
+                if plan_field.source is None:
+                    text.append(f"{key_text}{quote}{plan_field.value}{quote}".replace('%', '%%'))
+                    continue
+                text.append(f"{key_text}{quote}".replace('%', '%%'))
+                pair_prefix = ""
+
+            position = len(self.sources)
+            text.append('%s')
+            text.append(quote.replace('%', '%%'))
+            if plan_field.source in TIMESTAMP_SOURCES:
+                self.sources.append('timestamp')
+                self._timestamp_slots.append((position, TIMESTAMP_SOURCES.index(plan_field.source)))
+                timestamp_positions.add(position)
+            else:
+                self.sources.append(plan_field.source)
+                if plan_field.escape or plan_field.transform or plan_field.optional:
+                    self._slots.append((position, self._compile_field(plan_field, pair_prefix)))
+
+        text.append(suffix.replace('%', '%%'))
+        self.template = ''.join(text)
+        self._slot_map = dict(self._slots)
+        self._timestamp_positions = frozenset(timestamp_positions)
+        self.render_event: Callable[[LogEvent], str] = self._compile_render_event()
+
+    def _compile_render_event(self) -> Callable[[LogEvent], str]:
+        """
+        Generate the per-event render function for this layout.
+
+        The generated function reads each source attribute, applies the
+        field's render function and fills the template in one expression,
+        with no per-field loop or intermediate list (the same technique
+        dataclasses and namedtuple use for their generated methods).
+
+        Returns:
+            Function rendering one event into a line
+        """
+        namespace: Dict[str, Any] = {'template': self.template, 'timestamp_parts': timestamp_cache.parts}
+        slots = dict(self._slots)
+        timestamp_slots = dict(self._timestamp_slots)
+
+        values = []
+        for position, source in enumerate(self.sources):
+            if not source.isidentifier():
+                raise ValueError(f"Field source '{source}' is not an attribute name")
+            if position in timestamp_slots:
+                values.append(f"parts[{timestamp_slots[position]}]")
+            elif position in slots:
+                namespace[f"render_{position}"] = slots[position]
+                values.append(f"render_{position}(event.{source})")
+            else:
+                values.append(f"event.{source}")
+
+        lines = ["def render_event(event):"]
+        if timestamp_slots:
+            lines.append("    parts = timestamp_parts(event.timestamp)")
+        lines.append(f"    return template % ({''.join(value + ', ' for value in values)})")
+        exec('\n'.join(lines), namespace)
+        return namespace['render_event']
+
+    @staticmethod
+    def _compile_field(plan_field: PlanField, pair_prefix: str) -> Callable[[Any], Any]:
+        """
+        Build the function that fills a field's placeholder from its raw value.
+
+        Fields rendered the same way share one function, so their rendered
+        batch columns (and cached fragments) are shared too.
+
+        Args:
+            plan_field: The field
+            pair_prefix: ``<separator>key=`` for optional fields
+
+        Returns:
+            Function applying the field's optional-field rule, transform
+            and escaping
+        """
+        # Escape tables are module constants, so their identity names them
+        key = (
+            id(plan_field.escape), plan_field.transform, plan_field.optional,
+            plan_field.quote, pair_prefix, plan_field.cached
+        )
+        render = _renderers.get(key)
+        if render is None:
+            render = FieldPlan._build_renderer(plan_field, pair_prefix)
+            if plan_field.cached:
+                render = lru_cache(maxsize=FRAGMENT_CACHE_SIZE)(render)
+            _renderers[key] = render
+        return render
+
+    @staticmethod
+    def _build_renderer(plan_field: PlanField, pair_prefix: str) -> Callable[[Any], Any]:
+        """Build a field's render function (see _compile_field)."""
+        transform = plan_field.transform
+        escape = make_escaper(plan_field.escape) if plan_field.escape else None
+
+        if transform and escape:
+            render = lambda value: escape(transform(value))
+        else:
+            render = transform or escape or (lambda value: value)
+
+        when = plan_field.optional
+        if when is None:
+            return render
+        pair_suffix = plan_field.quote
+        return lambda value: pair_prefix + render(value) + pair_suffix if when(value) else ""
+
+    def render_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Render every row of an event batch.
+
+        Each distinct string value is escaped once per batch and the rows
+        are rendered column-wise. Decoded columns and timestamp fields are
+        memoized on the batch, so every plan rendering the same batch (e.g.
+        LEEF and CEF for ``--format both``) shares them; escaped columns
+        are shared by plans using the same field rendering.
+
+        Args:
+            batch: The events to render
+
+        Returns:
+            Formatted lines, one per row
+        """
+        if not len(batch):
+            return []
+
+        columns: List[Any] = []
+        for position, source in enumerate(self.sources):
+            if position in self._timestamp_positions:
+                columns.append(None)
+            elif position in self._slot_map:
+                render = self._slot_map[position]
+                columns.append(batch.derived((source, render), lambda: self._build_column(batch, source, render)))
+            else:
+                columns.append(batch.decoded(source))
+
+        if self._timestamp_slots:
+            parts = batch.derived('timestamp_parts', lambda: timestamp_cache.columns(batch.timestamps))
+            for position, part in self._timestamp_slots:
+                columns[position] = parts[part]
+
+        template = self.template
+        return [template % row for row in zip(*columns)]
+
+    @staticmethod
+    def _build_column(batch: EventBatch, source: str, render: Callable[[Any], Any]) -> List[Any]:
+        """Render one column of a batch."""
+        if source in batch.values:
+            # Render each distinct value once, then expand the codes
+            values = list(map(render, batch.values[source]))
+            return list(map(values.__getitem__, batch.codes[source]))
+        return list(map(render, batch.decoded(source)))
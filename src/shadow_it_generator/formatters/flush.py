@@ -0,0 +1,127 @@
+"""
+Flush policies for formatter output.
+
+Flushing after every line costs one write(2) syscall per event. A
+FlushPolicy says how much output may sit in the file buffer before it is
+pushed to the OS: nothing until close, a number of events or bytes, or a
+time interval. Batch runs favour throughput and realtime runs favour
+latency, so each has its own default.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import time
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    """
+    When buffered output is flushed.
+
+    A flush is due as soon as any configured limit is reached; with no
+    limits output is only flushed on close (and explicit flush() calls,
+    e.g. before a checkpoint).
+
+    Attributes:
+        events: Flush after this many events
+        bytes: Flush after this many bytes
+        interval_ms: Flush when this many milliseconds have passed since
+            the last flush (checked when output is written)
+    """
+    events: Optional[int] = None
+    bytes: Optional[int] = None
+    interval_ms: Optional[float] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "FlushPolicy":
+        """
+        Parse a policy from a command-line style string.
+
+        Accepted forms are ``never``, ``events:N``, ``bytes:N`` and
+        ``ms:T``; several limits can be combined with commas, e.g.
+        ``events:1000,ms:500``.
+
+        Args:
+            spec: Policy string
+
+        Returns:
+            The policy
+
+        Raises:
+            ValueError: If the string is not a valid policy
+        """
+        spec = spec.strip().lower()
+        if spec == "never":
+            return cls()
+
+        limits = {}
+        names = {'events': 'events', 'bytes': 'bytes', 'ms': 'interval_ms'}
+        for part in spec.split(','):
+            name, _, value = part.strip().partition(':')
+            if name not in names or not value:
+                raise ValueError(f"Invalid flush policy '{spec}'; use never, events:N, bytes:N or ms:T")
+            number = float(value) if name == 'ms' else int(value)
+            if number <= 0:
+                raise ValueError(f"Flush policy limit must be positive: '{part}'")
+            limits[names[name]] = number
+        return cls(**limits)
+
+    def __str__(self) -> str:
+        parts = []
+        if self.events:
+            parts.append(f"events:{self.events}")
+        if self.bytes:
+            parts.append(f"bytes:{self.bytes}")
+        if self.interval_ms:
+            parts.append(f"ms:{self.interval_ms:g}")
+        return ",".join(parts) or "never"
+
+
+# Batch runs: let large writes go straight through and flush on checkpoints and close
+BATCH_FLUSH_POLICY = FlushPolicy()
+
+# Realtime runs: readers tailing the files see new events within a quarter second
+REALTIME_FLUSH_POLICY = FlushPolicy(interval_ms=250)
+
+
+class FlushTracker:
+    """Tracks output written since the last flush against a FlushPolicy."""
+
+    def __init__(self, policy: FlushPolicy):
+        """
+        Initialize the tracker.
+
+        Args:
+            policy: The flush policy to apply
+        """
+        self.policy = policy
+        self.reset()
+
+    def reset(self) -> None:
+        """Record that everything written so far has been flushed."""
+        self.pending_events = 0
+        self.pending_bytes = 0
+        self.last_flush = time.monotonic()
+
+    def wrote(self, events: int, size: int) -> bool:
+        """
+        Record written output.
+
+        Args:
+            events: Number of events written
+            size: Number of bytes written
+
+        Returns:
+            True if the policy says to flush now
+        """
+        self.pending_events += events
+        self.pending_bytes += size
+
+        policy = self.policy
+        if policy.events and self.pending_events >= policy.events:
+            return True
+        if policy.bytes and self.pending_bytes >= policy.bytes:
+            return True
+        if policy.interval_ms and (time.monotonic() - self.last_flush) * 1000 >= policy.interval_ms:
+            return True
+        return False
@@ -7,10 +7,22 @@ McAfee Web Gateway and other security products.
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import re
 
 from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .field_plan import FieldPlan, field, optional_field
+from .flush import FlushPolicy
+
+
+# LEEF requires escaping of pipe (|) and backslash (\) characters
+LEEF_ESCAPES = str.maketrans({'\\': '\\\\', '|': '\\|', '\n': '\\n', '\r': '\\r'})
+
+
+def _is_named_app(service_name: Optional[str]) -> bool:
+    """Whether a service name is written as app= (set and not 'Internet')."""
+    return bool(service_name) and service_name != 'Internet'
 
 
 class LEEFFormatter(LogFormatter):
@@ -21,15 +33,18 @@ class LEEFFormatter(LogFormatter):
     LEEF:Version|Vendor|Product|Version|EventID|key1=value1|key2=value2|...
     """
     
-    def __init__(self, output_dir: Path):
+    file_prefix = "leef"
+    
+    def __init__(self, output_dir: Path, flush_policy: Optional[FlushPolicy] = None):
         """Initialize LEEF formatter."""
-        super().__init__(output_dir)
+        super().__init__(output_dir, flush_policy)
         self.vendor = "McAfee"
         self.product = "Web Gateway"
         self.product_version = "12.2.19"  # Using realistic version number
         self.leef_version = "2.0"
         self.current_file = None
         self.current_date = None
+        self.plan = self._compile_plan()
     
     def _escape_value(self, value: str) -> str:
         """
@@ -39,13 +54,9 @@ class LEEFFormatter(LogFormatter):
         """
         if not isinstance(value, str):
             value = str(value)
-        value = value.replace('\\', '\\\\')
-        value = value.replace('|', '\\|')
-        value = value.replace('\n', '\\n')
-        value = value.replace('\r', '\\r')
-        return value
+        return value.translate(LEEF_ESCAPES)
     
-    def _get_event_id(self, event: LogEvent) -> str:
+    def _get_event_id(self, event: Optional[LogEvent] = None) -> str:
         """
         Determine the event ID based on the event type.
         
@@ -53,6 +64,45 @@ class LEEFFormatter(LogFormatter):
         """
         return "302"  # Web traffic event
     
+    def _compile_plan(self) -> FieldPlan:
+        """Build the field plan; the header is static, so it is part of the template."""
+        header = f"LEEF:{self.leef_version}|{self.vendor}|{self.product}|{self.product_version}|{self._get_event_id()}|"
+        
+        return FieldPlan(header + '\t', '\t', [
+            # Core fields in the expected order
+            field('date', 'date'),
+            field('time', 'time'),
+            field('timestamp', 'unix'),
+            field('src', 'source_ip'),
+            field('dst', 'destination_ip'),
+            field('srcPort', 'source_port'),
+            field('dstPort', 'destination_port'),
+            field('usrName', 'username', escape=LEEF_ESCAPES, cached=True),
+            field('domain', 'user_domain', escape=LEEF_ESCAPES, cached=True),
+            field('request', 'url', escape=LEEF_ESCAPES),
+            field('method', 'method'),
+            field('proto', 'protocol'),
+            field('status', 'status_code'),
+            field('action', 'action'),
+            field('cat', 'category', escape=LEEF_ESCAPES, cached=True),
+            field('riskLevel', 'risk_level'),
+            
+            # Bytes and performance
+            field('bytesIn', 'bytes_received'),
+            field('bytesOut', 'bytes_sent'),
+            field('responseTime', 'duration_ms'),
+            
+            # User agent
+            field('userAgent', 'user_agent', escape=LEEF_ESCAPES, cached=True),
+            
+            # Optional fields
+            optional_field(
+                'app', 'service_name', escape=LEEF_ESCAPES, cached=True,
+                when=_is_named_app
+            ),
+            optional_field('referrer', 'referrer', escape=LEEF_ESCAPES),
+        ])
+    
     def format_event(self, event: LogEvent) -> str:
         """
         Format a log event in LEEF format.
@@ -63,54 +113,22 @@ class LEEFFormatter(LogFormatter):
         Returns:
             LEEF formatted string
         """
-        # Build LEEF header
-        header = f"LEEF:{self.leef_version}|{self.vendor}|{self.product}|{self.product_version}|{self._get_event_id(event)}|"
-        
-        # Format timestamp components
-        date = event.timestamp.strftime('%Y-%m-%d')
-        time = event.timestamp.strftime('%H:%M:%S.%f')[:-3]
-        unix_timestamp = int(event.timestamp.timestamp())
-        
-        # Build key-value pairs for essential fields in tab-separated format
-        fields = []
-        
-        # Core fields in the expected order
-        fields.append(f"date={date}")
-        fields.append(f"time={time}")
-        fields.append(f"timestamp={unix_timestamp}")
-        fields.append(f"src={event.source_ip}")
-        fields.append(f"dst={event.destination_ip}")
-        fields.append(f"srcPort={event.source_port}")
-        fields.append(f"dstPort={event.destination_port}")
-        fields.append(f"usrName={self._escape_value(event.username)}")
-        fields.append(f"domain={self._escape_value(event.user_domain)}")
-        fields.append(f"request={self._escape_value(event.url)}")
-        fields.append(f"method={event.method}")
-        fields.append(f"proto={event.protocol}")
-        fields.append(f"status={event.status_code}")
-        fields.append(f"action={event.action}")
-        fields.append(f"cat={self._escape_value(event.category)}")
-        fields.append(f"riskLevel={event.risk_level}")
-        
-        # Bytes and performance
-        fields.append(f"bytesIn={event.bytes_received}")
-        fields.append(f"bytesOut={event.bytes_sent}")
-        fields.append(f"responseTime={event.duration_ms}")
-        
-        # User agent
-        fields.append(f"userAgent={self._escape_value(event.user_agent)}")
-        
-        # Optional fields
-        if event.service_name and event.service_name != 'Internet':
-            fields.append(f"app={self._escape_value(event.service_name)}")
-        
-        if event.referrer:
-            fields.append(f"referrer={self._escape_value(event.referrer)}")
+        return self.plan.render_event(event)
+    
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Format every row of an event batch in one pass.
         
-        # Combine header and fields with tab separator
-        leef_line = header + '\t' + '\t'.join(fields)
+        Produces the same lines as format_event, but escapes each distinct
+        string value once per batch instead of once per event.
         
-        return leef_line
+        Args:
+            batch: The events to format
+            
+        Returns:
+            LEEF formatted strings, one per row
+        """
+        return self.plan.render_batch(batch)
     
     def write_event(self, event: LogEvent) -> None:
         """
@@ -121,45 +139,11 @@ class LEEFFormatter(LogFormatter):
         # Determine file name based on event date
         event_date = event.timestamp.date()
         
-        # Check if we need to open a new file
-        if self.current_date != event_date or self._file_handle is None:
-            # Close previous file if open
-            if self._file_handle:
-                self._file_handle.close()
-            
-            # Open new file
-            filename = f"leef_{event_date.strftime('%Y%m%d')}.log"
-            filepath = self.output_dir / filename
-            self._file_handle = open(filepath, 'a', encoding='utf-8')
+        if self.current_date != event_date:
             self.current_date = event_date
-            self.current_file = filepath
+            self.current_file = self.get_output_path(event_date)
         
-        # Format and write the event
+        # Format and write the event; day files are shared with write_batch
+        # and flushed according to the flush policy
         leef_line = self.format_event(event)
-        self._file_handle.write(leef_line + '\n')
-        self._file_handle.flush()  # Ensure data is written
-    
-    def write_batch(self, events: list[LogEvent]) -> None:
-        """
-        Write a batch of events efficiently.
-        
-        Args:
-            events: List of events to write
-        """
-        # Group events by date
-        events_by_date = {}
-        for event in events:
-            event_date = event.timestamp.date()
-            if event_date not in events_by_date:
-                events_by_date[event_date] = []
-            events_by_date[event_date].append(event)
-        
-        # Write each group
-        for date, date_events in sorted(events_by_date.items()):
-            filename = f"leef_{date.strftime('%Y%m%d')}.log"
-            filepath = self.output_dir / filename
-            
-            with open(filepath, 'a', encoding='utf-8') as f:
-                for event in date_events:
-                    leef_line = self.format_event(event)
-                    f.write(leef_line + '\n')
\ No newline at end of file
+        self.write_line(event_date, leef_line)
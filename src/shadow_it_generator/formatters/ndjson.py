@@ -0,0 +1,170 @@
+"""
+NDJSON (newline-delimited JSON) formatter implementation.
+
+Writes one JSON object per event with the LogEvent fields as keys, for
+pipelines such as Elastic/OpenSearch that ingest JSON lines directly.
+"""
+
+from dataclasses import fields as dataclass_fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import re
+
+from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .field_plan import FieldPlan, field
+from .flush import FlushPolicy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Characters that JSON strings must escape
+_JSON_SPECIALS = re.compile(r'["\\\x00-\x1f]')
+
+# String fields that differ per event, so caching their encoded values
+# would only churn the fragment cache
+_PER_EVENT_FIELDS = ('url', 'referrer')
+
+
+def json_string(value: Optional[str]) -> str:
+    """Encode a string (or None) as a JSON value."""
+    if value is None:
+        return 'null'
+    if isinstance(value, str) and not _JSON_SPECIALS.search(value):
+        return '"' + value + '"'
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_timestamp(timestamp) -> str:
+    """Encode a datetime as a JSON ISO 8601 string."""
+    return '"' + timestamp.isoformat() + '"'
+
+
+def orjson_dumps(value: Any) -> str:
+    """
+    Serialize a value with orjson, as the template path would.
+
+    Non-string dict keys (only possible in additional_fields) are written
+    as strings, as json.dumps does. orjson only converts them with
+    OPT_NON_STR_KEYS, which slows every dict down, so the option is only
+    used for values that need it.
+    """
+    try:
+        return orjson.dumps(value, default=str).decode('utf-8')
+    except orjson.JSONEncodeError:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+def json_object(value: Optional[Dict[str, Any]]) -> str:
+    """Encode a dict (or None) as compact JSON."""
+    if value is None:
+        return 'null'
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+class NDJSONFormatter(LogFormatter):
+    """
+    Formats log events as newline-delimited JSON.
+
+    Each line is a JSON object with the LogEvent fields in declaration
+    order, e.g. ``{"timestamp":"2025-01-06T09:15:02.250000","source_ip":...}``.
+    Timestamps are ISO 8601; missing values are ``null``.
+
+    With orjson installed, events are serialized by orjson; otherwise a
+    compiled template with pre-encoded keys is filled per event. Both
+    produce the same bytes.
+    """
+
+    file_prefix = "json"
+
+    def __init__(self, output_dir: Path, flush_policy: Optional[FlushPolicy] = None):
+        """Initialize NDJSON formatter."""
+        super().__init__(output_dir, flush_policy)
+        self.current_file = None
+        self.current_date = None
+        self.field_names = [event_field.name for event_field in dataclass_fields(LogEvent)]
+        self.plan = self._compile_plan()
+
+    def _compile_plan(self) -> FieldPlan:
+        """Build the template: keys are JSON-encoded once, values per event."""
+        transforms = {
+            'timestamp': json_timestamp,
+            'additional_fields': json_object,
+        }
+        plan_fields = []
+        for name in self.field_names:
+            if name in EventBatch.INT_FIELDS:
+                plan_fields.append(field(json.dumps(name), name))
+            elif name in transforms:
+                plan_fields.append(field(json.dumps(name), name, transform=transforms[name]))
+            else:
+                cached = name not in _PER_EVENT_FIELDS
+                plan_fields.append(field(json.dumps(name), name, transform=json_string, cached=cached))
+
+        return FieldPlan('{', ',', plan_fields, suffix='}', assign=':')
+
+    def format_event(self, event: LogEvent) -> str:
+        """
+        Format a log event as a JSON object.
+
+        Args:
+            event: The event to format
+
+        Returns:
+            JSON string (without a trailing newline)
+        """
+        if orjson is not None:
+            return orjson_dumps(event)
+        return self.plan.render_event(event)
+
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Format every row of an event batch.
+
+        With orjson, one dict is refilled with each row's values and
+        serialized (no dict is built per row); otherwise each distinct
+        string value is encoded once per batch and the compiled template
+        is filled per row.
+
+        Args:
+            batch: The events to format
+
+        Returns:
+            JSON strings, one per row
+        """
+        if orjson is None:
+            return self.plan.render_batch(batch)
+
+        names = self.field_names
+        columns = [batch.decoded(name) for name in names]
+        dumps = orjson.dumps
+
+        # Keys keep their first insertion order, so every row has the field order
+        row_values: Dict[str, Any] = dict.fromkeys(names)
+        fill = row_values.update
+        lines = []
+        for row in zip(*columns):
+            fill(zip(names, row))
+            try:
+                lines.append(dumps(row_values, default=str).decode('utf-8'))
+            except orjson.JSONEncodeError:
+                lines.append(orjson_dumps(row_values))
+        return lines
+
+    def write_event(self, event: LogEvent) -> None:
+        """
+        Write a formatted event to the appropriate log file.
+
+        Log files are organized by date: json_YYYYMMDD.log
+        """
+        event_date = event.timestamp.date()
+
+        if self.current_date != event_date:
+            self.current_date = event_date
+            self.current_file = self.get_output_path(event_date)
+
+        self.write_line(event_date, self.format_event(event))
@@ -0,0 +1,129 @@
+"""
+Splunk key=value formatter implementation.
+
+Formats log events as space-separated ``key="value"`` pairs after a
+leading timestamp, with field names from the Splunk CIM Web data model,
+so Splunk extracts fields at search time without custom transforms.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .field_plan import FieldPlan, constant, field, make_escaper, optional_field
+from .flush import FlushPolicy
+
+
+# Quoted values escape double quote and backslash; line breaks would split the event
+SPLUNK_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+_escape = make_escaper(SPLUNK_ESCAPES)
+
+
+def format_additional_fields(additional_fields: Dict[str, Any]) -> str:
+    """Render additional fields as ``key="value"`` pairs (None becomes empty)."""
+    return " ".join(
+        f'{key}="{_escape("" if value is None else value)}"' for key, value in additional_fields.items()
+    )
+
+
+class SplunkFormatter(LogFormatter):
+    """
+    Formats log events as Splunk key=value lines.
+
+    Line structure:
+    2025-01-06 09:15:02.250 +0000 src="10.1.2.3" dest="52.1.2.3" src_port=51234 ...
+
+    The leading ``%Y-%m-%d %H:%M:%S.%3N %z`` timestamp is what Splunk reads
+    into ``_time``. It carries the event's UTC offset, so events of a
+    non-UTC tenant (and the repeated hour at a DST change) are not read
+    in the indexer's time zone. String values are quoted and integers are bare. Only
+    the free-text fields are escaped; the rest are generated values that
+    never contain quotes or backslashes.
+    """
+
+    file_prefix = "splunk"
+
+    def __init__(self, output_dir: Path, flush_policy: Optional[FlushPolicy] = None):
+        """Initialize Splunk formatter."""
+        super().__init__(output_dir, flush_policy)
+        self.vendor_product = "McAfee Web Gateway"
+        self.current_file = None
+        self.current_date = None
+        self.plan = self._compile_plan()
+
+    def _compile_plan(self) -> FieldPlan:
+        """Build the field plan; the timestamp leads the line without a key."""
+        return FieldPlan('', ' ', [
+            # Timestamp for _time
+            field('', 'date'),
+            field('', 'time'),
+            field('', 'offset'),
+
+            # CIM Web fields
+            field('src', 'source_ip', quote='"'),
+            field('dest', 'destination_ip', quote='"'),
+            field('src_port', 'source_port'),
+            field('dest_port', 'destination_port'),
+            field('user', 'username', escape=SPLUNK_ESCAPES, quote='"', cached=True),
+            field('user_domain', 'user_domain', escape=SPLUNK_ESCAPES, quote='"', cached=True),
+            field('url', 'url', escape=SPLUNK_ESCAPES, quote='"'),
+            field('http_method', 'method', quote='"'),
+            field('protocol', 'protocol', quote='"'),
+            field('status', 'status_code'),
+            field('action', 'action', quote='"'),
+            field('category', 'category', escape=SPLUNK_ESCAPES, quote='"', cached=True),
+            field('risk_level', 'risk_level', quote='"'),
+            field('bytes_in', 'bytes_received'),
+            field('bytes_out', 'bytes_sent'),
+            field('response_time', 'duration_ms'),
+            field('http_user_agent', 'user_agent', escape=SPLUNK_ESCAPES, quote='"', cached=True),
+            constant('vendor_product', _escape(self.vendor_product), quote='"'),
+
+            # Optional fields
+            optional_field('app', 'service_name', escape=SPLUNK_ESCAPES, quote='"', cached=True),
+            optional_field('http_referrer', 'referrer', escape=SPLUNK_ESCAPES, quote='"'),
+            optional_field('', 'additional_fields', transform=format_additional_fields),
+        ])
+
+    def format_event(self, event: LogEvent) -> str:
+        """
+        Format a log event as a Splunk key=value line.
+
+        Args:
+            event: The event to format
+
+        Returns:
+            Splunk formatted string
+        """
+        return self.plan.render_event(event)
+
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Format every row of an event batch in one pass.
+
+        Produces the same lines as format_event, but escapes each distinct
+        string value once per batch instead of once per event.
+
+        Args:
+            batch: The events to format
+
+        Returns:
+            Splunk formatted strings, one per row
+        """
+        return self.plan.render_batch(batch)
+
+    def write_event(self, event: LogEvent) -> None:
+        """
+        Write a formatted event to the appropriate log file.
+
+        Log files are organized by date: splunk_YYYYMMDD.log
+        """
+        event_date = event.timestamp.date()
+
+        if self.current_date != event_date:
+            self.current_date = event_date
+            self.current_file = self.get_output_path(event_date)
+
+        self.write_line(event_date, self.format_event(event))
@@ -0,0 +1,323 @@
+"""
+Syslog framing for formatter output.
+
+Collectors that receive LEEF/CEF over syslog expect each message behind a
+syslog header: RFC 5424 (``<PRI>1 TIMESTAMP HOST APP - - - MSG``) or the
+older BSD format of RFC 3164 (``<PRI>Mmm dd hh:mm:ss HOST TAG: MSG``).
+SyslogFormatter wraps any formatter and prefixes its lines with such a
+header, optionally with RFC 6587 octet-counting framing for TCP streams.
+
+The header only changes once per second, so it is rendered per second
+and shared by every event in it; RFC 5424 splices in the milliseconds.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import re
+
+from .base import LogFormatter, LogEvent
+from .batch import EventBatch
+from .flush import FlushPolicy
+from .timestamps import timestamp_cache
+
+
+SYSLOG_PROTOCOLS = ('rfc5424', 'rfc3164')
+
+# Facility codes by name (RFC 5424 section 6.2.1)
+FACILITIES = {
+    'kern': 0, 'user': 1, 'mail': 2, 'daemon': 3, 'auth': 4, 'syslog': 5,
+    'lpr': 6, 'news': 7, 'uucp': 8, 'cron': 9, 'authpriv': 10, 'ftp': 11,
+    **{f'local{index}': 16 + index for index in range(8)},
+}
+
+# Severity used when the priority is derived from the facility
+SEVERITY_INFO = 6
+
+# RFC 3164 timestamps use English month abbreviations regardless of locale
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _header_token(value: Any) -> str:
+    """Make a HOSTNAME/APP-NAME token: printable ASCII without spaces, or '-'."""
+    token = re.sub(r'[^!-~]', '', str(value or ''))
+    return token or '-'
+
+
+def origin_data(software: Any = None, version: Any = None) -> str:
+    """
+    Build RFC 5424 ``origin`` structured data (section 7.2) naming the sender.
+
+    Args:
+        software: Software that generated the messages (at most 48 characters)
+        version: Its version (at most 32 characters)
+
+    Returns:
+        ``[origin software="..." swVersion="..."]`` with the parameters
+        that are set, or '-' when neither is
+    """
+    params = []
+    for name, value, limit in (('software', software, 48), ('swVersion', version, 32)):
+        if value:
+            # PARAM-VALUE escapes '"', '\\' and ']' (RFC 5424 section 6.3.3)
+            text = re.sub(r'(["\\\]])', r'\\\1', str(value)[:limit])
+            params.append(f' {name}="{text}"')
+    return f"[origin{''.join(params)}]" if params else '-'
+
+
+@dataclass(frozen=True)
+class SyslogFraming:
+    """
+    How formatter lines are wrapped in syslog messages.
+
+    Attributes:
+        protocol: 'rfc5424' or 'rfc3164'
+        priority: PRI value (facility * 8 + severity)
+        hostname: HOSTNAME field
+        app_name: APP-NAME (RFC 5424) or TAG (RFC 3164)
+        structured_data: STRUCTURED-DATA of RFC 5424 messages (see
+            origin_data); RFC 3164 has no such field
+        octet_counting: Prefix each message with its length in bytes
+            (RFC 6587), as TCP receivers expect
+    """
+    protocol: str = 'rfc5424'
+    priority: int = FACILITIES['daemon'] * 8 + SEVERITY_INFO
+    hostname: str = '-'
+    app_name: str = '-'
+    structured_data: str = '-'
+    octet_counting: bool = False
+
+    def __post_init__(self):
+        if self.protocol not in SYSLOG_PROTOCOLS:
+            raise ValueError(f"Unknown syslog protocol '{self.protocol}'; use {' or '.join(SYSLOG_PROTOCOLS)}")
+        if not 0 <= self.priority <= 191:
+            raise ValueError(f"Syslog priority must be between 0 and 191, not {self.priority}")
+
+    @classmethod
+    def from_config(
+        cls,
+        logging_config: Optional[Mapping[str, Any]],
+        protocol: str = 'rfc5424',
+        octet_counting: bool = False
+    ) -> "SyslogFraming":
+        """
+        Build the framing from the ``logging`` section of enterprise.yaml.
+
+        ``syslog_priority`` is used as the PRI value when set; otherwise
+        the priority is ``facility`` at severity info. ``hostname`` is the
+        HOSTNAME, and ``app_name`` (default: ``product`` without spaces)
+        the APP-NAME/TAG. ``vendor``, ``product`` and ``version`` go into
+        the RFC 5424 ``origin`` structured data, as ``software="<vendor>
+        <product>"`` and ``swVersion``; RFC 3164 messages have no place
+        for them.
+
+        Args:
+            logging_config: The logging section (may be None or empty)
+            protocol: 'rfc5424' or 'rfc3164'
+            octet_counting: Use octet-counting framing
+
+        Returns:
+            The framing
+
+        Raises:
+            ValueError: If the protocol, facility or priority is invalid
+        """
+        logging_config = logging_config or {}
+
+        priority = logging_config.get('syslog_priority')
+        if priority is None:
+            facility = str(logging_config.get('facility', 'daemon')).lower()
+            if facility not in FACILITIES:
+                raise ValueError(f"Unknown syslog facility '{facility}'")
+            priority = FACILITIES[facility] * 8 + SEVERITY_INFO
+
+        app_name = logging_config.get('app_name') or logging_config.get('product')
+        software = ' '.join(
+            str(logging_config[key]) for key in ('vendor', 'product') if logging_config.get(key)
+        )
+        return cls(
+            protocol=protocol,
+            priority=int(priority),
+            hostname=_header_token(logging_config.get('hostname')),
+            app_name=_header_token(app_name),
+            structured_data=origin_data(software, logging_config.get('version')) if protocol == 'rfc5424' else '-',
+            octet_counting=octet_counting,
+        )
+
+    def __str__(self) -> str:
+        data = f" sd={self.structured_data}" if self.structured_data != '-' else ""
+        framing = " octet-counting" if self.octet_counting else ""
+        return f"{self.protocol} pri={self.priority} host={self.hostname} app={self.app_name}{data}{framing}"
+
+
+class SyslogFormatter(LogFormatter):
+    """
+    Wraps another formatter's lines in syslog messages.
+
+    Writes to the wrapped formatter's directory and file names; the
+    wrapped formatter only formats. With octet counting each message is
+    written as an RFC 6587 frame, ``<length> <message>``, where the
+    length is the message's byte count. Frames follow each other with
+    no newline between them, so a file is a valid octet-counted stream
+    and can be replayed to a TCP receiver byte for byte.
+    """
+
+    def __init__(
+        self,
+        formatter: LogFormatter,
+        framing: SyslogFraming,
+        flush_policy: Optional[FlushPolicy] = None
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            formatter: Formatter producing the message bodies
+            framing: Syslog header and framing settings
+            flush_policy: When to flush written output (default: the
+                wrapped formatter's policy)
+        """
+        super().__init__(formatter.output_dir, flush_policy or formatter.flush_policy)
+        self.formatter = formatter
+        self.framing = framing
+        self.file_prefix = formatter.file_prefix
+        if framing.octet_counting:
+            self.line_end = ""
+
+        # Rendered header parts by (epoch second, tzinfo)
+        self._headers: Dict[Tuple[int, Any], Tuple[str, str]] = {}
+
+    def _header_parts(self, timestamp: datetime, date: str, time_text: str, unix: int) -> Tuple[str, str]:
+        """
+        Get the header parts for a second: (head, tail).
+
+        For RFC 5424 the event's time with milliseconds goes between them;
+        for RFC 3164 the head is the whole header and the tail is empty.
+        """
+        key = (unix, timestamp.tzinfo)
+        parts = self._headers.get(key)
+        if parts is None:
+            if len(self._headers) >= 4096:
+                self._headers.clear()
+
+            framing = self.framing
+            pri = f"<{framing.priority}>"
+            if framing.protocol == 'rfc5424':
+                # Naive times are local time, as for the unix timestamps
+                second = timestamp.replace(microsecond=0)
+                if second.tzinfo is None:
+                    second = second.astimezone()
+                offset = second.isoformat()[19:]
+                parts = (f"{pri}1 {date}T", f"{offset} {framing.hostname} {framing.app_name} - - {framing.structured_data} ")
+            else:
+                month = _MONTHS[int(date[5:7]) - 1]
+                day = int(date[8:10])
+                parts = (f"{pri}{month} {day:2d} {time_text[:8]} {framing.hostname} {framing.app_name}: ", "")
+            self._headers[key] = parts
+        return parts
+
+    def frame(self, timestamp: datetime, line: str) -> str:
+        """
+        Wrap one formatted line in a syslog message.
+
+        Args:
+            timestamp: Event timestamp
+            line: Formatted event
+
+        Returns:
+            The syslog message (octet-counted if configured)
+        """
+        date, time_text, unix, _ = timestamp_cache.parts(timestamp)
+        head, tail = self._header_parts(timestamp, date, time_text, unix)
+        if tail:
+            message = head + time_text + tail + line
+        else:
+            message = head + line
+
+        if self.framing.octet_counting:
+            return self._count(message)
+        return message
+
+    def frame_lines(
+        self,
+        timestamps: Sequence[datetime],
+        lines: List[str],
+        parts: Optional[Tuple[List[str], List[str], List[int], List[str]]] = None
+    ) -> List[str]:
+        """
+        Wrap formatted lines in syslog messages.
+
+        Args:
+            timestamps: Event timestamps, one per line
+            lines: Formatted events
+            parts: Precomputed ``timestamp_cache.columns(timestamps)``
+
+        Returns:
+            The syslog messages
+        """
+        dates, times, unixes, _ = parts or timestamp_cache.columns(timestamps)
+        header_parts = self._header_parts
+        rfc5424 = self.framing.protocol == 'rfc5424'
+
+        messages = []
+        last_key = None
+        head = tail = ""
+        for timestamp, date, time_text, unix, line in zip(timestamps, dates, times, unixes, lines):
+            key = (unix, timestamp.tzinfo)
+            if key != last_key:
+                head, tail = header_parts(timestamp, date, time_text, unix)
+                last_key = key
+            if rfc5424:
+                messages.append(head + time_text + tail + line)
+            else:
+                messages.append(head + line)
+
+        if self.framing.octet_counting:
+            return list(map(self._count, messages))
+        return messages
+
+    @staticmethod
+    def _count(message: str) -> str:
+        """Prefix a message with its length in bytes (MSG-LEN, RFC 6587 section 3.4.1)."""
+        size = len(message) if message.isascii() else len(message.encode('utf-8'))
+        return f"{size} {message}"
+
+    def setup(self) -> None:
+        """Create the output directory."""
+        super().setup()
+        self.formatter.setup()
+
+    def format_event(self, event: LogEvent) -> str:
+        """
+        Format an event with the wrapped formatter and frame it.
+
+        Args:
+            event: The event to format
+
+        Returns:
+            Syslog message
+        """
+        return self.frame(event.timestamp, self.formatter.format_event(event))
+
+    def format_batch(self, batch: EventBatch) -> List[str]:
+        """
+        Format a batch with the wrapped formatter and frame every line.
+
+        Args:
+            batch: The events to format
+
+        Returns:
+            Syslog messages, one per row
+        """
+        lines = self.formatter.format_batch(batch)
+        parts = batch.derived('timestamp_parts', lambda: timestamp_cache.columns(batch.timestamps))
+        return self.frame_lines(batch.timestamps, lines, parts)
+
+    def write_event(self, event: LogEvent) -> None:
+        """
+        Write a framed event to its day file.
+
+        Args:
+            event: The event to write
+        """
+        self.write_line(event.timestamp.date(), self.format_event(event))
@@ -0,0 +1,130 @@
+"""
+Per-second timestamp rendering cache.
+
+Every formatter writes the event date, the time with milliseconds, the
+unix timestamp or the UTC offset. Rendering them costs a datetime
+formatting call and a local-time conversion per event, yet generated
+traffic puts many events in the same second. The cache renders each
+second once (date, time up to the seconds, unix timestamp, UTC offset)
+and only the millisecond suffix is spliced in per event.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Seconds kept before the cache is cleared
+TIMESTAMP_CACHE_SIZE = 4096
+
+# Millisecond suffixes, indexed by millisecond
+_MILLIS = [f"{millis:03d}" for millis in range(1000)]
+
+_ONE_SECOND = timedelta(seconds=1)
+
+
+class TimestampCache:
+    """
+    Rendered date, time, unix and UTC offset fields keyed by epoch second.
+
+    Lookups for the same second as the previous event (the common case,
+    since events arrive in timestamp order) are a range check; other
+    seconds go through a dict keyed by (epoch second, tzinfo).
+    """
+
+    def __init__(self, size: int = TIMESTAMP_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            size: Number of distinct seconds to keep before clearing
+        """
+        self.size = size
+        self._seconds: Dict[Tuple[int, Any], Tuple[str, str, int, str]] = {}
+
+        # Second of the most recent lookup: [start, end) and its entry
+        self._tzinfo: Any = None
+        self._start: Optional[datetime] = None
+        self._end: Optional[datetime] = None
+        self._entry: Tuple[str, str, int, str] = ("", "", 0, "")
+
+    def parts(self, timestamp: datetime) -> Tuple[str, str, int, str]:
+        """
+        Get the rendered date, time, unix timestamp and UTC offset of an event.
+
+        Matches ``strftime('%Y-%m-%d')``, ``strftime('%H:%M:%S.%f')[:-3]``,
+        ``int(timestamp.timestamp())`` and ``strftime('%z')``. Naive
+        timestamps are local time, as for ``timestamp()``, so their offset
+        is the local one.
+
+        Args:
+            timestamp: Event timestamp
+
+        Returns:
+            (date, time with milliseconds, unix timestamp, UTC offset)
+        """
+        # Naive datetimes compare equal across a DST fold, so folded times skip the range check
+        if timestamp.tzinfo is self._tzinfo and not timestamp.fold and self._start is not None \
+                and self._start <= timestamp < self._end:
+            date, time_prefix, unix, offset = self._entry
+        else:
+            date, time_prefix, unix, offset = self._lookup(timestamp)
+
+        return date, time_prefix + _MILLIS[timestamp.microsecond // 1000], unix, offset
+
+    def columns(self, timestamps: Sequence[datetime]) -> Tuple[List[str], List[str], List[int], List[str]]:
+        """
+        Render the timestamp fields for many events.
+
+        Args:
+            timestamps: Event timestamps
+
+        Returns:
+            Date, time, unix timestamp and UTC offset columns, one value
+            per event
+        """
+        dates = []
+        times = []
+        unixes = []
+        offsets = []
+        millis = _MILLIS
+
+        # Same logic as parts(), with the current second kept in locals
+        tzinfo, start, end, current = self._tzinfo, self._start, self._end, self._entry
+        for timestamp in timestamps:
+            if start is not None and timestamp.tzinfo is tzinfo and not timestamp.fold \
+                    and start <= timestamp < end:
+                date, time_prefix, unix, offset = current
+            else:
+                date, time_prefix, unix, offset = self._lookup(timestamp)
+                tzinfo, start, end, current = self._tzinfo, self._start, self._end, self._entry
+            dates.append(date)
+            times.append(time_prefix + millis[timestamp.microsecond // 1000])
+            unixes.append(unix)
+            offsets.append(offset)
+        return dates, times, unixes, offsets
+
+    def _lookup(self, timestamp: datetime) -> Tuple[str, str, int, str]:
+        """Get (or render) the entry for a timestamp's second and make it current."""
+        unix = int(timestamp.timestamp())
+        key = (unix, timestamp.tzinfo)
+
+        entry = self._seconds.get(key)
+        if entry is None:
+            if len(self._seconds) >= self.size:
+                self._seconds.clear()
+            second = timestamp.replace(microsecond=0)
+            rendered = second.isoformat(' ')
+            local = second if second.tzinfo is not None else second.astimezone()
+            entry = self._seconds[key] = (rendered[:10], rendered[11:19] + '.', unix, local.strftime('%z'))
+
+        if not timestamp.fold:
+            self._tzinfo = timestamp.tzinfo
+            self._start = timestamp.replace(microsecond=0)
+            self._end = self._start + _ONE_SECOND
+            self._entry = entry
+
+        return entry
+
+
+# Shared by all formatters
+timestamp_cache = TimestampCache()
@@ -0,0 +1,115 @@
+"""
+Background writes for formatter output.
+
+Without it, generating events and writing them alternate on one thread:
+while a batch is being written nothing is generated, and vice versa. A
+BackgroundWriter runs the writes on a thread of its own behind a bounded
+queue of rendered, encoded chunks. File writes (and compression) release
+the GIL, so the I/O overlaps the generation of the next batch. With the
+default of two pending chunks the queue is a double buffer: the producer
+fills one chunk while the writer drains the other, and blocks once both
+are full.
+"""
+
+from typing import Any, Callable, Optional
+import queue
+import threading
+
+
+# Chunks that may wait for the writer before the producer blocks
+DEFAULT_MAX_PENDING = 2
+
+
+class BackgroundWriter:
+    """
+    Runs submitted write operations in order on a background thread.
+
+    Operations are run strictly in submission order, so writes, flushes
+    and checkpoints queued by several formatters sharing one writer keep
+    their relative order. The thread starts with the first operation.
+
+    If an operation fails, the rest of the queue is discarded and the
+    error is raised in the producer by the next submit(), drain() or
+    close().
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize the writer.
+
+        Args:
+            max_pending: Operations that may be queued before submit()
+                blocks (the backpressure limit)
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, not {max_pending}")
+        self.max_pending = max_pending
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def submit(self, operation: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue an operation, blocking while the queue is full.
+
+        Args:
+            operation: Function to run on the writer thread
+            *args: Its arguments
+
+        Raises:
+            Exception: The error of an earlier operation that failed
+        """
+        self._raise_error()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((operation, args))
+
+    def drain(self) -> None:
+        """
+        Wait until every queued operation has run.
+
+        Does nothing when called from an operation on the writer thread.
+
+        Raises:
+            Exception: The error of an operation that failed
+        """
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Run the queued operations and stop the thread.
+
+        The writer can be used again afterwards; the next submit() starts
+        a new thread.
+
+        Raises:
+            Exception: The error of an operation that failed
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Raise the error of a failed operation, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        """Writer thread: run operations until the stop marker."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    operation, args = item
+                    operation(*args)
+            except BaseException as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
@@ -6,7 +6,7 @@ and requests based on configured patterns.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import random
 import uuid
@@ -15,6 +15,8 @@ from ..config.models import EnterpriseConfig, CloudService
 from ..core.user import User
 from ..core.session import Session
 from ..utils.time_utils import get_activity_multiplier, distribute_events_naturally
+from ..utils.random_streams import RandomStreams
+from ..utils.alias_sampler import AliasSampler
 from .junk_traffic import JunkTrafficGenerator
 
 
@@ -34,7 +36,9 @@ class ActivityGenerator:
         enterprise_config: EnterpriseConfig,
         services: List[CloudService],
         ip_generator: Any,
-        junk_generator: JunkTrafficGenerator
+        junk_generator: JunkTrafficGenerator,
+        streams: Optional[RandomStreams] = None,
+        intensity: float = 1.0
     ):
         """
         Initialize the activity generator.
@@ -44,17 +48,26 @@ class ActivityGenerator:
             services: List of available cloud services
             ip_generator: IP address generator
             junk_generator: Junk traffic generator
+            streams: Keyed random streams (a randomly seeded set if omitted)
+            intensity: Multiplier on every session's activity request rate
         """
         self.enterprise_config = enterprise_config
         self.services = services
         self.ip_generator = ip_generator
         self.junk_generator = junk_generator
+        self.streams = streams or RandomStreams()
+        self.intensity = intensity
         
         # Create service lookup
         self.service_map = {service.name: service for service in services}
         
         # User agent pool
         self.user_agents = self._build_user_agent_pool()
+        desktop_agents = [(ua, weight) for ua, weight in self.user_agents if 'Mobile' not in ua]
+        self._desktop_agent_sampler = AliasSampler(
+            [ua for ua, _ in desktop_agents],
+            [weight for _, weight in desktop_agents]
+        ) if desktop_agents else None
     
     def _build_user_agent_pool(self) -> List[Tuple[str, float]]:
         """Build pool of user agents from enterprise config."""
@@ -73,7 +86,8 @@ class ActivityGenerator:
         self,
         user: User,
         start_time: datetime,
-        end_time: datetime
+        end_time: datetime,
+        rng: Optional[random.Random] = None
     ) -> List[Session]:
         """
         Generate all activity for a user in a time period.
@@ -82,20 +96,22 @@ class ActivityGenerator:
             user: The user to generate activity for
             start_time: Start of period
             end_time: End of period
+            rng: Random stream for this user and period
             
         Returns:
             List of sessions
         """
+        rng = rng or random
         sessions = []
         
         # Get activity level for this period
-        activity_level = user.get_activity_level(start_time)
+        activity_level = user.get_activity_level(start_time, rng)
         
         if activity_level < 0.1:
             return sessions  # No activity
         
         # Determine which services to use
-        services_to_use = user.get_services_for_hour(start_time, self.service_map)
+        services_to_use = user.get_services_for_hour(start_time, self.service_map, rng)
         
         if not services_to_use:
             return sessions
@@ -109,14 +125,14 @@ class ActivityGenerator:
             # Determine number of sessions for this service
             if service.status == "blocked":
                 # Blocked services have fewer, shorter sessions
-                num_sessions = 1 if random.random() < 0.3 else 0
+                num_sessions = 1 if rng.random() < 0.3 else 0
             else:
                 # Normal services
                 base_sessions = 1
                 if user.profile.name == "power_user":
-                    base_sessions = random.randint(1, 3)
+                    base_sessions = rng.randint(1, 3)
                 elif user.profile.name == "risky":
-                    base_sessions = random.randint(1, 2)
+                    base_sessions = rng.randint(1, 2)
                 
                 num_sessions = int(base_sessions * activity_level)
             
@@ -125,12 +141,13 @@ class ActivityGenerator:
                 start_time,
                 end_time,
                 num_sessions,
-                burst_probability=0.3
+                burst_probability=0.3,
+                rng=rng
             )
             
             # Create sessions
             for session_time in session_times:
-                session = self._create_session(user, service, session_time)
+                session = self._create_session(user, service, session_time, rng)
                 sessions.append(session)
         
         return sorted(sessions, key=lambda s: s.start_time)
@@ -139,7 +156,8 @@ class ActivityGenerator:
         self,
         user: User,
         service: CloudService,
-        start_time: datetime
+        start_time: datetime,
+        rng: Optional[random.Random] = None
     ) -> Session:
         """
         Create a session for a user and service.
@@ -148,62 +166,64 @@ class ActivityGenerator:
             user: The user
             service: The cloud service
             start_time: Session start time
+            rng: Random stream the session's own stream is forked from
             
         Returns:
             Configured session
         """
+        rng = rng or random
+        
         # Determine if mobile
-        is_mobile = user.should_use_mobile()
+        is_mobile = user.should_use_mobile(rng)
         
         # Select user agent
         if is_mobile:
-            user_agent = self._get_mobile_user_agent()
+            user_agent = self._get_mobile_user_agent(rng)
         else:
-            user_agent = self._get_desktop_user_agent()
+            user_agent = self._get_desktop_user_agent(rng)
         
         # Get source IP
-        if random.random() < 0.1:  # 10% VPN usage
-            source_ip = self.ip_generator.generate_vpn_ip() or user.source_ip
+        if rng.random() < 0.1:  # 10% VPN usage
+            source_ip = self.ip_generator.generate_vpn_ip(rng) or user.source_ip
         else:
             source_ip = user.source_ip
         
         # Create session
         session = Session(
-            id=str(uuid.uuid4()),
+            id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
             user=user,
             service=service,
             start_time=start_time,
             is_mobile=is_mobile,
             user_agent=user_agent,
-            source_ip=source_ip
+            source_ip=source_ip,
+            intensity=self.intensity,
+            rng=random.Random(rng.getrandbits(64))
         )
         
         return session
     
-    def _get_desktop_user_agent(self) -> str:
+    def _get_desktop_user_agent(self, rng: Optional[random.Random] = None) -> str:
         """Get a desktop user agent string."""
-        agents = [(ua, weight) for ua, weight in self.user_agents if 'Mobile' not in ua]
-        if not agents:
+        if self._desktop_agent_sampler is None:
             return "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0"
         
-        weights = [w for _, w in agents]
-        selected = random.choices([ua for ua, _ in agents], weights=weights)[0]
-        return selected
+        return self._desktop_agent_sampler.draw(rng)
     
-    def _get_mobile_user_agent(self) -> str:
+    def _get_mobile_user_agent(self, rng: Optional[random.Random] = None) -> str:
         """Get a mobile user agent string."""
         mobile_agents = [
             "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) Mobile/15E148",
             "Mozilla/5.0 (Linux; Android 11; Pixel 5) AppleWebKit/537.36 Mobile",
             "Mozilla/5.0 (iPad; CPU OS 15_0 like Mac OS X) Mobile/15E148"
         ]
-        return random.choice(mobile_agents)
+        return (rng or random).choice(mobile_agents)
     
     def generate_hourly_activity(
         self,
         users: List[User],
         hour_start: datetime
-    ) -> Dict[str, List[Session]]:
+    ) -> Dict[User, List[Session]]:
         """
         Generate all activity for all users in an hour.
         
@@ -212,38 +232,64 @@ class ActivityGenerator:
             hour_start: Start of the hour
             
         Returns:
-            Dict mapping user ID to their sessions
+            Dict mapping each active user to their sessions
         """
         hour_end = hour_start + timedelta(hours=1)
         user_sessions = {}
         
-        # Calculate how many users should be active this hour
-        activity_multiplier = get_activity_multiplier(
-            hour_start,
-            timezone=self.enterprise_config.enterprise.get('timezone', 'America/New_York')
-        )
-        
         # Determine active users
-        num_active = int(len(users) * activity_multiplier * random.uniform(0.8, 1.2))
-        active_users = random.sample(users, min(num_active, len(users)))
+        hour_rng = self.streams.stream('active_users', hour_start)
+        num_active = self.active_user_count(len(users), hour_start, hour_rng)
+        active_users = hour_rng.sample(users, num_active)
         
         logger.info(f"Generating activity for {len(active_users)} users at {hour_start}")
         
-        # Generate activity for each active user
+        # Generate activity for each active user from its own (user, hour) stream
         for user in active_users:
-            sessions = self.generate_user_activity(user, hour_start, hour_end)
+            user_rng = self.streams.stream('activity', user.id, hour_start)
+            sessions = self.generate_user_activity(user, hour_start, hour_end, user_rng)
             if sessions:
-                user_sessions[user.id] = sessions
+                user_sessions[user] = sessions
         
         return user_sessions
     
-    def should_generate_junk_traffic(self, user: User, timestamp: datetime) -> bool:
+    def active_user_count(
+        self,
+        user_count: int,
+        hour_start: datetime,
+        rng: Optional[random.Random] = None
+    ) -> int:
+        """
+        Calculate how many users of a population are active in an hour.
+        
+        Args:
+            user_count: Population size
+            hour_start: Start of the hour
+            rng: The hour's 'active_users' stream (a fresh one if omitted)
+            
+        Returns:
+            Number of active users
+        """
+        activity_multiplier = get_activity_multiplier(
+            hour_start,
+            timezone=self.enterprise_config.enterprise.get('timezone', 'America/New_York')
+        )
+        rng = rng or self.streams.stream('active_users', hour_start)
+        return min(int(user_count * activity_multiplier * rng.uniform(0.8, 1.2)), user_count)
+    
+    def should_generate_junk_traffic(
+        self,
+        user: User,
+        timestamp: datetime,
+        rng: Optional[random.Random] = None
+    ) -> bool:
         """
         Determine if a user should generate junk traffic.
         
         Args:
             user: The user
             timestamp: Current time
+            rng: Optional random stream
             
         Returns:
             True if junk traffic should be generated
@@ -260,4 +306,4 @@ class ActivityGenerator:
         elif user.profile.name == "normal":
             junk_probability *= 0.8
         
-        return random.random() < junk_probability
\ No newline at end of file
+        return (rng or random).random() < junk_probability
\ No newline at end of file
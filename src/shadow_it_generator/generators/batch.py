@@ -2,12 +2,15 @@
 
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Optional
 import random
 import yaml
 from ..utils.user_generator import UserGenerator
 from ..utils.ip_generator import IPGenerator
+from ..formatters import FORMATTERS
 from ..formatters.base import LogEvent
-from ..formatters.leef import LEEFFormatter
+from ..formatters.syslog import SyslogFormatter, SyslogFraming
+from ..utils.alias_sampler import AliasSampler
 
 
 class BatchGenerator:
@@ -35,8 +38,8 @@ class BatchGenerator:
             vpn_subnets=network_config.get('vpn_subnets', [])
         )
         
-        # Initialize LEEF formatter
-        self.leef_formatter = LEEFFormatter(output_dir)
+        # HTTP method mix: 85% GET, 10% POST, 3% PUT, 2% DELETE
+        self.method_sampler = AliasSampler(['GET', 'POST', 'PUT', 'DELETE'], [85, 10, 3, 2])
         
         # Generate users from cache
         user_count = self.config['enterprise'].get('total_users', 5000)
@@ -53,13 +56,39 @@ class BatchGenerator:
             with open(yaml_file, 'r') as f:
                 self.services.append(yaml.safe_load(f))
     
-    def generate(self, start_time: datetime, end_time: datetime, format: str = "leef") -> Path:
-        """Generate batch logs for time period."""
+    def generate(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        format: str = "leef",
+        syslog: Optional[str] = None,
+        octet_counting: bool = False
+    ) -> Path:
+        """
+        Generate batch logs for time period.
+        
+        With format "both", each event is written as a LEEF line followed
+        by a CEF line. With syslog ('rfc5424' or 'rfc3164') every line is
+        wrapped in a syslog header built from the logging section of
+        enterprise.yaml.
+        
+        Raises:
+            ValueError: If the format is unknown
+        """
         # Use date-based directory structure
         date_dir = self.output_dir / start_time.strftime('%Y-%m-%d')
         date_dir.mkdir(parents=True, exist_ok=True)
         output_file = date_dir / f"batch_{start_time.strftime('%Y%m%d')}_{end_time.strftime('%Y%m%d')}.log"
         
+        # Formats are written in order into the same file
+        names = ["leef", "cef"] if format == "both" else [format]
+        if any(name not in FORMATTERS for name in names):
+            raise ValueError(f"Unknown log format '{format}'; expected one of {', '.join(FORMATTERS)} or both")
+        formatters = [FORMATTERS[name](self.output_dir) for name in names]
+        if syslog:
+            framing = SyslogFraming.from_config(self.config.get('logging'), syslog, octet_counting)
+            formatters = [SyslogFormatter(formatter, framing) for formatter in formatters]
+        
         print(f"Generating batch logs...")
         print(f"Period: {start_time} to {end_time}")
         
@@ -76,10 +105,8 @@ class BatchGenerator:
                     event_time = current_time + timedelta(seconds=random.randint(0, 300))
                     event = self._generate_event(event_time)
                     
-                    # Use the LEEF formatter
-                    line = self.leef_formatter.format_event(event)
-                    
-                    f.write(line + '\n')
+                    for formatter in formatters:
+                        f.write(formatter.format_event(event) + formatter.line_end)
                     event_count += 1
                 
                 # Move to next 5-minute slot
@@ -114,8 +141,7 @@ class BatchGenerator:
         dest_ip = self.ip_generator.generate_destination_ip(service_ip_ranges)
         
         # Generate request details
-        methods = ['GET'] * 85 + ['POST'] * 10 + ['PUT'] * 3 + ['DELETE'] * 2
-        method = random.choice(methods)
+        method = self.method_sampler.draw()
         
         # Generate bytes transferred
         if method == 'GET':
@@ -8,12 +8,13 @@ part of the main cloud services, adding realism to the log data.
 import json
 import random
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
 from ..utils.numpy_compat import np  # Numpy compatibility layer
 
 from ..formatters.base import LogEvent
 from ..utils.ip_generator import IPGenerator
+from ..utils.alias_sampler import AliasSampler
 
 
 class JunkTrafficGenerator:
@@ -48,6 +49,17 @@ class JunkTrafficGenerator:
         # Pre-calculate category weights
         self.category_weights = list(self.config['categories'].values())
         self.categories = list(self.config['categories'].keys())
+        
+        # Alias tables for category and per-category site selection
+        self._category_sampler = AliasSampler(self.categories, self.category_weights)
+        self._site_samplers = {
+            category: AliasSampler(
+                data['sites'],
+                [site['popularity'] for site in data['sites']]
+            )
+            for category, data in self.junk_sites.items()
+            if data['sites']
+        }
     
     def _load_junk_sites(self) -> Dict[str, Dict[str, Any]]:
         """Load junk sites from data file."""
@@ -58,28 +70,29 @@ class JunkTrafficGenerator:
         
         return data['junk_sites']
     
-    def _select_random_site(self) -> Tuple[str, str]:
+    def _select_random_site(self, rng: Optional[random.Random] = None) -> Tuple[str, str]:
         """
         Select a random site based on category weights.
         
+        Args:
+            rng: Optional random stream (defaults to the global one)
+        
         Returns:
             Tuple of (domain, category)
         """
-        # Select category
-        category = random.choices(self.categories, weights=self.category_weights)[0]
+        rng = rng or random
         
-        # Get sites in category
-        category_data = self.junk_sites[category]
-        sites = category_data['sites']
+        # Select category
+        category = self._category_sampler.draw(rng)
         
         # Select site based on popularity weights
-        site_weights = [site['popularity'] for site in sites]
-        selected_site = random.choices(sites, weights=site_weights)[0]
+        selected_site = self._site_samplers[category].draw(rng)
         
         return selected_site['domain'], category
     
-    def _generate_random_path(self, domain: str, category: str) -> str:
+    def _generate_random_path(self, domain: str, category: str, rng: Optional[random.Random] = None) -> str:
         """Generate a random but plausible path for the domain."""
+        rng = rng or random
         base_paths = {
             'news': [
                 '/article/{id}',
@@ -157,30 +170,30 @@ class JunkTrafficGenerator:
         
         # Get paths for category
         paths = base_paths.get(category, ['/'])
-        path_template = random.choice(paths)
+        path_template = rng.choice(paths)
         
         # Replace placeholders
         replacements = {
-            '{id}': str(random.randint(1000, 999999)),
-            '{year}': str(random.randint(2020, 2024)),
-            '{month}': f"{random.randint(1, 12):02d}",
-            '{category}': random.choice(['tech', 'health', 'finance', 'sports', 'entertainment']),
-            '{title}': f"article-{random.randint(100, 9999)}",
-            '{topic}': random.choice(['python', 'cooking', 'fitness', 'travel', 'history']),
-            '{word}': random.choice(['algorithm', 'pandemic', 'inflation', 'climate', 'innovation']),
-            '{action}': random.choice(['install', 'configure', 'troubleshoot', 'optimize', 'secure']),
-            '{query}': random.choice(['laptop', 'shoes', 'phone', 'book', 'game']),
-            '{name}': random.choice(['electronics', 'clothing', 'home', 'sports', 'toys']),
-            '{sku}': f"SKU{random.randint(100000, 999999)}",
-            '{department}': random.choice(['mens', 'womens', 'kids', 'home', 'garden']),
-            '{event}': random.choice(['summer', 'blackfriday', 'clearance', 'flash', 'weekend']),
-            '{author}': random.choice(['john-doe', 'jane-smith', 'tech-writer', 'news-team']),
-            '{slug}': f"post-{random.randint(100, 9999)}",
-            '{tag}': random.choice(['tutorial', 'news', 'review', 'howto', 'update']),
-            '{username}': f"user{random.randint(1000, 99999)}",
-            '{sport}': random.choice(['nfl', 'nba', 'mlb', 'soccer', 'tennis']),
-            '{location}': random.choice(['new-york', 'los-angeles', 'chicago', 'houston', 'phoenix']),
-            '{team}': random.choice(['patriots', 'lakers', 'yankees', 'cowboys', 'warriors']),
+            '{id}': str(rng.randint(1000, 999999)),
+            '{year}': str(rng.randint(2020, 2024)),
+            '{month}': f"{rng.randint(1, 12):02d}",
+            '{category}': rng.choice(['tech', 'health', 'finance', 'sports', 'entertainment']),
+            '{title}': f"article-{rng.randint(100, 9999)}",
+            '{topic}': rng.choice(['python', 'cooking', 'fitness', 'travel', 'history']),
+            '{word}': rng.choice(['algorithm', 'pandemic', 'inflation', 'climate', 'innovation']),
+            '{action}': rng.choice(['install', 'configure', 'troubleshoot', 'optimize', 'secure']),
+            '{query}': rng.choice(['laptop', 'shoes', 'phone', 'book', 'game']),
+            '{name}': rng.choice(['electronics', 'clothing', 'home', 'sports', 'toys']),
+            '{sku}': f"SKU{rng.randint(100000, 999999)}",
+            '{department}': rng.choice(['mens', 'womens', 'kids', 'home', 'garden']),
+            '{event}': rng.choice(['summer', 'blackfriday', 'clearance', 'flash', 'weekend']),
+            '{author}': rng.choice(['john-doe', 'jane-smith', 'tech-writer', 'news-team']),
+            '{slug}': f"post-{rng.randint(100, 9999)}",
+            '{tag}': rng.choice(['tutorial', 'news', 'review', 'howto', 'update']),
+            '{username}': f"user{rng.randint(1000, 99999)}",
+            '{sport}': rng.choice(['nfl', 'nba', 'mlb', 'soccer', 'tennis']),
+            '{location}': rng.choice(['new-york', 'los-angeles', 'chicago', 'houston', 'phoenix']),
+            '{team}': rng.choice(['patriots', 'lakers', 'yankees', 'cowboys', 'warriors']),
             '{route}': 'from-here-to-there'
         }
         
@@ -189,10 +202,11 @@ class JunkTrafficGenerator:
         
         return path_template
     
-    def _determine_action(self, category: str) -> str:
+    def _determine_action(self, category: str, rng: Optional[random.Random] = None) -> str:
         """Determine if the request is allowed or blocked based on category."""
+        rng = rng or random
         category_data = self.junk_sites[category]
-        if random.random() < category_data['allowed_rate']:
+        if rng.random() < category_data['allowed_rate']:
             return 'allowed'
         else:
             return 'blocked'
@@ -202,7 +216,8 @@ class JunkTrafficGenerator:
         user_email: str,
         source_ip: str,
         timestamp: datetime,
-        user_agent: str
+        user_agent: str,
+        rng: Optional[random.Random] = None
     ) -> LogEvent:
         """
         Generate a single junk traffic event.
@@ -212,18 +227,21 @@ class JunkTrafficGenerator:
             source_ip: Source IP address
             timestamp: Event timestamp
             user_agent: User agent string
+            rng: Optional random stream (defaults to the global one)
             
         Returns:
             LogEvent for junk traffic
         """
+        rng = rng or random
+        
         # Select random site
-        domain, category = self._select_random_site()
+        domain, category = self._select_random_site(rng)
         
         # Generate path
-        path = self._generate_random_path(domain, category)
+        path = self._generate_random_path(domain, category, rng)
         
         # Determine action based on category
-        action = self._determine_action(category)
+        action = self._determine_action(category, rng)
         
         # Generate realistic response sizes
         if action == 'allowed':
@@ -237,16 +255,16 @@ class JunkTrafficGenerator:
                 'misc': (1000, 20000)
             }
             min_size, max_size = size_ranges.get(category, (1000, 20000))
-            bytes_received = random.randint(min_size, max_size)
-            bytes_sent = random.randint(300, 2000)
-            status_code = random.choices([200, 304], weights=[0.8, 0.2])[0]
-            duration_ms = random.randint(50, 500)
+            bytes_received = rng.randint(min_size, max_size)
+            bytes_sent = rng.randint(300, 2000)
+            status_code = rng.choices([200, 304], weights=[0.8, 0.2])[0]
+            duration_ms = rng.randint(50, 500)
         else:
             # Blocked requests
             bytes_received = 0
-            bytes_sent = random.randint(100, 500)
+            bytes_sent = rng.randint(100, 500)
             status_code = 403
-            duration_ms = random.randint(10, 50)
+            duration_ms = rng.randint(10, 50)
         
         # Determine risk level based on category and action
         if action == 'blocked':
@@ -260,19 +278,19 @@ class JunkTrafficGenerator:
         return LogEvent(
             timestamp=timestamp,
             source_ip=source_ip,
-            destination_ip=self.ip_generator.generate_destination_ip(),
-            source_port=self.ip_generator.generate_source_port(),
-            destination_port=443 if 'https://' in domain or random.random() > 0.1 else 80,
+            destination_ip=self.ip_generator.generate_destination_ip(rng=rng),
+            source_port=self.ip_generator.generate_source_port(rng=rng),
+            destination_port=443 if 'https://' in domain or rng.random() > 0.1 else 80,
             username=user_email.split('@')[0],
             user_domain=self.enterprise_domain,
             url=f"https://{domain}{path}",
-            method='GET' if random.random() > 0.1 else 'POST',
+            method='GET' if rng.random() > 0.1 else 'POST',
             status_code=status_code,
             bytes_sent=bytes_sent,
             bytes_received=bytes_received,
             duration_ms=duration_ms,
             user_agent=user_agent,
-            referrer=f"https://{domain}/" if random.random() > 0.5 else None,
+            referrer=f"https://{domain}/" if rng.random() > 0.5 else None,
             action=action,
             category=category_name,
             risk_level=risk_level,
@@ -303,7 +321,8 @@ class JunkTrafficGenerator:
         source_ip: str,
         start_time: datetime,
         end_time: datetime,
-        user_agent: str
+        user_agent: str,
+        rng: Optional[random.Random] = None
     ) -> List[LogEvent]:
         """
         Generate junk traffic events for a user during a time period.
@@ -314,10 +333,12 @@ class JunkTrafficGenerator:
             start_time: Start of time period
             end_time: End of time period
             user_agent: User agent string
+            rng: Optional random stream (defaults to the global one)
             
         Returns:
             List of junk traffic events
         """
+        rng = rng or random
         events = []
         
         # Calculate number of events based on configuration
@@ -326,21 +347,22 @@ class JunkTrafficGenerator:
         std_per_day = self.config['requests_per_user_per_day']['std_dev']
         
         # Calculate events for this time period
-        events_per_hour = max(1, int(np.random.normal(mean_per_day / 24, std_per_day / 24)))
+        events_per_hour = max(1, int(np.random.default_rng(rng).normal(mean_per_day / 24, std_per_day / 24)))
         total_events = int(events_per_hour * duration_hours)
         
         # Generate events spread across the time period
         for _ in range(total_events):
             # Random timestamp within the period
-            time_offset = random.uniform(0, (end_time - start_time).total_seconds())
-            event_time = start_time + datetime.timedelta(seconds=time_offset)
+            time_offset = rng.uniform(0, (end_time - start_time).total_seconds())
+            event_time = start_time + timedelta(seconds=time_offset)
             
             # Generate event
             event = self.generate_junk_event(
                 user_email=user_email,
                 source_ip=source_ip,
                 timestamp=event_time,
-                user_agent=user_agent
+                user_agent=user_agent,
+                rng=rng
             )
             events.append(event)
         
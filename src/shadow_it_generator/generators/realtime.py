@@ -4,22 +4,35 @@ from pathlib import Path
 import time
 import signal
 from datetime import datetime, timedelta
+from typing import Optional
 import random
 import yaml
 import json
 from ..utils.user_generator import UserGenerator
 from ..utils.ip_generator import IPGenerator
+from ..formatters import FORMATTERS
 from ..formatters.base import LogEvent
-from ..formatters.leef import LEEFFormatter
+from ..formatters.flush import FlushPolicy, FlushTracker, REALTIME_FLUSH_POLICY
+from ..formatters.syslog import SyslogFormatter, SyslogFraming
 
 
 class RealtimeGenerator:
     """Simplified real-time generator for CLI."""
     
-    def __init__(self, config_dir: Path, output_dir: Path, speed_multiplier: float = 1.0):
+    def __init__(
+        self,
+        config_dir: Path,
+        output_dir: Path,
+        speed_multiplier: float = 1.0,
+        flush_policy: FlushPolicy = REALTIME_FLUSH_POLICY,
+        log_format: str = "leef",
+        syslog: Optional[str] = None,
+        octet_counting: bool = False
+    ):
         self.config_dir = config_dir
         self.output_dir = output_dir
         self.speed_multiplier = speed_multiplier
+        self.flush_policy = flush_policy
         self.running = False
         
         # Load configuration
@@ -40,8 +53,16 @@ class RealtimeGenerator:
             vpn_subnets=network_config.get('vpn_subnets', [])
         )
         
-        # Initialize LEEF formatter
-        self.leef_formatter = LEEFFormatter(output_dir)
+        # With "both", each event is written as a LEEF line followed by a CEF line
+        names = ["leef", "cef"] if log_format == "both" else [log_format]
+        if any(name not in FORMATTERS for name in names):
+            raise ValueError(f"Unknown log format '{log_format}'; expected one of {', '.join(FORMATTERS)} or both")
+        self.formatters = [FORMATTERS[name](output_dir) for name in names]
+        
+        # Optional syslog header ('rfc5424' or 'rfc3164') from the logging section
+        if syslog:
+            framing = SyslogFraming.from_config(self.config.get('logging'), syslog, octet_counting)
+            self.formatters = [SyslogFormatter(formatter, framing) for formatter in self.formatters]
         
         # Generate a pool of users matching enterprise configuration
         user_count = self.config['enterprise'].get('total_users', 5000)
@@ -114,6 +135,7 @@ class RealtimeGenerator:
         
         current_hour = today.hour
         f = open(output_file, 'a')
+        flush_tracker = FlushTracker(self.flush_policy)
         
         try:
             event_count = 0
@@ -129,6 +151,7 @@ class RealtimeGenerator:
                 # Check if hour changed (rotate log file)
                 if current_time.hour != current_hour:
                     f.close()
+                    flush_tracker.reset()
                     date_dir = self.output_dir / current_time.strftime('%Y-%m-%d')
                     date_dir.mkdir(parents=True, exist_ok=True)
                     output_file = date_dir / f"traffic_{current_time.strftime('%Y-%m-%d_%H')}.log"
@@ -139,20 +162,25 @@ class RealtimeGenerator:
                 # Generate some events
                 timestamp = current_time
                 events_per_cycle = random.randint(1, 5)
+                written = 0
                 
                 for _ in range(events_per_cycle):
                     event = self._generate_event(timestamp)
-                    leef_line = self.leef_formatter.format_event(event)
                     
                     if display_mode in ["console", "both"]:
                         print(f"[{timestamp.strftime('%H:%M:%S')}] {event.username} -> {event.service_name} ({event.source_ip})")
                     
                     if display_mode in ["file", "both"]:
-                        f.write(leef_line + '\n')
-                        f.flush()
+                        for formatter in self.formatters:
+                            written += f.write(formatter.format_event(event) + formatter.line_end)
                     
                     event_count += 1
                 
+                # Flush once per cycle at most, as the flush policy allows
+                if written and flush_tracker.wrote(events_per_cycle, written):
+                    f.flush()
+                    flush_tracker.reset()
+                
                 # Show stats periodically
                 if event_count % 50 == 0:
                     elapsed = time.time() - start_time
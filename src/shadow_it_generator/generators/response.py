@@ -8,6 +8,8 @@ import random
 from typing import Dict, Tuple, Optional
 from enum import Enum
 
+from ..utils.alias_sampler import AliasSampler
+
 
 class FileType(Enum):
     """Common file types for web requests."""
@@ -47,6 +49,9 @@ class ResponseGenerator:
             404: 0.01,  # Not Found
         }
         
+        # Status code samplers, built on first use for each method
+        self._status_samplers: Dict[str, AliasSampler] = {}
+        
         # File type detection patterns
         self.file_extensions = {
             '.html': FileType.HTML,
@@ -120,6 +125,20 @@ class ResponseGenerator:
         Returns:
             HTTP status code
         """
+        sampler = self._status_samplers.get(method)
+        if sampler is None:
+            sampler = self._status_samplers[method] = self._build_status_sampler(method)
+        return sampler.draw()
+    
+    def _build_status_sampler(self, method: str) -> AliasSampler:
+        """Build the status code distribution for an HTTP method.
+        
+        Args:
+            method: HTTP method
+            
+        Returns:
+            Sampler over status codes
+        """
         # Adjust weights based on method
         weights = self.allowed_status_weights.copy()
         
@@ -133,15 +152,8 @@ class ResponseGenerator:
             weights[200] = 0.95
             weights[404] = 0.05
         
-        # Select status code
-        codes = list(weights.keys())
-        probabilities = list(weights.values())
-        
-        # Normalize probabilities
-        total = sum(probabilities)
-        probabilities = [p/total for p in probabilities]
-        
-        return random.choices(codes, weights=probabilities)[0]
+        # The sampler normalizes the weights itself
+        return AliasSampler(list(weights.keys()), list(weights.values()))
     
     def _detect_file_type(self, url: str, is_api: bool) -> FileType:
         """Detect file type from URL.
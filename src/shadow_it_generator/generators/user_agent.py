@@ -4,10 +4,11 @@ This module handles generation and management of user agent strings
 for simulating different browsers and devices.
 """
 
-import random
 from typing import List, Dict
 from dataclasses import dataclass
 
+from ..utils.alias_sampler import AliasSampler
+
 
 @dataclass
 class UserAgentConfig:
@@ -45,6 +46,11 @@ class UserAgentGenerator:
         for config in self.configs:
             config.weight = config.weight / self.total_weight
         
+        # Weighted selection table over the configs
+        self.config_sampler = AliasSampler(
+            self.configs, [config.weight for config in self.configs]
+        ) if self.configs else None
+        
         # User assignments for consistency
         self.user_assignments = {}
     
@@ -109,8 +115,7 @@ class UserAgentGenerator:
             return self.user_assignments[user_id]
         
         # Select based on weights
-        weights = [config.weight for config in self.configs]
-        selected = random.choices(self.configs, weights=weights)[0]
+        selected = self.config_sampler.draw()
         
         # Store assignment if user_id provided
         if user_id:
@@ -12,6 +12,9 @@ from typing import Optional
 
 from .core.engine import LogGenerationEngine
 from .config.parser import ConfigParser
+from .formatters.flush import FlushPolicy
+from .formatters.syslog import SYSLOG_PROTOCOLS, SyslogFraming
+from .utils.compression import DEFAULT_GZIP_LEVEL
 from .utils.logger import setup_logging
 
 
@@ -36,9 +39,10 @@ from .utils.logger import setup_logging
 )
 @click.option(
     '--format', '-f',
-    type=click.Choice(['leef', 'cef', 'both']),
+    type=click.Choice(['leef', 'cef', 'json', 'splunk', 'both', 'parquet', 'arrow']),
     default='leef',
-    help='Output log format'
+    envvar='SKYHIGH_LOG_FORMAT',
+    help='Output log format (json = NDJSON; both = LEEF and CEF; parquet/arrow = hourly columnar files, needs pyarrow; env: SKYHIGH_LOG_FORMAT)'
 )
 @click.option(
     '--start-date',
@@ -50,6 +54,77 @@ from .utils.logger import setup_logging
     type=click.DateTime(),
     help='End date for log generation (default: now)'
 )
+@click.option(
+    '--workers', '-w',
+    type=click.IntRange(min=0),
+    default=1,
+    help='Worker processes for batch generation (0 = one per CPU)'
+)
+@click.option(
+    '--seed',
+    type=int,
+    help='Random seed for reproducible output (default: random)'
+)
+@click.option(
+    '--events',
+    type=click.IntRange(min=1),
+    help='Target total number of events; request intensity is calibrated to hit it'
+)
+@click.option(
+    '--eps-target',
+    type=click.FloatRange(min=0, min_open=True),
+    help='Target events per second over the date range (instead of --events)'
+)
+@click.option(
+    '--events-per-minute',
+    type=click.FloatRange(min=0, min_open=True),
+    envvar='SKYHIGH_EVENTS_PER_MINUTE',
+    help='Target events per minute (env: SKYHIGH_EVENTS_PER_MINUTE)'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Resume the interrupted run checkpointed in the output directory'
+)
+@click.option(
+    '--append-until',
+    type=click.DateTime(),
+    help='Extend the dataset in the output directory up to this date, generating only the missing days'
+)
+@click.option(
+    '--stats',
+    is_flag=True,
+    help='Time each generation stage and write generation_stats.json to the output directory'
+)
+@click.option(
+    '--flush-policy',
+    help='When output files are flushed: never (default), events:N, bytes:N or ms:T'
+)
+@click.option(
+    '--syslog',
+    type=click.Choice(SYSLOG_PROTOCOLS),
+    help='Wrap each line in a syslog header; priority, hostname and app name come from the logging section of the enterprise config'
+)
+@click.option(
+    '--octet-counting',
+    is_flag=True,
+    help='Write syslog messages as RFC 6587 octet-counted frames (length prefix, no newlines) for TCP; requires --syslog'
+)
+@click.option(
+    '--background-writes',
+    is_flag=True,
+    help='Write output files on a background thread while the next hour is generated (line formats only)'
+)
+@click.option(
+    '--gzip',
+    is_flag=True,
+    help='Write gzip-compressed .log.gz files as events are generated (line formats only)'
+)
+@click.option(
+    '--gzip-level',
+    type=click.IntRange(0, 9),
+    help=f'gzip compression level, 0-9 (default: {DEFAULT_GZIP_LEVEL}); requires --gzip'
+)
 @click.option(
     '--verbose', '-v',
     is_flag=True,
@@ -62,6 +137,20 @@ def main(
     format: str,
     start_date: Optional[click.DateTime],
     end_date: Optional[click.DateTime],
+    workers: int,
+    seed: Optional[int],
+    events: Optional[int],
+    eps_target: Optional[float],
+    events_per_minute: Optional[float],
+    resume: bool,
+    append_until: Optional[click.DateTime],
+    stats: bool,
+    flush_policy: Optional[str],
+    syslog: Optional[str],
+    octet_counting: bool,
+    background_writes: bool,
+    gzip: bool,
+    gzip_level: Optional[int],
     verbose: bool
 ) -> None:
     """
@@ -74,11 +163,27 @@ def main(
     # Setup logging
     setup_logging(verbose)
     
+    if events and eps_target:
+        raise click.UsageError("--events and --eps-target are mutually exclusive")
+    if eps_target:
+        events_per_minute = eps_target * 60
+    if octet_counting and not syslog:
+        raise click.UsageError("--octet-counting requires --syslog")
+    if gzip_level is not None and not gzip:
+        raise click.UsageError("--gzip-level requires --gzip")
+    if gzip and gzip_level is None:
+        gzip_level = DEFAULT_GZIP_LEVEL
+    try:
+        policy = FlushPolicy.parse(flush_policy) if flush_policy else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--flush-policy')
+    
     try:
         # Parse configurations
         config_parser = ConfigParser()
         enterprise_conf = config_parser.parse_enterprise_config(enterprise_config)
         services = config_parser.parse_services_directory(services_dir)
+        framing = SyslogFraming.from_config(enterprise_conf.logging, syslog, octet_counting) if syslog else None
         
         # Create output directory
         output.mkdir(parents=True, exist_ok=True)
@@ -90,7 +195,18 @@ def main(
             output_dir=output,
             log_format=format,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            workers=workers,
+            seed=seed,
+            target_events=events,
+            events_per_minute=events_per_minute,
+            resume=resume,
+            append_until=append_until,
+            collect_stats=stats,
+            flush_policy=policy,
+            syslog=framing,
+            background_writes=background_writes,
+            gzip_level=gzip_level
         )
         
         click.echo("Starting log generation...")
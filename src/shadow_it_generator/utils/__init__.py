@@ -7,8 +7,12 @@ throughout the application.
 
 from .logger import setup_logging
 from .ip_generator import IPGenerator
+from .random_streams import RandomStreams
+from .alias_sampler import AliasSampler
 
 __all__ = [
     "setup_logging",
     "IPGenerator",
+    "RandomStreams",
+    "AliasSampler",
 ]
\ No newline at end of file
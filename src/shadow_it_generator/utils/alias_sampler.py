@@ -0,0 +1,116 @@
+"""
+Weighted sampling with Walker/Vose alias tables.
+
+``random.choices`` with weights rebuilds a cumulative table and bisects
+it on every call. For distributions that are sampled over and over
+(actions, user agents, junk sites, status codes) an alias table is built
+once and each draw then costs a single uniform number and O(1) work.
+"""
+
+from typing import Any, List, Optional, Sequence
+import random
+
+
+class AliasSampler:
+    """
+    Weighted sampler over a fixed list of items (Vose's alias method).
+
+    Build it once per distribution and keep it on the owning object;
+    ``draw()`` and ``sample()`` then take an optional ``rng`` so callers
+    can draw from their own stream.
+    """
+
+    def __init__(self, items: Sequence[Any], weights: Optional[Sequence[float]] = None):
+        """
+        Build the alias table.
+
+        Args:
+            items: Items to draw from
+            weights: Relative weights, one per item (uniform when omitted)
+
+        Raises:
+            ValueError: If there are no items, the lengths differ, or the
+                weights are negative or sum to zero
+        """
+        if not items:
+            raise ValueError("AliasSampler needs at least one item")
+        if weights is None:
+            weights = [1.0] * len(items)
+        if len(weights) != len(items):
+            raise ValueError("AliasSampler needs exactly one weight per item")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("AliasSampler weights must not be negative")
+
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("AliasSampler weights must sum to a positive value")
+
+        count = len(items)
+        self.items: List[Any] = list(items)
+        self._count = count
+        self._prob = [0.0] * count
+        self._alias = list(range(count))
+
+        # Scale so the average bucket holds exactly 1.0
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is full up to rounding error
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def draw(self, rng: Optional[random.Random] = None) -> Any:
+        """
+        Draw one item.
+
+        Args:
+            rng: Optional random stream (defaults to the global one)
+
+        Returns:
+            The selected item
+        """
+        # One uniform picks the bucket (integer part) and the coin (fraction)
+        x = (rng or random).random() * self._count
+        i = int(x)
+        if x - i < self._prob[i]:
+            return self.items[i]
+        return self.items[self._alias[i]]
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[Any]:
+        """
+        Draw k items with replacement.
+
+        Args:
+            k: Number of items to draw
+            rng: Optional random stream (defaults to the global one)
+
+        Returns:
+            List of selected items
+        """
+        uniform = (rng or random).random
+        count = self._count
+        prob = self._prob
+        alias = self._alias
+        items = self.items
+
+        result = []
+        for _ in range(k):
+            x = uniform() * count
+            i = int(x)
+            result.append(items[i] if x - i < prob[i] else items[alias[i]])
+        return result
@@ -0,0 +1,45 @@
+"""
+Streaming gzip output.
+
+Log files are compressed as they are written instead of being re-read
+and compressed after rotation. Appending to a gzip file starts a new
+gzip member; ``zcat`` and ``gzip.open`` read a file of several members
+as one stream, so a file can be closed and reopened for appending (at a
+checkpoint, on resume, when shards are merged) at no cost beyond a
+member header.
+
+A flush ends the current deflate block with a sync flush, so everything
+written so far can be read back by ``zcat`` while the file is still open
+(zcat then reports the missing end of the member, which is expected).
+"""
+
+import gzip
+from pathlib import Path
+from typing import Union
+
+
+GZIP_SUFFIX = '.gz'
+
+# zlib's default trade-off; 1 is fastest, 9 smallest
+DEFAULT_GZIP_LEVEL = 6
+
+
+def open_gzip(path: Union[str, Path], level: int = DEFAULT_GZIP_LEVEL) -> gzip.GzipFile:
+    """Open a gzip file for appending a new member.
+
+    The member header carries no modification time, so the same data
+    compressed at the same level gives the same bytes on every run.
+
+    Args:
+        path: File to append to (created if missing)
+        level: Compression level, 0-9
+
+    Returns:
+        Binary file object; closing it ends the member and closes the file
+
+    Raises:
+        ValueError: If the level is out of range
+    """
+    if not 0 <= level <= 9:
+        raise ValueError(f"gzip level must be between 0 and 9, not {level}")
+    return gzip.GzipFile(filename=str(path), mode='ab', compresslevel=level, mtime=0)
@@ -4,13 +4,14 @@ This module provides utilities for writing log files with rotation
 and compression support.
 """
 
-import gzip
-import os
+import io
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Union
 import logging
 
+from .compression import DEFAULT_GZIP_LEVEL, GZIP_SUFFIX, open_gzip
+
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ class FileHandler:
     
     This class manages writing log entries to files with support for:
     - Time-based rotation (hourly, daily)
-    - Automatic compression
+    - Streaming gzip compression (files are compressed as they are written)
     - Directory structure creation
     """
     
@@ -28,19 +29,22 @@ class FileHandler:
                  output_dir: Path,
                  file_pattern: str,
                  rotation: str = 'hourly',
-                 compress: bool = False):
+                 compress: bool = False,
+                 compress_level: int = DEFAULT_GZIP_LEVEL):
         """Initialize the file handler.
         
         Args:
             output_dir: Base output directory
             file_pattern: File naming pattern with placeholders
             rotation: Rotation strategy ('hourly' or 'daily')
-            compress: Whether to compress files
+            compress: Write gzip-compressed files (with a .gz suffix)
+            compress_level: gzip compression level, 0-9
         """
         self.output_dir = Path(output_dir)
         self.file_pattern = file_pattern
         self.rotation = rotation
         self.compress = compress
+        self.compress_level = compress_level
         self.current_file = None
         self.current_path = None
         self.current_hour = None
@@ -68,7 +72,7 @@ class FileHandler:
         self.current_file.write(log_entry + '\n')
         self.entries_written += 1
         
-        # Flush periodically
+        # Flush periodically (a gzip sync flush keeps the file readable by zcat)
         if self.entries_written % 1000 == 0:
             self.current_file.flush()
     
@@ -93,6 +97,8 @@ class FileHandler:
         file_name = self.file_pattern
         for placeholder, value in replacements.items():
             file_name = file_name.replace(placeholder, value)
+        if self.compress:
+            file_name += GZIP_SUFFIX
         
         return self.output_dir / file_name
     
@@ -120,12 +126,9 @@ class FileHandler:
     def _rotate_file(self):
         """Rotate the current file."""
         if self.current_file:
+            # Closing a compressed file ends its gzip member
             self.current_file.close()
             
-            # Compress if configured
-            if self.compress and self.current_path:
-                self._compress_file(self.current_path)
-            
             logger.info(f"Rotated log file: {self.current_path} "
                        f"({self.entries_written} entries)")
         
@@ -144,32 +147,15 @@ class FileHandler:
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Open file
-        self.current_file = open(file_path, 'a', encoding='utf-8')
+        if self.compress:
+            self.current_file = io.TextIOWrapper(open_gzip(file_path, self.compress_level), encoding='utf-8')
+        else:
+            self.current_file = open(file_path, 'a', encoding='utf-8')
         self.current_path = file_path
         self.current_hour = datetime.now().hour
         
         logger.info(f"Opened log file: {file_path}")
     
-    def _compress_file(self, file_path: Path):
-        """Compress a log file using gzip.
-        
-        Args:
-            file_path: Path to file to compress
-        """
-        compressed_path = file_path.with_suffix(file_path.suffix + '.gz')
-        
-        try:
-            with open(file_path, 'rb') as f_in:
-                with gzip.open(compressed_path, 'wb') as f_out:
-                    f_out.writelines(f_in)
-            
-            # Remove original file
-            os.remove(file_path)
-            logger.info(f"Compressed log file: {compressed_path}")
-            
-        except Exception as e:
-            logger.error(f"Failed to compress {file_path}: {e}")
-    
     def close(self):
         """Close the file handler and perform final rotation."""
         if self.current_file:
@@ -46,26 +46,28 @@ class IPGenerator:
             ipaddress.ip_network("142.250.0.0/15"),   # Google
         ]
     
-    def generate_internal_ip(self, exclude_servers: bool = True) -> str:
+    def generate_internal_ip(self, exclude_servers: bool = True, rng: Optional[random.Random] = None) -> str:
         """
         Generate a random internal IP address.
         
         Args:
             exclude_servers: If True, avoid .1-.10 addresses (typically servers)
+            rng: Optional random stream (defaults to the global one)
             
         Returns:
             Internal IP address as string
         """
-        network = random.choice(self.internal_networks)
+        rng = rng or random
+        network = rng.choice(self.internal_networks)
         
         # Generate random host within the network
         if network.num_addresses > 2:
             if exclude_servers:
                 # Skip first 10 and last address
-                host_offset = random.randint(11, network.num_addresses - 2)
+                host_offset = rng.randint(11, network.num_addresses - 2)
             else:
                 # Skip network and broadcast addresses
-                host_offset = random.randint(1, network.num_addresses - 2)
+                host_offset = rng.randint(1, network.num_addresses - 2)
             
             ip = network.network_address + host_offset
             return str(ip)
@@ -73,19 +75,23 @@ class IPGenerator:
             # Small network, just return first usable
             return str(list(network.hosts())[0])
     
-    def generate_vpn_ip(self) -> Optional[str]:
+    def generate_vpn_ip(self, rng: Optional[random.Random] = None) -> Optional[str]:
         """
         Generate a VPN IP address if VPN subnets are configured.
         
+        Args:
+            rng: Optional random stream (defaults to the global one)
+            
         Returns:
             VPN IP address or None if no VPN configured
         """
         if not self.vpn_networks:
             return None
             
-        network = random.choice(self.vpn_networks)
+        rng = rng or random
+        network = rng.choice(self.vpn_networks)
         if network.num_addresses > 2:
-            host_offset = random.randint(1, network.num_addresses - 2)
+            host_offset = rng.randint(1, network.num_addresses - 2)
             ip = network.network_address + host_offset
             return str(ip)
         else:
@@ -106,49 +112,57 @@ class IPGenerator:
         else:
             return str(random.choice(self.egress_ips))
     
-    def generate_destination_ip(self, service_ip_ranges: Optional[List[str]] = None) -> str:
+    def generate_destination_ip(
+        self,
+        service_ip_ranges: Optional[List[str]] = None,
+        rng: Optional[random.Random] = None
+    ) -> str:
         """
         Generate a destination IP address for a cloud service.
         
         Args:
             service_ip_ranges: Optional specific IP ranges for the service
+            rng: Optional random stream (defaults to the global one)
             
         Returns:
             Destination IP address as string
         """
+        rng = rng or random
         if service_ip_ranges:
             # Use service-specific ranges
-            ip_range = random.choice(service_ip_ranges)
+            ip_range = rng.choice(service_ip_ranges)
             network = ipaddress.ip_network(ip_range)
             
             if network.num_addresses > 2:
-                host_offset = random.randint(1, network.num_addresses - 2)
+                host_offset = rng.randint(1, network.num_addresses - 2)
                 ip = network.network_address + host_offset
                 return str(ip)
             else:
                 return str(network.network_address)
         else:
             # Use CDN ranges
-            network = random.choice(self.cdn_ranges)
-            host_offset = random.randint(1, min(1000, network.num_addresses - 2))
+            network = rng.choice(self.cdn_ranges)
+            host_offset = rng.randint(1, min(1000, network.num_addresses - 2))
             ip = network.network_address + host_offset
             return str(ip)
     
-    def generate_source_port(self, privileged: bool = False) -> int:
+    def generate_source_port(self, privileged: bool = False, rng: Optional[random.Random] = None) -> int:
         """
         Generate a source port number.
         
         Args:
             privileged: If True, can return privileged ports (< 1024)
+            rng: Optional random stream (defaults to the global one)
             
         Returns:
             Port number
         """
-        if privileged and random.random() < 0.05:  # 5% chance of privileged
-            return random.randint(1, 1023)
+        rng = rng or random
+        if privileged and rng.random() < 0.05:  # 5% chance of privileged
+            return rng.randint(1, 1023)
         else:
             # Ephemeral port range
-            return random.randint(32768, 65535)
+            return rng.randint(32768, 65535)
     
     def get_destination_port(self, protocol: str = "https") -> int:
         """
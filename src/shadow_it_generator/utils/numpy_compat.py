@@ -2,29 +2,31 @@
 Numpy compatibility layer for testing without numpy.
 
 Provides simple replacements for numpy functions used in the codebase.
+Every sampling function accepts an optional ``rng`` (a ``random.Random``)
+so callers can draw from a dedicated stream instead of the global state.
 """
 
 import random
 import math
 
 
-def normal(mean, std):
+def normal(mean, std, rng=random):
     """Simple normal distribution using Box-Muller transform."""
-    u1 = random.random()
-    u2 = random.random()
+    u1 = 1.0 - rng.random()  # (0, 1] so log() is always defined
+    u2 = rng.random()
     z0 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
     return mean + z0 * std
 
 
-def exponential(scale):
+def exponential(scale, rng=random):
     """Simple exponential distribution."""
-    return -scale * math.log(random.random())
+    return -scale * math.log(1.0 - rng.random())
 
 
-def gamma(shape, scale):
+def gamma(shape, scale, rng=random):
     """Simple gamma distribution approximation."""
     # Very basic approximation for testing
-    return max(0, normal(shape * scale, math.sqrt(shape) * scale))
+    return max(0, normal(shape * scale, math.sqrt(shape) * scale, rng))
 
 
 def exp(x):
@@ -37,20 +39,22 @@ def array(lst):
     return lst
 
 
-def choice(lst, size=1, replace=True, p=None):
-    """Simple weighted choice."""
+def choice(lst, size=None, replace=True, p=None, rng=random):
+    """Simple weighted choice (a single item when size is None, else a list)."""
     if p is None:
-        if size == 1:
-            return random.choice(lst)
-        return random.choices(lst, k=size)
+        if size is None:
+            return rng.choice(lst)
+        if replace:
+            return rng.choices(lst, k=size)
+        return rng.sample(list(lst), size)
     else:
         # Normalize probabilities
         total = sum(p)
         probs = [x/total for x in p]
-        if size == 1:
-            return random.choices(lst, weights=probs, k=1)[0]
+        if size is None:
+            return rng.choices(lst, weights=probs, k=1)[0]
         if replace:
-            return random.choices(lst, weights=probs, k=size)
+            return rng.choices(lst, weights=probs, k=size)
         else:
             # Simple non-replacement sampling
             result = []
@@ -59,19 +63,61 @@ def choice(lst, size=1, replace=True, p=None):
                 if not available:
                     break
                 choices, weights = zip(*available)
-                idx = random.choices(range(len(choices)), weights=weights, k=1)[0]
+                idx = rng.choices(range(len(choices)), weights=weights, k=1)[0]
                 result.append(choices[idx])
                 available.pop(idx)
             return result
 
 
+class Generator:
+    """
+    Minimal stand-in for ``numpy.random.Generator``.
+
+    Wraps a ``random.Random`` (or the ``random`` module itself) so the
+    distribution helpers above draw from that source.
+    """
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def random(self):
+        return self.rng.random()
+
+    def normal(self, loc, scale):
+        return normal(loc, scale, self.rng)
+
+    def exponential(self, scale):
+        return exponential(scale, self.rng)
+
+    def gamma(self, shape, scale):
+        return gamma(shape, scale, self.rng)
+
+    def choice(self, a, size=None, replace=True, p=None):
+        return choice(a, size=size, replace=replace, p=p, rng=self.rng)
+
+
+def default_rng(seed=None):
+    """
+    Create a Generator, mirroring ``numpy.random.default_rng``.
+
+    Args:
+        seed: An int seed, None for fresh entropy, or an existing
+            ``random.Random``/``random`` module to wrap
+    """
+    if seed is None or isinstance(seed, int):
+        return Generator(random.Random(seed))
+    return Generator(seed)
+
+
 # Create a namespace object to mimic numpy
 class np:
     random = type('random', (), {
-        'normal': normal,
-        'exponential': exponential,
-        'gamma': gamma,
-        'choice': choice
+        'normal': staticmethod(normal),
+        'exponential': staticmethod(exponential),
+        'gamma': staticmethod(gamma),
+        'choice': staticmethod(choice),
+        'default_rng': staticmethod(default_rng),
+        'Generator': Generator
     })()
     exp = exp
-    array = array
\ No newline at end of file
+    array = array
@@ -192,7 +192,8 @@ def distribute_events_naturally(
     start_time: datetime,
     end_time: datetime,
     num_events: int,
-    burst_probability: float = 0.2
+    burst_probability: float = 0.2,
+    rng: Optional[random.Random] = None
 ) -> List[datetime]:
     """
     Distribute events naturally over a time period.
@@ -205,6 +206,7 @@ def distribute_events_naturally(
         end_time: End of period  
         num_events: Number of events to generate
         burst_probability: Probability of burst behavior
+        rng: Optional random stream (defaults to the global one)
         
     Returns:
         List of event timestamps
@@ -212,28 +214,31 @@ def distribute_events_naturally(
     if num_events == 0:
         return []
     
+    rng = rng or random
+    gen = np.random.default_rng(rng)
+    
     events = []
     duration = (end_time - start_time).total_seconds()
     
     if num_events == 1:
         # Single event at random time
-        offset = random.uniform(0, duration)
+        offset = rng.uniform(0, duration)
         events.append(start_time + timedelta(seconds=offset))
         return events
     
     # Decide if this is a burst pattern
-    if random.random() < burst_probability:
+    if rng.random() < burst_probability:
         # Burst pattern - events clustered together
-        num_bursts = random.randint(1, min(3, num_events // 3))
+        num_bursts = rng.randint(1, max(1, min(3, num_events // 3)))
         
         for i in range(num_bursts):
             # Random position for burst center
-            burst_center = random.uniform(0.1, 0.9) * duration
+            burst_center = rng.uniform(0.1, 0.9) * duration
             burst_size = num_events // num_bursts
             
             # Events around burst center with normal distribution
             for j in range(burst_size):
-                offset = np.random.normal(0, duration * 0.05)  # 5% std dev
+                offset = gen.normal(0, duration * 0.05)  # 5% std dev
                 event_time = start_time + timedelta(seconds=burst_center + offset)
                 
                 # Ensure within bounds
@@ -246,11 +251,11 @@ def distribute_events_naturally(
         current_time = start_time
         for i in range(num_events):
             # Add some randomness to interval
-            interval = np.random.exponential(base_interval)
+            interval = gen.exponential(base_interval)
             current_time += timedelta(seconds=interval)
             
             if current_time > end_time:
-                current_time = end_time - timedelta(seconds=random.uniform(0, 60))
+                current_time = end_time - timedelta(seconds=rng.uniform(0, 60))
             
             events.append(current_time)
     
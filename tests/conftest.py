@@ -0,0 +1,10 @@
+"""
+Shared pytest setup.
+
+Makes the package importable from the source tree without installing it.
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
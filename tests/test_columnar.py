@@ -0,0 +1,32 @@
+"""
+Tests for the columnar formatters' base class contract.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from shadow_it_generator.formatters import ArrowFormatter, ColumnarFormatter, EventBatch, ParquetFormatter
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError, match="abstract"):
+        ColumnarFormatter(Path("unused"))
+
+
+@pytest.mark.parametrize("formatter_class", [ParquetFormatter, ArrowFormatter])
+def test_line_methods_raise_type_error(formatter_class):
+    formatter = formatter_class(Path("unused"))
+    message = f"{formatter_class.__name__} writes columns, not formatted lines"
+
+    with pytest.raises(TypeError, match=message):
+        formatter.format_event(None)
+    with pytest.raises(TypeError, match=message):
+        formatter.format_batch(EventBatch())
+    with pytest.raises(TypeError, match=message):
+        formatter.write_lines([datetime(2025, 1, 6)], ["line"])
+    with pytest.raises(TypeError, match=message):
+        formatter.write_line(datetime(2025, 1, 6).date(), "line")
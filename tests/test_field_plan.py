@@ -0,0 +1,42 @@
+"""
+Tests for the render functions shared between field plans.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from shadow_it_generator.formatters import FORMATTERS, field_plan
+
+
+@pytest.mark.parametrize("name", sorted(FORMATTERS))
+def test_new_formatters_reuse_render_functions(name):
+    formatter_class = FORMATTERS[name]
+    formatter_class(Path("unused"))
+    count = len(field_plan._renderers)
+
+    formatter_class(Path("unused"))
+    formatter_class(Path("unused"))
+    assert len(field_plan._renderers) == count
+
+
+def cached_renderers(formatter):
+    """The render functions of a formatter's plan that keep a fragment cache."""
+    return [render for render in formatter.plan._slot_map.values() if hasattr(render, "cache_info")]
+
+
+@pytest.mark.parametrize("name", sorted(FORMATTERS))
+def test_fragment_caches_are_shared_between_formatters(name):
+    first = cached_renderers(FORMATTERS[name](Path("unused")))
+    second = cached_renderers(FORMATTERS[name](Path("unused")))
+
+    assert first and len(first) == len(second)
+    for render, other in zip(first, second):
+        assert render is other
+        assert render.cache_info().maxsize == field_plan.FRAGMENT_CACHE_SIZE
+
+        # A value rendered through one formatter is a hit for the other
+        render("shared-cache-probe")
+        hits = other.cache_info().hits
+        other("shared-cache-probe")
+        assert other.cache_info().hits == hits + 1
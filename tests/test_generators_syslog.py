@@ -0,0 +1,69 @@
+"""
+Tests for format selection and syslog framing in the simplified generators.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import signal
+
+import pytest
+import yaml
+
+from shadow_it_generator.formatters import CEFFormatter, LEEFFormatter
+from shadow_it_generator.formatters.syslog import SyslogFormatter
+from shadow_it_generator.generators.batch import BatchGenerator
+from shadow_it_generator.generators.realtime import RealtimeGenerator
+
+
+HEADER = "<30>1 "
+START = datetime(2025, 1, 6, 9, 0)
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    """A configuration directory with a small enterprise and one service."""
+    enterprise = {
+        "enterprise": {"domain": "example.com", "total_users": 5},
+        "logging": {"syslog_priority": 30, "hostname": "gw01", "product": "Web Gateway"},
+    }
+    service = {
+        "service": {"name": "Dropbox", "category": "cloud_storage", "status": "unsanctioned"},
+        "network": {"domains": ["dropbox.com"], "ip_ranges": ["162.125.0.0/16"]},
+    }
+    (tmp_path / "cloud-services").mkdir()
+    (tmp_path / "enterprise.yaml").write_text(yaml.safe_dump(enterprise))
+    (tmp_path / "cloud-services" / "dropbox.yaml").write_text(yaml.safe_dump(service))
+    return tmp_path
+
+
+def test_batch_both_frames_leef_and_cef(config_dir, tmp_path):
+    generator = BatchGenerator(config_dir, tmp_path / "out")
+    output_file = generator.generate(START, START + timedelta(minutes=10), format="both", syslog="rfc5424")
+
+    lines = output_file.read_text().splitlines()
+    assert lines and len(lines) % 2 == 0
+    assert all(line.startswith(HEADER) for line in lines)
+    header_end = ' gw01 WebGateway - - [origin software="Web Gateway"] '
+    assert all(header_end + "LEEF:2.0|" in line for line in lines[::2])
+    assert all(header_end + "CEF:0|" in line for line in lines[1::2])
+
+
+def test_batch_rejects_unknown_format(config_dir, tmp_path):
+    generator = BatchGenerator(config_dir, tmp_path / "out")
+    with pytest.raises(ValueError, match="Unknown log format 'xml'"):
+        generator.generate(START, START + timedelta(minutes=10), format="xml")
+
+
+def test_realtime_both_frames_leef_and_cef(config_dir, tmp_path, monkeypatch):
+    # The generator installs a SIGINT handler; keep the test runner's
+    monkeypatch.setattr(signal, "signal", lambda *args: None)
+    generator = RealtimeGenerator(config_dir, tmp_path / "out", log_format="both", syslog="rfc5424")
+
+    assert [type(formatter) for formatter in generator.formatters] == [SyslogFormatter, SyslogFormatter]
+    assert [type(formatter.formatter) for formatter in generator.formatters] == [LEEFFormatter, CEFFormatter]
+
+
+def test_realtime_rejects_unknown_format(config_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(signal, "signal", lambda *args: None)
+    with pytest.raises(ValueError, match="Unknown log format 'xml'"):
+        RealtimeGenerator(config_dir, tmp_path / "out", log_format="xml")
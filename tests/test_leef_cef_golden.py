@@ -0,0 +1,138 @@
+"""
+Golden tests for the LEEF and CEF formatters.
+
+The expected lines were produced by the formatters as they were before
+field plans (per-event f-strings and chained escapes). format_event and
+format_batch must keep producing them byte for byte.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from shadow_it_generator.formatters import CEFFormatter, EventBatch, LEEFFormatter, LogEvent
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def make_event(**overrides) -> LogEvent:
+    """Build an event with fixed defaults and the given fields replaced."""
+    fields = dict(
+        timestamp=datetime(2025, 1, 6, 9, 15, 2, 250000, tzinfo=timezone.utc),
+        source_ip="10.1.2.3",
+        destination_ip="52.1.2.3",
+        source_port=51234,
+        destination_port=443,
+        username="jdoe",
+        user_domain="example.com",
+        url="https://app.dropbox.com/home",
+        method="GET",
+        status_code=200,
+        bytes_sent=1024,
+        bytes_received=20480,
+        duration_ms=150,
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        service_name="Dropbox",
+        category="cloud_storage",
+    )
+    fields.update(overrides)
+    return LogEvent(**fields)
+
+
+EVENTS = [
+    # Plain event
+    make_event(),
+    # Characters LEEF and CEF escape: = | \ and newline
+    make_event(
+        username="a=b|c\\d\ne",
+        url="https://x.example/?a=b|c\\d",
+        user_agent="UA=1|2\\x",
+        category="c|=\\",
+    ),
+    # No service
+    make_event(service_name=None),
+    # The 'Internet' pseudo-service (LEEF omits app=)
+    make_event(service_name="Internet", category="news"),
+    # Referrer
+    make_event(referrer="https://ref.example/?q=a|b"),
+    # Blocked, high risk, with additional fields (CEF only)
+    make_event(
+        action="blocked",
+        risk_level="high",
+        status_code=403,
+        additional_fields={"policy": "P=1|x", "count": 3, "empty": None},
+    ),
+    # Denied over plain HTTP
+    make_event(action="denied", risk_level="medium", protocol="http", method="POST"),
+    # Fixed UTC offset, last millisecond of the day
+    make_event(timestamp=datetime(2025, 1, 6, 23, 59, 59, 999999, tzinfo=timezone(timedelta(hours=5)))),
+    # The repeated hour at the end of DST: same wall time, one hour apart
+    make_event(timestamp=datetime(2024, 11, 3, 1, 30, 0, 5000, tzinfo=NEW_YORK)),
+    make_event(timestamp=datetime(2024, 11, 3, 1, 30, 0, 5000, tzinfo=NEW_YORK, fold=1)),
+    # First hour after the start of DST
+    make_event(timestamp=datetime(2024, 3, 10, 3, 0, 0, tzinfo=NEW_YORK)),
+]
+
+LEEF_LINES = [
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=a=b\\|c\\\\d\\ne\tdomain=example.com\trequest=https://x.example/?a=b\\|c\\\\d\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=c\\|=\\\\\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=UA=1\\|2\\\\x\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=news\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox\treferrer=https://ref.example/?q=a\\|b",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=403\taction=blocked\tcat=cloud_storage\triskLevel=high\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=09:15:02.250\ttimestamp=1736154902\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=POST\tproto=http\tstatus=200\taction=denied\tcat=cloud_storage\triskLevel=medium\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2025-01-06\ttime=23:59:59.999\ttimestamp=1736189999\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2024-11-03\ttime=01:30:00.005\ttimestamp=1730611800\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2024-11-03\ttime=01:30:00.005\ttimestamp=1730615400\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+    "LEEF:2.0|McAfee|Web Gateway|12.2.19|302|\tdate=2024-03-10\ttime=03:00:00.000\ttimestamp=1710054000\tsrc=10.1.2.3\tdst=52.1.2.3\tsrcPort=51234\tdstPort=443\tusrName=jdoe\tdomain=example.com\trequest=https://app.dropbox.com/home\tmethod=GET\tproto=https\tstatus=200\taction=allowed\tcat=cloud_storage\triskLevel=low\tbytesIn=20480\tbytesOut=1024\tresponseTime=150\tuserAgent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)\tapp=Dropbox",
+]
+
+CEF_LINES = [
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=a\\=b|c\\\\d\\ne sntdom=example.com request=https://x.example/?a\\=b|c\\\\d requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=UA\\=1|2\\\\x cat=c|\\=\\\\ act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to service|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Internet|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=news act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Internet",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox requestContext=https://ref.example/?q\\=a|b",
+    "CEF:0|McAfee|Web Gateway|12.2.19|101|Blocked access to Dropbox|8|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=403 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=blocked flexString2=high flexString2Label=RiskLevel destinationServiceName=Dropbox flexString3=P\\=1|x flexString3Label=policy flexString4=3 flexString4Label=count cs2=None cs2Label=empty",
+    "CEF:0|McAfee|Web Gateway|12.2.19|101|Denied access to Dropbox|6|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=09:15:02.250 deviceCustomString1Label=Time deviceCustomNumber1=1736154902 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=POST app=HTTP flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=denied flexString2=medium flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2025-01-06 deviceCustomDate1Label=Date deviceCustomString1=23:59:59.999 deviceCustomString1Label=Time deviceCustomNumber1=1736189999 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2024-11-03 deviceCustomDate1Label=Date deviceCustomString1=01:30:00.005 deviceCustomString1Label=Time deviceCustomNumber1=1730611800 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2024-11-03 deviceCustomDate1Label=Date deviceCustomString1=01:30:00.005 deviceCustomString1Label=Time deviceCustomNumber1=1730615400 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+    "CEF:0|McAfee|Web Gateway|12.2.19|100|Web request to Dropbox|1|deviceCustomDate1=2024-03-10 deviceCustomDate1Label=Date deviceCustomString1=03:00:00.000 deviceCustomString1Label=Time deviceCustomNumber1=1710054000 deviceCustomNumber1Label=UnixTimestamp src=10.1.2.3 dst=52.1.2.3 spt=51234 dpt=443 suser=jdoe sntdom=example.com request=https://app.dropbox.com/home requestMethod=GET app=HTTPS flexNumber1=200 flexNumber1Label=HTTPStatus in=20480 out=1024 cn1=150 cn1Label=ResponseTime requestClientApplication=Mozilla/5.0 (Windows NT 10.0; Win64; x64) cat=cloud_storage act=allowed flexString2=low flexString2Label=RiskLevel destinationServiceName=Dropbox",
+]
+
+FORMATS = [
+    pytest.param(LEEFFormatter, LEEF_LINES, id="leef"),
+    pytest.param(CEFFormatter, CEF_LINES, id="cef"),
+]
+
+
+@pytest.mark.parametrize("formatter_class, expected", FORMATS)
+def test_format_event_matches_golden(formatter_class, expected):
+    formatter = formatter_class(Path("unused"))
+    assert [formatter.format_event(event) for event in EVENTS] == expected
+
+
+@pytest.mark.parametrize("formatter_class, expected", FORMATS)
+def test_format_event_repeated_matches_golden(formatter_class, expected):
+    # Second pass goes through the fragment and timestamp caches
+    formatter = formatter_class(Path("unused"))
+    for event in EVENTS:
+        formatter.format_event(event)
+    assert [formatter.format_event(event) for event in EVENTS] == expected
+
+
+@pytest.mark.parametrize("formatter_class, expected", FORMATS)
+def test_format_batch_matches_golden(formatter_class, expected):
+    formatter = formatter_class(Path("unused"))
+    assert formatter.format_batch(EventBatch.from_events(EVENTS)) == expected
+
+
+def test_format_batch_shared_columns_match_golden():
+    # With both formats, CEF reuses columns LEEF derived on the same batch
+    batch = EventBatch.from_events(EVENTS)
+    assert LEEFFormatter(Path("unused")).format_batch(batch) == LEEF_LINES
+    assert CEFFormatter(Path("unused")).format_batch(batch) == CEF_LINES
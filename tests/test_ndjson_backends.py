@@ -0,0 +1,100 @@
+"""
+Tests that the NDJSON formatter's two backends agree.
+
+With orjson installed, events are serialized by orjson; without it, the
+compiled template is filled instead. Both must produce the same lines.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import json
+
+import pytest
+
+from shadow_it_generator.formatters import EventBatch, LogEvent, NDJSONFormatter
+from shadow_it_generator.formatters import ndjson
+
+
+def make_event(**overrides) -> LogEvent:
+    """Build an event with fixed defaults and the given fields replaced."""
+    fields = dict(
+        timestamp=datetime(2025, 1, 6, 9, 15, 2, 250000),
+        source_ip="10.1.2.3",
+        destination_ip="52.1.2.3",
+        source_port=51234,
+        destination_port=443,
+        username="jdoe",
+        user_domain="example.com",
+        url="https://app.dropbox.com/home",
+        method="GET",
+        status_code=200,
+        bytes_sent=1024,
+        bytes_received=20480,
+        duration_ms=150,
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        service_name="Dropbox",
+        category="cloud_storage",
+    )
+    fields.update(overrides)
+    return LogEvent(**fields)
+
+
+EVENTS = [
+    make_event(),
+    # Quotes, backslashes, control characters and non-ASCII text
+    make_event(username='a"b\\c\n\x01é ', url="https://x.example/\tpath", user_agent="☃"),
+    # Missing optional values
+    make_event(service_name=None, referrer=None),
+    make_event(referrer="https://ref.example/?q=1"),
+    # Whole seconds, UTC and a fixed offset
+    make_event(timestamp=datetime(2025, 1, 6, 9, 15, 2)),
+    make_event(timestamp=datetime(2025, 1, 6, 9, 15, 2, 250000, tzinfo=timezone.utc)),
+    make_event(timestamp=datetime(2025, 1, 6, 9, 15, 2, tzinfo=timezone(timedelta(hours=-5)))),
+    # Every JSON type in additional_fields, including non-string keys
+    make_event(additional_fields={
+        "count": 3,
+        "ratio": 1.5,
+        "flag": True,
+        "empty": None,
+        "text": 'x"yé',
+        "list": [1, "2"],
+        "nested": {"a": {"b": None}},
+    }),
+    make_event(additional_fields={1: "x", 2.5: "y", False: "n", None: "z"}),
+    make_event(additional_fields={}),
+]
+
+
+@pytest.fixture
+def template_formatter(monkeypatch):
+    """A formatter that uses the template backend, as without orjson."""
+    monkeypatch.setattr(ndjson, "orjson", None)
+    return NDJSONFormatter(Path("unused"))
+
+
+@pytest.fixture
+def template_lines(template_formatter):
+    """The template backend's lines for EVENTS."""
+    return [template_formatter.format_event(event) for event in EVENTS]
+
+
+def test_template_lines_are_valid_json(template_lines):
+    assert [json.loads(line)["username"] for line in template_lines] == [event.username for event in EVENTS]
+    assert template_lines[0].startswith('{"timestamp":"2025-01-06T09:15:02.250000","source_ip":"10.1.2.3",')
+    assert template_lines[8].endswith(',"additional_fields":{"1":"x","2.5":"y","false":"n","null":"z"}}')
+
+
+def test_template_format_batch_matches_format_event(template_formatter, template_lines):
+    assert template_formatter.format_batch(EventBatch.from_events(EVENTS)) == template_lines
+
+
+def test_orjson_format_event_matches_template(template_lines):
+    pytest.importorskip("orjson")
+    formatter = NDJSONFormatter(Path("unused"))
+    assert [formatter.format_event(event) for event in EVENTS] == template_lines
+
+
+def test_orjson_format_batch_matches_template(template_lines):
+    pytest.importorskip("orjson")
+    formatter = NDJSONFormatter(Path("unused"))
+    assert formatter.format_batch(EventBatch.from_events(EVENTS)) == template_lines
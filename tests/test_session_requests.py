@@ -0,0 +1,119 @@
+"""
+Tests that a session's two request paths draw from the same distributions.
+
+With numpy installed, activity requests are drawn as arrays; without it,
+one at a time. Both read the request profiles in core.session, so their
+fields must have the same domains and (within sampling error) the same
+means.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from statistics import mean
+from types import SimpleNamespace
+import random
+
+import pytest
+
+from shadow_it_generator.core import session as session_module
+from shadow_it_generator.core.session import Session
+
+
+MB = 1024 * 1024
+START = datetime(2025, 1, 6, 9, 0)
+
+ACTIONS = {
+    "file_upload": SimpleNamespace(weight=1, avg_per_hour=300, avg_size_mb=20, size_std_dev=2),
+    "file_download": SimpleNamespace(weight=1, avg_per_hour=300),
+    "message_send": SimpleNamespace(weight=1, avg_per_hour=300, size_bytes=5000),
+    "api_call": SimpleNamespace(weight=1, avg_per_hour=300),
+    "page_view": SimpleNamespace(weight=1, avg_per_hour=300),
+}
+
+SERVICE = SimpleNamespace(
+    name="Dropbox",
+    status="sanctioned",
+    category="cloud_storage",
+    risk_level="low",
+    activity=SimpleNamespace(actions=ACTIONS),
+    traffic_patterns=SimpleNamespace(web_paths=["/home", "/browse"], api_endpoints=["/2/files/list"]),
+)
+
+
+def uniform_mean(bounds):
+    """Mean of a uniform integer range."""
+    return (bounds[0] + bounds[1]) / 2
+
+
+# Expected (bytes_sent, bytes_received, duration_ms) means per action
+EXPECTED_MEANS = {
+    "file_upload": (20 * MB, 600, 2750),
+    "file_download": (350, uniform_mean(session_module.FILE_SIZE_RANGE), 2750),
+    "message_send": (5000, 350, 550),
+    "api_call": (1050, 25250, 275),
+    "page_view": (500, 52500, 550),
+}
+
+
+@pytest.fixture(params=["numpy", "scalar"])
+def requests_by_action(request, monkeypatch):
+    """A day of one session's activity requests, grouped by action."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(session_module, "numpy", None)
+
+    session = Session(
+        id="session-1",
+        user=SimpleNamespace(profile=SimpleNamespace(name="normal")),
+        service=SERVICE,
+        start_time=START,
+        end_time=START + timedelta(hours=24),
+        rng=random.Random(7),
+    )
+    grouped = defaultdict(list)
+    for details in session.generate_requests():
+        if details["type"] in ACTIONS:
+            grouped[details["type"]].append(details)
+    return grouped
+
+
+def test_field_domains(requests_by_action):
+    assert set(requests_by_action) == set(ACTIONS)
+    for action_name, requests in requests_by_action.items():
+        profile = session_module.request_profile(action_name)
+        assert {details["method"] for details in requests} == set(profile.methods)
+        assert all(profile.duration_ms[0] <= details["duration_ms"] <= profile.duration_ms[1] for details in requests)
+        for direction in ("bytes_sent", "bytes_received"):
+            bounds = getattr(profile, direction)
+            if bounds:
+                assert all(bounds[0] <= details[direction] <= bounds[1] for details in requests)
+
+    statuses = {details["status_code"] for requests in requests_by_action.values() for details in requests}
+    assert statuses <= set(session_module.SUCCESS_STATUS_CODES + session_module.ERROR_STATUS_CODES)
+
+    paths = {action_name: {details["path"] for details in requests} for action_name, requests in requests_by_action.items()}
+    assert paths["file_upload"] == set(session_module.REQUEST_PROFILES["file_upload"].paths)
+    assert paths["message_send"] == set(session_module.REQUEST_PROFILES["message_send"].paths)
+    assert paths["api_call"] == {"/2/files/list"}
+    assert paths["page_view"] == {"/home", "/browse"}
+    assert all(path.startswith("/files/") and path.endswith("/download") for path in paths["file_download"])
+
+    file_sizes = [details["bytes_received"] for details in requests_by_action["file_download"]]
+    assert all(session_module.FILE_SIZE_RANGE[0] <= size <= session_module.FILE_SIZE_RANGE[1] for size in file_sizes)
+    message_sizes = [details["bytes_sent"] for details in requests_by_action["message_send"]]
+    assert all(abs(size - 5000) <= session_module.MESSAGE_SIZE_JITTER for size in message_sizes)
+
+
+def test_field_means(requests_by_action):
+    for action_name, expected in EXPECTED_MEANS.items():
+        requests = requests_by_action[action_name]
+        assert len(requests) > 1000
+        for field_name, expected_mean in zip(("bytes_sent", "bytes_received", "duration_ms"), expected):
+            assert mean(details[field_name] for details in requests) == pytest.approx(expected_mean, rel=0.05), (
+                action_name, field_name
+            )
+
+    statuses = [details["status_code"] for requests in requests_by_action.values() for details in requests]
+    success_rate = sum(status in session_module.SUCCESS_STATUS_CODES for status in statuses) / len(statuses)
+    assert success_rate == pytest.approx(session_module.SUCCESS_RATE, abs=0.01)
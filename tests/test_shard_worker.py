@@ -0,0 +1,39 @@
+"""
+Tests for the per-process shard worker of sharded generation.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+import threading
+
+from shadow_it_generator.core import engine as engine_module
+from shadow_it_generator.formatters.writer import BackgroundWriter
+
+
+def writer_threads():
+    """The background writer threads that are still running."""
+    return [thread for thread in threading.enumerate() if thread.name == "background-writer"]
+
+
+def test_shard_closes_background_writer(monkeypatch, tmp_path):
+    writes = []
+    writer = BackgroundWriter()
+    engine = SimpleNamespace(
+        output_dir=None,
+        stats=None,
+        users=[],
+        writer=writer,
+        _init_formatters=lambda: [],
+        _iter_hours=lambda users, date, first_hour, end_hour: range(first_hour, end_hour),
+        _write_batch=lambda hour: writer.submit(writes.append, hour),
+    )
+    monkeypatch.setattr(engine_module, "_worker_engine", engine, raising=False)
+    running = len(writer_threads())
+
+    for shard, (first_hour, end_hour) in enumerate([(0, 12), (12, 24)]):
+        shard_dir = tmp_path / f"{shard:05d}"
+        assert engine_module._generate_shard(shard_dir, datetime(2025, 1, 6), first_hour, end_hour) == (shard_dir, None)
+        # Every write of the shard is done, and the thread is gone, before the parent merges it
+        assert writes == list(range(end_hour))
+        assert len(writer_threads()) == running
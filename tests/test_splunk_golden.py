@@ -0,0 +1,75 @@
+"""
+Golden tests for the Splunk formatter's leading timestamp.
+
+Splunk reads the leading timestamp into _time, so it must carry the
+event's UTC offset: without it, events of a non-UTC tenant are read in
+the indexer's time zone.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from shadow_it_generator.formatters import EventBatch, LogEvent, SplunkFormatter
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def make_event(timestamp: datetime) -> LogEvent:
+    """Build an event with fixed fields at the given time."""
+    return LogEvent(
+        timestamp=timestamp,
+        source_ip="10.1.2.3",
+        destination_ip="52.1.2.3",
+        source_port=51234,
+        destination_port=443,
+        username="jdoe",
+        user_domain="example.com",
+        url="https://app.dropbox.com/home",
+        method="GET",
+        status_code=200,
+        bytes_sent=1024,
+        bytes_received=20480,
+        duration_ms=150,
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        service_name="Dropbox",
+        category="cloud_storage",
+    )
+
+
+FIELDS = (
+    'src="10.1.2.3" dest="52.1.2.3" src_port=51234 dest_port=443 user="jdoe" user_domain="example.com" '
+    'url="https://app.dropbox.com/home" http_method="GET" protocol="https" status=200 action="allowed" '
+    'category="cloud_storage" risk_level="low" bytes_in=20480 bytes_out=1024 response_time=150 '
+    'http_user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)" vendor_product="McAfee Web Gateway" app="Dropbox"'
+)
+
+CASES = [
+    (datetime(2025, 1, 7, 10, 0, 0, 123456, tzinfo=timezone(timedelta(hours=-5))), "2025-01-07 10:00:00.123 -0500"),
+    (datetime(2025, 1, 7, 15, 0, 0, 123456, tzinfo=timezone.utc), "2025-01-07 15:00:00.123 +0000"),
+    (datetime(2025, 1, 7, 20, 30, 0, 999999, tzinfo=timezone(timedelta(hours=5, minutes=30))), "2025-01-07 20:30:00.999 +0530"),
+    # The repeated hour at the end of DST: same wall time, one hour apart
+    (datetime(2024, 11, 3, 1, 30, 0, 5000, tzinfo=NEW_YORK), "2024-11-03 01:30:00.005 -0400"),
+    (datetime(2024, 11, 3, 1, 30, 0, 5000, tzinfo=NEW_YORK, fold=1), "2024-11-03 01:30:00.005 -0500"),
+]
+
+EVENTS = [make_event(timestamp) for timestamp, _ in CASES]
+LINES = [f"{prefix} {FIELDS}" for _, prefix in CASES]
+
+
+def test_format_event_matches_golden():
+    formatter = SplunkFormatter(Path("unused"))
+    assert [formatter.format_event(event) for event in EVENTS] == LINES
+
+
+def test_format_batch_matches_golden():
+    formatter = SplunkFormatter(Path("unused"))
+    assert formatter.format_batch(EventBatch.from_events(EVENTS)) == LINES
+
+
+def test_naive_timestamps_use_the_local_offset():
+    timestamp = datetime(2025, 1, 7, 10, 0, 0, 123456)
+    offset = timestamp.astimezone().strftime('%z')
+    line = SplunkFormatter(Path("unused")).format_event(make_event(timestamp))
+    assert line.startswith(f"2025-01-07 10:00:00.123 {offset} src=")
@@ -0,0 +1,88 @@
+"""
+Tests for syslog framing: RFC 5424 origin data and octet counting (RFC 6587).
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from shadow_it_generator.formatters import EventBatch, LEEFFormatter, LogEvent
+from shadow_it_generator.formatters.syslog import SyslogFormatter, SyslogFraming, origin_data
+
+
+def make_event(second: int, username: str) -> LogEvent:
+    """Build an event at the given second of 2025-01-06 09:15."""
+    return LogEvent(
+        timestamp=datetime(2025, 1, 6, 9, 15, second, 250000, tzinfo=timezone.utc),
+        source_ip="10.1.2.3",
+        destination_ip="52.1.2.3",
+        source_port=51234,
+        destination_port=443,
+        username=username,
+        user_domain="example.com",
+        url="https://app.dropbox.com/home",
+        method="GET",
+        status_code=200,
+        bytes_sent=1024,
+        bytes_received=20480,
+        duration_ms=150,
+        user_agent="Mozilla/5.0",
+        service_name="Dropbox",
+        category="cloud_storage",
+    )
+
+
+EVENTS = [make_event(2, "jdoe"), make_event(2, "zoë"), make_event(3, "björn")]
+
+
+def read_frames(data: bytes) -> list:
+    """Split an octet-counted stream into its messages, as a TCP receiver does."""
+    messages = []
+    while data:
+        length, _, data = data.partition(b" ")
+        messages.append(data[:int(length)])
+        data = data[int(length):]
+    return messages
+
+
+def test_msg_len_counts_only_message_bytes(tmp_path):
+    plain = SyslogFormatter(LEEFFormatter(tmp_path / "plain"), SyslogFraming(hostname="gw01"))
+    counted = SyslogFormatter(LEEFFormatter(tmp_path / "counted"), SyslogFraming(hostname="gw01", octet_counting=True))
+
+    messages = [plain.format_event(event) for event in EVENTS]
+    for message, frame in zip(messages, [counted.format_event(event) for event in EVENTS]):
+        assert frame == f"{len(message.encode('utf-8'))} {message}"
+    assert counted.format_batch(EventBatch.from_events(EVENTS)) == [counted.format_event(event) for event in EVENTS]
+
+
+def test_octet_counted_files_are_a_frame_stream(tmp_path):
+    plain = SyslogFormatter(LEEFFormatter(tmp_path), SyslogFraming(hostname="gw01"))
+    counted = SyslogFormatter(LEEFFormatter(tmp_path), SyslogFraming(hostname="gw01", octet_counting=True))
+    counted.setup()
+    counted.write_batch(EVENTS[:2])
+    counted.write_event(EVENTS[2])
+    counted.finalize()
+
+    data = (tmp_path / "leef_20250106.log").read_bytes()
+    assert read_frames(data) == [plain.format_event(event).encode("utf-8") for event in EVENTS]
+    assert b"\n" not in data
+
+
+def test_from_config_puts_vendor_and_version_in_origin_data():
+    logging_config = {"hostname": "gw01", "vendor": "McAfee", "product": "Web Gateway", "version": "8.2.9"}
+
+    framing = SyslogFraming.from_config(logging_config)
+    assert framing.app_name == "WebGateway"
+    assert framing.structured_data == '[origin software="McAfee Web Gateway" swVersion="8.2.9"]'
+    message = SyslogFormatter(LEEFFormatter(Path("unused")), framing).format_event(EVENTS[0])
+    assert message.startswith(
+        '<30>1 2025-01-06T09:15:02.250+00:00 gw01 WebGateway - - '
+        '[origin software="McAfee Web Gateway" swVersion="8.2.9"] LEEF:2.0|'
+    )
+
+    # RFC 3164 has no structured data
+    assert SyslogFraming.from_config(logging_config, "rfc3164").structured_data == "-"
+
+
+def test_origin_data_escapes_param_values():
+    assert origin_data('a"b]c\\d', None) == '[origin software="a\\"b\\]c\\\\d"]'
+    assert origin_data(None, None) == "-"